@@ -37,9 +37,41 @@ def create_app(config_name='default'):
     app.register_blueprint(timetable_bp, url_prefix='/api/timetable')
     app.register_blueprint(attendance_bp, url_prefix='/api/attendance')
     
-    # Create database tables
+    # Register management commands
+    from cli import register_cli
+    register_cli(app)
+    
+    # Schema changes are applied offline with `flask schema upgrade`;
+    # workers only compare versions instead of reflecting the schema
+    from utils.migrations import load_models, upgrade, current_version, latest_version
+    load_models()
+    
+    # Stored prediction features follow submission and marksheet changes
+    from utils.feature_store import register_feature_listeners
+    register_feature_listeners()
     with app.app_context():
-        db.create_all()
+        if app.config['SCHEMA_AUTO_UPGRADE']:
+            upgrade()
+        schema_version = current_version()
+    
+    schema_ready = schema_version >= latest_version()
+    if not schema_ready:
+        app.logger.warning(f"Database schema is at version {schema_version}, expected {latest_version()}; "
+                           "run `flask schema upgrade`")
+    
+    # Start the background OCR workers and pick up jobs left queued
+    from utils.jobs import ocr_job_queue
+    ocr_job_queue.init_app(app)
+    if schema_ready:
+        ocr_job_queue.resume_pending()
+    
+    # Load the registered prediction model once per worker
+    from utils.predict import load_predictor
+    load_predictor(app.config['MODEL_FOLDER'], app.config['PREDICTOR_ENGINE'])
+    
+    # Repeat predictions on unchanged inputs are answered from memory
+    from utils.prediction_cache import prediction_cache
+    prediction_cache.init_app(app)
     
     @app.route('/health')
     def health_check():
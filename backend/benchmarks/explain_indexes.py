@@ -0,0 +1,211 @@
+"""
+Index usage check for the hot route queries
+
+Seeds an in-memory SQLite database, calls each hot route through the test
+client (and the worker startup path directly), captures every statement
+they issue and runs EXPLAIN QUERY PLAN on it with its real parameters.
+The run fails if any captured statement scans a table instead of
+searching it through an index, so the check follows the shipped queries
+rather than copies of them.
+
+Usage (from the backend directory):
+    python -m benchmarks.explain_indexes
+"""
+import os
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep model artifacts, OCR cache and archives out of the working tree
+os.environ.setdefault('MODEL_FOLDER', tempfile.mkdtemp(prefix='explain-bench-'))
+os.environ.setdefault('OCR_CACHE_PATH', '')
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app, db
+from models.institution import Institution
+from models.user import User
+from models.profiles import Student, Teacher
+from models.academic import Department, Course, AcademicYear, Term, Enrollment
+from models.scheduling import Timetable, TimeSlot, Assignment, AssignmentSubmission
+from models.tracking import AttendanceRecord, AttendanceBitmap, Marksheet, OCRJob
+from utils.attendance_archive import archive_term
+from utils.attendance_bitmap import rebuild_bitmaps
+from utils.attendance_rollup import STATUSES, rebuild_rollups
+from utils.attendance_stats import rebuild_stats
+from utils.jobs import ocr_job_queue
+
+# Statements worth planning; inserts have no WHERE clause to index
+PLANNED_PREFIXES = ('SELECT', 'UPDATE', 'DELETE')
+
+def seed():
+    """Create a course with students in a closed (archived) and a current term"""
+    institution = Institution('Explain School', 'EXPLAIN', 'school')
+    db.session.add(institution)
+    db.session.flush()
+    
+    admin = User('admin@explain.local', 'password', 'Admin', 'admin')
+    teacher_user = User('teacher@explain.local', 'password', 'Teacher', 'teacher')
+    db.session.add_all([admin, teacher_user])
+    department = Department(name='Explain', code='EXP', institution_id=institution.id)
+    year = AcademicYear(name='Explain', start_date=date(2025, 1, 1), end_date=date(2026, 12, 31),
+                        institution_id=institution.id)
+    db.session.add_all([department, year])
+    db.session.flush()
+    
+    teacher = Teacher(user_id=teacher_user.id, department_id=department.id)
+    course = Course(name='Course', code='C1', department_id=department.id, institution_id=institution.id)
+    closed = Term(name='Closed', start_date=date(2025, 1, 1), end_date=date(2025, 6, 30), academic_year_id=year.id)
+    current = Term(name='Current', start_date=date(2026, 1, 1), end_date=date(2026, 6, 30), academic_year_id=year.id)
+    db.session.add_all([teacher, course, closed, current])
+    db.session.flush()
+    
+    students, enrollments = [], []
+    for i in range(4):
+        user = User(f'student{i}@explain.local', 'password', f'Student {i}', 'student')
+        db.session.add(user)
+        db.session.flush()
+        student = Student(user_id=user.id, roll_number=f'EXP-{i}')
+        db.session.add(student)
+        db.session.flush()
+        students.append(student)
+        for term in (closed, current):
+            enrollment = Enrollment(student_id=student.id, course_id=course.id, term_id=term.id)
+            db.session.add(enrollment)
+            enrollments.append((enrollment, term))
+    db.session.flush()
+    
+    db.session.bulk_insert_mappings(AttendanceRecord, [
+        {'enrollment_id': enrollment.id, 'date': term.start_date + timedelta(days=d), 'status': STATUSES[d % 3]}
+        for enrollment, term in enrollments for d in range(40)
+    ])
+    
+    assignment = Assignment(course_id=course.id, title='Essay', due_date=datetime(2026, 2, 1))
+    timetable = Timetable(name='Current', department_id=department.id, term_id=current.id)
+    db.session.add_all([assignment, timetable])
+    db.session.flush()
+    db.session.add_all([
+        AssignmentSubmission(assignment_id=assignment.id, student_id=students[0].id,
+                             submission_date=datetime(2026, 1, 30)),
+        Marksheet(student_id=students[0].id, term_id=closed.id, percentage=72.0, verified=True),
+        TimeSlot(timetable_id=timetable.id, course_id=course.id, teacher_id=teacher.id, day_of_week=1,
+                 start_time=time(9, 0), end_time=time(10, 0), room_number='101'),
+        OCRJob(student_id=students[0].id, term_id=closed.id, file_path='scan.png', status='completed')
+    ])
+    db.session.commit()
+    
+    rebuild_rollups()
+    rebuild_bitmaps()
+    rebuild_stats()
+    archive_term(closed.id, tempfile.mkdtemp(prefix='explain-archive-'))
+    
+    # Plain IDs, so the routes below do not trigger lazy reloads of seed objects
+    return {
+        'admin': admin.id, 'teacher': teacher.id, 'course': course.id, 'term': current.id,
+        'student': students[0].id, 'timetable': timetable.id,
+        'enrollments': [enrollment.id for enrollment, term in enrollments if term is current]
+    }
+
+def hot_paths(client, headers, ids):
+    """Each hot route as a (label, call) pair; calls go through the real code"""
+    student_id, course_id, teacher_id = ids['student'], ids['course'], ids['teacher']
+    
+    def drop_bitmap():
+        # The report reads raw records for enrollments without a bitmap yet
+        AttendanceBitmap.query.filter_by(enrollment_id=ids['enrollments'][0]).delete()
+        db.session.commit()
+        return client.get(f'/api/attendance/student/{student_id}/report',
+                          query_string={'start_date': '2026-01-10'}, headers=headers)
+    
+    return [
+        ('POST /attendance/bulk-mark', lambda: client.post('/api/attendance/bulk-mark', headers=headers, json={
+            'date': '2026-02-20',
+            'attendance_data': [{'enrollment_id': e, 'status': 'present'} for e in ids['enrollments']]
+        })),
+        ('GET /attendance/student/<id>/report',
+         lambda: client.get(f'/api/attendance/student/{student_id}/report', headers=headers)),
+        ('GET /attendance/student/<id>/report: raw fallback', drop_bitmap),
+        ('GET /attendance/analytics/course/<id>',
+         lambda: client.get(f'/api/attendance/analytics/course/{course_id}', headers=headers)),
+        ('GET /attendance/at-risk',
+         lambda: client.get('/api/attendance/at-risk', query_string={'course_id': course_id}, headers=headers)),
+        ('POST /prediction/predict', lambda: client.post('/api/prediction/predict', headers=headers, json={
+            'student_id': student_id, 'course_id': course_id
+        })),
+        ('POST /prediction/course/<id>/predict-all',
+         lambda: client.post(f'/api/prediction/course/{course_id}/predict-all', headers=headers,
+                             json={'term_id': ids['term']})),
+        ('GET /prediction/student/<id>/history',
+         lambda: client.get(f'/api/prediction/student/{student_id}/history', headers=headers)),
+        ('GET /prediction/analytics/course/<id>',
+         lambda: client.get(f'/api/prediction/analytics/course/{course_id}', headers=headers)),
+        ('POST /timetable/<id>/slots', lambda: client.post(f'/api/timetable/{ids["timetable"]}/slots', headers=headers, json={
+            'course_id': course_id, 'teacher_id': teacher_id, 'day_of_week': 2,
+            'start_time': '11:00', 'end_time': '12:00', 'room_number': '102'
+        })),
+        ('GET /timetable/teacher/<id>/schedule',
+         lambda: client.get(f'/api/timetable/teacher/{teacher_id}/schedule', headers=headers)),
+        ('GET /marksheet/student/<id>',
+         lambda: client.get(f'/api/marksheet/student/{student_id}', headers=headers)),
+        ('OCR worker startup: resume pending jobs', ocr_job_queue.resume_pending),
+    ]
+
+def capture(call):
+    """Run a call and collect the planned statements it issued with their parameters"""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(PLANNED_PREFIXES):
+            statements.append((statement, parameters[0] if executemany else parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        response = call()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    
+    status_code = getattr(response, 'status_code', 200)
+    if status_code >= 400:
+        raise RuntimeError(f"Request failed with {status_code}: {response.get_json()}")
+    return statements
+
+def full_scans(statement, parameters):
+    """Full table scans in a statement's plan, plus the whole plan"""
+    with db.engine.connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    
+    details = [row[-1] for row in plan]
+    # "SCAN t USING INDEX" and "SCAN t USING COVERING INDEX" walk an index, not the table
+    return [detail for detail in details if detail.startswith('SCAN') and 'INDEX' not in detail], details
+
+def main():
+    app = create_app('testing')
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print("EXPLAIN QUERY PLAN checks only run against SQLite")
+            return 1
+        
+        ids = seed()
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(ids["admin"]))}'}
+        
+        failures = 0
+        for route, call in hot_paths(client, headers, ids):
+            statements = capture(call)
+            print(f"{route}: {len(statements)} statements")
+            for statement, parameters in statements:
+                scans, details = full_scans(statement, parameters)
+                status = 'FAIL' if scans else 'ok'
+                print(f"  {status:<4} {' '.join(statement.split())[:110]}")
+                for detail in details:
+                    print(f"         {detail}")
+                failures += bool(scans)
+        
+        print(f"{failures} statements scan a table")
+        return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
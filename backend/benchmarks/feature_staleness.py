@@ -0,0 +1,126 @@
+"""
+Staleness check for the prediction feature store
+
+Seeds an in-memory database with two courses sharing a student, loads
+every enrollment's stored features, then creates, re-dates and deletes
+an assignment of one course. After each change that course's feature
+rows must be flagged stale while the other course's stay fresh, and
+the next load_features call must return rates that match a fresh
+compute_features. The run exits non-zero on any failed check.
+
+Usage (from the backend directory):
+    python -m benchmarks.feature_staleness
+"""
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep model artifacts and OCR cache out of the working tree
+os.environ.setdefault('MODEL_FOLDER', tempfile.mkdtemp(prefix='feature-bench-'))
+os.environ.setdefault('OCR_CACHE_PATH', '')
+
+from app import create_app, db
+from models.institution import Institution
+from models.user import User
+from models.profiles import Student
+from models.academic import Department, Course, AcademicYear, Term, Enrollment
+from models.scheduling import Assignment, AssignmentSubmission
+from models.tracking import PredictionFeatures
+from utils.feature_store import compute_features, load_features
+
+def seed():
+    """Create two courses in one term, each with an assignment the student submitted"""
+    institution = Institution('Feature School', 'FEATURE', 'school')
+    db.session.add(institution)
+    db.session.flush()
+    
+    department = Department(name='Feature', code='FEA', institution_id=institution.id)
+    year = AcademicYear(name='Feature', start_date=date(2026, 1, 1), end_date=date(2026, 12, 31),
+                        institution_id=institution.id)
+    db.session.add_all([department, year])
+    db.session.flush()
+    
+    term = Term(name='Current', start_date=date(2026, 1, 1), end_date=date(2026, 6, 30), academic_year_id=year.id)
+    courses = [
+        Course(name=f'Course {i}', code=f'F{i}', department_id=department.id, institution_id=institution.id)
+        for i in range(2)
+    ]
+    user = User('student@feature.local', 'password', 'Student', 'student')
+    db.session.add_all([term, user, *courses])
+    db.session.flush()
+    
+    student = Student(user_id=user.id, roll_number='FEA-1')
+    db.session.add(student)
+    db.session.flush()
+    
+    enrollments = {}
+    for course in courses:
+        enrollment = Enrollment(student_id=student.id, course_id=course.id, term_id=term.id)
+        assignment = Assignment(course_id=course.id, title='Essay', due_date=datetime(2026, 2, 1))
+        db.session.add_all([enrollment, assignment])
+        db.session.flush()
+        db.session.add(AssignmentSubmission(assignment_id=assignment.id, student_id=student.id,
+                                            submission_date=datetime(2026, 1, 30)))
+        enrollments[course.id] = enrollment.id
+    db.session.commit()
+    return enrollments
+
+def stale_courses():
+    """Course IDs with at least one stale feature row"""
+    return {course_id for course_id, in db.session.query(PredictionFeatures.course_id)
+            .filter(PredictionFeatures.stale == True).distinct()}
+
+def check(label, changed_course, enrollments):
+    """Compare staleness flags and reloaded features after a change; returns the failure count"""
+    failures = 0
+    stale = stale_courses()
+    if stale != {changed_course}:
+        print(f"FAIL {label}: stale courses {sorted(stale)}, expected [{changed_course}]")
+        failures += 1
+    
+    loaded = load_features(enrollments.values())
+    db.session.commit()
+    expected = compute_features(enrollments.values())
+    for enrollment_id, values in loaded.items():
+        for name in ('assignment_completion_rate', 'submission_timeliness'):
+            if values[name] != expected[enrollment_id][name]:
+                print(f"FAIL {label}: enrollment {enrollment_id} {name} is {values[name]}, "
+                      f"expected {expected[enrollment_id][name]}")
+                failures += 1
+    
+    if stale_courses():
+        print(f"FAIL {label}: rows still stale after reload")
+        failures += 1
+    print(f"{'ok  ' if not failures else 'FAIL'} {label}")
+    return failures
+
+def main():
+    app = create_app('testing')
+    with app.app_context():
+        enrollments = seed()
+        course_id = next(iter(enrollments))
+        load_features(enrollments.values())
+        db.session.commit()
+        
+        failures = 0
+        assignment = Assignment(course_id=course_id, title='Report', due_date=datetime(2026, 3, 1))
+        db.session.add(assignment)
+        db.session.commit()
+        failures += check('create assignment', course_id, enrollments)
+        
+        assignment.due_date = datetime(2026, 1, 15)
+        db.session.commit()
+        failures += check('re-date assignment', course_id, enrollments)
+        
+        db.session.delete(assignment)
+        db.session.commit()
+        failures += check('delete assignment', course_id, enrollments)
+        
+        print(f"{failures} failed checks")
+        return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
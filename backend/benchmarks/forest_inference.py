@@ -0,0 +1,102 @@
+"""
+Latency and exactness check for the compiled random forest engine
+
+Trains the production predictor on synthetic student records, exports it
+with CompiledForest and compares it against scaler.transform plus
+model.predict: scores must match bit for bit on every checked row, and
+per-row latency is reported for single rows, small batches and a full
+cohort, plus end-to-end PerformancePredictor.predict calls on each
+engine. The run exits non-zero on any mismatch.
+
+Usage (from the backend directory):
+    python -m benchmarks.forest_inference
+    python -m benchmarks.forest_inference --train-rows 5000 --repeats 500
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.features import FEATURE_NAMES, build_feature_matrix
+from utils.predict import PerformancePredictor
+
+def synthetic_records(n_rows, rng):
+    """Student records with plausible feature ranges and a noisy score label"""
+    records = []
+    for _ in range(n_rows):
+        record = {name: float(rng.uniform(0, 100)) for name in FEATURE_NAMES}
+        record['study_hours_per_week'] = float(rng.integers(0, 40))
+        records.append(record)
+    X = build_feature_matrix(records)
+    labels = 0.4 * X[:, 0] + 0.3 * X[:, 1] + 0.2 * X[:, 2] + rng.normal(0, 5, n_rows)
+    return records, labels.tolist()
+
+def per_row_latency(fn, X, batch_size, repeats):
+    """Median seconds per row when scoring X in batches of batch_size"""
+    timings = []
+    for i in range(repeats):
+        start = (i * batch_size) % max(len(X) - batch_size, 1)
+        batch = X[start:start + batch_size]
+        started = time.perf_counter()
+        fn(batch)
+        timings.append((time.perf_counter() - started) / len(batch))
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--train-rows', type=int, default=2000, help='Synthetic training rows')
+    parser.add_argument('--check-rows', type=int, default=20000, help='Rows compared for exactness')
+    parser.add_argument('--repeats', type=int, default=200, help='Timed calls per batch size')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    records, labels = synthetic_records(args.train_rows, rng)
+    
+    predictor = PerformancePredictor()
+    predictor.train(records, labels)
+    predictor.model_version = 'benchmark'
+    artifact = dict(predictor.to_artifact(), version='benchmark')
+    sklearn_engine = PerformancePredictor.from_artifact(artifact, 'sklearn')
+    compiled_engine = PerformancePredictor.from_artifact(artifact, 'compiled')
+    forest = compiled_engine.compiled
+    print(f"{forest.n_trees} trees, {len(forest.value)} nodes, max depth {forest.max_depth}")
+    
+    # Exactness: batch, single rows and rows sitting exactly on training values
+    check_records, _ = synthetic_records(args.check_rows, rng)
+    X = build_feature_matrix(check_records)
+    X_train = build_feature_matrix(records)
+    mismatches = int(np.count_nonzero(sklearn_engine.score_matrix(X) != compiled_engine.score_matrix(X)))
+    mismatches += int(np.count_nonzero(
+        sklearn_engine.score_matrix(X_train) != compiled_engine.score_matrix(X_train)
+    ))
+    mismatches += sum(
+        not np.array_equal(sklearn_engine.score_matrix(X[i:i + 1]), compiled_engine.score_matrix(X[i:i + 1]))
+        for i in range(min(500, len(X)))
+    )
+    print(f"{mismatches} mismatching scores over {len(X) + len(X_train)} batch rows and 500 single rows")
+    
+    print(f"{'batch':>6} {'sklearn us/row':>15} {'compiled us/row':>16} {'speedup':>8}")
+    for batch_size in (1, 30, 1000):
+        baseline = per_row_latency(sklearn_engine.score_matrix, X, batch_size, args.repeats)
+        compiled = per_row_latency(compiled_engine.score_matrix, X, batch_size, args.repeats)
+        print(f"{batch_size:>6} {baseline * 1e6:>15.1f} {compiled * 1e6:>16.1f} {baseline / compiled:>7.1f}x")
+    
+    # End to end, including feature preparation and importance factors
+    for label, engine in (('sklearn', sklearn_engine), ('compiled', compiled_engine)):
+        timings = []
+        for record in check_records[:args.repeats]:
+            started = time.perf_counter()
+            engine.predict(record)
+            timings.append(time.perf_counter() - started)
+        print(f"predict() {label:<9} {statistics.median(timings) * 1e6:9.1f} us/call")
+    
+    return 1 if mismatches else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
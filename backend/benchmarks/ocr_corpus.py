@@ -0,0 +1,119 @@
+"""
+Synthetic marksheet corpus shared by the OCR benchmarks
+
+Ground truth lives in benchmarks/corpus/*.json. Each document is rendered
+locally into one image per listed variant, so the benchmarks need no
+scanned fixtures.
+"""
+import glob
+import json
+import os
+import zlib
+
+import cv2
+import numpy as np
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+# A4 at 200 DPI
+PAGE_WIDTH, PAGE_HEIGHT = 1654, 2339
+
+def load_corpus(corpus_dir=CORPUS_DIR):
+    """Load ground truth documents keyed by name"""
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(corpus_dir, '*.json'))):
+        with open(path) as handle:
+            corpus[os.path.splitext(os.path.basename(path))[0]] = json.load(handle)
+    return corpus
+
+def document_lines(truth):
+    """Text lines printed on a marksheet"""
+    info = truth['student_info']
+    lines = [
+        f"Name: {info['name']}",
+        f"Roll No: {info['roll_number']}",
+        f"Class: {info['class']}",
+        f"Term: {info['term']}",
+        ''
+    ]
+    lines.extend(
+        f"{mark['subject']}: {mark['marks_obtained']:g}/{mark['max_marks']:g}"
+        for mark in truth['marks_data']
+    )
+    return lines
+
+def render_page(truth):
+    """Render a clean grayscale page"""
+    page = np.full((PAGE_HEIGHT, PAGE_WIDTH), 255, dtype=np.uint8)
+    for row, line in enumerate(document_lines(truth)):
+        cv2.putText(page, line, (150, 250 + row * 90), cv2.FONT_HERSHEY_SIMPLEX, 1.6, 0, 3, cv2.LINE_AA)
+    return page
+
+def render_variant(truth, variant, seed):
+    """
+    Render a document as a specific capture variant
+    
+    scan: clean page. photo: enlarged, noisy page on a dark surface.
+    low_res: page downsampled to roughly 100 DPI.
+    """
+    page = render_page(truth)
+    rng = np.random.default_rng(seed)
+    
+    if variant == 'scan':
+        return page
+    if variant == 'low_res':
+        return cv2.resize(page, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+    if variant == 'photo':
+        enlarged = cv2.resize(page, None, fx=1.8, fy=1.8, interpolation=cv2.INTER_CUBIC)
+        height, width = enlarged.shape
+        frame = np.full((height + 800, width + 1200), 70, dtype=np.uint8)
+        frame[400:400 + height, 600:600 + width] = enlarged
+        noise = rng.normal(0, 12, frame.shape)
+        frame = np.clip(frame.astype(np.float32) * 0.92 + noise, 0, 255).astype(np.uint8)
+        return cv2.GaussianBlur(frame, (3, 3), 0)
+    raise ValueError(f"Unknown variant: {variant}")
+
+def write_corpus(output_dir, corpus_dir=CORPUS_DIR):
+    """
+    Render every document variant to PNG files
+    
+    Returns:
+        list: (image path, ground truth, variant) tuples
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    samples = []
+    for name, truth in load_corpus(corpus_dir).items():
+        for variant in truth.get('variants', ['scan']):
+            path = os.path.join(output_dir, f"{name}-{variant}.png")
+            seed = zlib.crc32(f"{name}-{variant}".encode('utf-8'))
+            cv2.imwrite(path, render_variant(truth, variant, seed))
+            samples.append((path, truth, variant))
+    return samples
+
+def _mark_key(mark):
+    return (mark['subject'], float(mark['marks_obtained']), float(mark['max_marks']))
+
+def marks_accuracy(result, truth):
+    """Fraction of ground-truth subject marks extracted exactly"""
+    expected = [_mark_key(mark) for mark in truth.get('marks_data', [])]
+    if not expected:
+        return None
+    extracted = {_mark_key(mark) for mark in result.get('marks_data', [])}
+    return sum(1 for mark in expected if mark in extracted) / len(expected)
+
+def info_accuracy(result, truth):
+    """Fraction of ground-truth student info fields extracted exactly"""
+    expected = truth.get('student_info', {})
+    if not expected:
+        return None
+    extracted = result.get('student_info', {})
+    return sum(1 for field, value in expected.items() if extracted.get(field) == value) / len(expected)
+
+def field_accuracy(result, truth):
+    """Fraction of ground-truth marks and student info fields extracted exactly"""
+    n_marks = len(truth.get('marks_data', []))
+    n_info = len(truth.get('student_info', {}))
+    if not n_marks + n_info:
+        return None
+    return ((marks_accuracy(result, truth) or 0) * n_marks +
+            (info_accuracy(result, truth) or 0) * n_info) / (n_marks + n_info)
@@ -0,0 +1,91 @@
+"""
+Compare legacy and adaptive marksheet preprocessing
+
+Runs every image in a directory through OCRProcessor with adaptive
+preprocessing off and on, and reports time, pixels handed to tesseract and,
+for images with a `<name>.json` ground truth file next to them, extraction
+accuracy. Without a directory the synthetic corpus is rendered and used.
+
+Usage (from the backend directory):
+    python -m benchmarks.ocr_preprocess [path/to/marksheets]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.ocr_corpus import field_accuracy, write_corpus
+from utils.ocr import OCRProcessor
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+def run_mode(paths, adaptive):
+    """Benchmark one preprocessing mode over all images"""
+    processor = OCRProcessor({'adaptive_preprocessing': adaptive})
+    preprocess_times, ocr_times, pixels, accuracies = [], [], [], []
+    
+    for path in paths:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"skipping unreadable image {path}", file=sys.stderr)
+            continue
+        
+        started = time.perf_counter()
+        processed = processor.preprocess_image(image)
+        preprocess_times.append(time.perf_counter() - started)
+        pixels.append(processed.shape[0] * processed.shape[1])
+        
+        try:
+            started = time.perf_counter()
+            result = processor._process_uncached(path)
+            ocr_times.append(time.perf_counter() - started)
+        except Exception as e:
+            print(f"OCR failed for {path}: {e}", file=sys.stderr)
+            continue
+        
+        truth_path = os.path.splitext(path)[0] + '.json'
+        if os.path.exists(truth_path):
+            with open(truth_path) as handle:
+                accuracy = field_accuracy(result, json.load(handle))
+            if accuracy is not None:
+                accuracies.append(accuracy)
+    
+    return {
+        'images': len(pixels),
+        'median_preprocess_ms': round(statistics.median(preprocess_times) * 1000, 1) if preprocess_times else None,
+        'median_megapixels': round(statistics.median(pixels) / 1e6, 2) if pixels else None,
+        'median_ocr_ms': round(statistics.median(ocr_times) * 1000, 1) if ocr_times else None,
+        'mean_field_accuracy': round(statistics.mean(accuracies), 3) if accuracies else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', nargs='?', help='Directory of marksheet images')
+    args = parser.parse_args()
+    
+    if args.directory is None:
+        args.directory = tempfile.mkdtemp(prefix='ocr-corpus-')
+        for path, truth, _ in write_corpus(args.directory):
+            with open(os.path.splitext(path)[0] + '.json', 'w') as handle:
+                json.dump(truth, handle)
+    
+    paths = sorted(
+        os.path.join(args.directory, name) for name in os.listdir(args.directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    
+    report = {
+        'legacy': run_mode(paths, adaptive=False),
+        'adaptive': run_mode(paths, adaptive=True)
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+OCR latency and accuracy regression harness
+
+Renders the synthetic corpus, runs process_marksheet end to end on every
+image and reports p50/p95 latency, pages/sec per core and field-level
+accuracy for extract_marks and extract_student_info. Results are compared
+against a stored JSON baseline and the run exits non-zero on regression.
+
+Usage (from the backend directory):
+    python -m benchmarks.ocr_regression                    # compare with baseline
+    python -m benchmarks.ocr_regression --update-baseline  # record a new baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.ocr_corpus import write_corpus, marks_accuracy, info_accuracy
+from utils.ocr import OCRProcessor
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'ocr.json')
+
+# Allowed drift before a run counts as a regression
+ACCURACY_TOLERANCE = 0.02  # absolute drop in field accuracy
+LATENCY_TOLERANCE = 0.25  # relative increase in p95 latency
+
+def run_benchmark(samples, config):
+    """Process every sample and collect latency and accuracy metrics"""
+    processor = OCRProcessor(config)
+    latencies, marks_scores, info_scores, failures = [], [], [], []
+    
+    for path, truth, variant in samples:
+        started = time.perf_counter()
+        try:
+            result = processor.process_marksheet(path)
+        except Exception as e:
+            failures.append({'file': os.path.basename(path), 'error': str(e)})
+            continue
+        latencies.append(time.perf_counter() - started)
+        
+        score = marks_accuracy(result, truth)
+        if score is not None:
+            marks_scores.append(score)
+        score = info_accuracy(result, truth)
+        if score is not None:
+            info_scores.append(score)
+    
+    total_time = sum(latencies)
+    return {
+        'pages': len(latencies),
+        'failures': failures,
+        'latency_p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 1) if latencies else None,
+        'latency_p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 1) if latencies else None,
+        # Pages are processed sequentially in one process, i.e. on one core
+        'pages_per_sec_per_core': round(len(latencies) / total_time, 3) if total_time else None,
+        'marks_accuracy': round(statistics.mean(marks_scores), 4) if marks_scores else None,
+        'student_info_accuracy': round(statistics.mean(info_scores), 4) if info_scores else None
+    }
+
+def compare(report, baseline):
+    """List human-readable regressions of report against baseline"""
+    regressions = []
+    
+    if report['failures']:
+        regressions.append(f"{len(report['failures'])} pages failed to process")
+    
+    for metric in ('marks_accuracy', 'student_info_accuracy'):
+        if baseline.get(metric) is None:
+            continue
+        current = report.get(metric) or 0
+        if current < baseline[metric] - ACCURACY_TOLERANCE:
+            regressions.append(f"{metric} dropped from {baseline[metric]} to {current}")
+    
+    if baseline.get('latency_p95_ms') and report.get('latency_p95_ms'):
+        limit = baseline['latency_p95_ms'] * (1 + LATENCY_TOLERANCE)
+        if report['latency_p95_ms'] > limit:
+            regressions.append(
+                f"latency_p95_ms rose from {baseline['latency_p95_ms']} to {report['latency_p95_ms']}"
+            )
+    
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='Write this run as the new baseline')
+    parser.add_argument('--backend', default='auto', help='OCR backend to benchmark')
+    args = parser.parse_args()
+    
+    samples = write_corpus(tempfile.mkdtemp(prefix='ocr-corpus-'))
+    # The result cache is left unset so every page runs through tesseract
+    report = run_benchmark(samples, {'backend': args.backend})
+    report['cpu_count'] = os.cpu_count()
+    print(json.dumps(report, indent=2))
+    
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write('\n')
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one", file=sys.stderr)
+        return 0
+    
+    with open(args.baseline) as handle:
+        regressions = compare(report, json.load(handle))
+    
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
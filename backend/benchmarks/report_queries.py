@@ -0,0 +1,188 @@
+"""
+SQL statement budget check for the student attendance report
+
+Seeds an in-memory database with one student holding thousands of
+attendance records across several courses and terms, then calls
+GET /api/attendance/student/<id>/report and counts the SQL statements it
+issues when bitmaps are present, on the raw-record fallback and with
+one term archived. Reported counts are checked against the records and
+the run exits non-zero if any path exceeds its statement budget.
+
+Usage (from the backend directory):
+    python -m benchmarks.report_queries
+    python -m benchmarks.report_queries --courses 8 --days 365
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep model artifacts and OCR cache out of the working tree
+os.environ.setdefault('MODEL_FOLDER', tempfile.mkdtemp(prefix='report-bench-'))
+os.environ.setdefault('OCR_CACHE_PATH', '')
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app, db
+from models.institution import Institution
+from models.user import User
+from models.profiles import Student
+from models.academic import Department, Course, AcademicYear, Term, Enrollment
+from models.tracking import AttendanceRecord, AttendanceBitmap
+from utils.attendance_archive import archive_term
+from utils.attendance_bitmap import rebuild_bitmaps
+from utils.attendance_rollup import STATUSES, rebuild_rollups
+
+# Statements allowed per request: the access check's user lookup, the
+# joined report query and, without bitmaps, one grouped aggregate.
+# Archive files are read with sqlite3 and issue no statements here.
+BITMAP_BUDGET = 2
+FALLBACK_BUDGET = 3
+
+def seed(courses, terms, days):
+    """Create one student enrolled in every course for every term"""
+    institution = Institution('Benchmark School', 'BENCH', 'school')
+    db.session.add(institution)
+    db.session.flush()
+    
+    admin = User('admin@bench.local', 'password', 'Admin', 'admin')
+    admin.institution_id = institution.id
+    user = User('student@bench.local', 'password', 'Student', 'student')
+    user.institution_id = institution.id
+    db.session.add_all([admin, user])
+    db.session.flush()
+    
+    student = Student(user_id=user.id, roll_number='BENCH-1')
+    department = Department(name='Benchmarks', code='BEN', institution_id=institution.id)
+    year = AcademicYear(name='Benchmark', start_date=date(2020, 1, 1), end_date=date(2030, 12, 31),
+                        institution_id=institution.id)
+    db.session.add_all([student, department, year])
+    db.session.flush()
+    
+    term_rows = []
+    for t in range(terms):
+        start = date(2024, 1, 1) + timedelta(days=t * (days + 14))
+        term = Term(name=f'Term {t + 1}', start_date=start, end_date=start + timedelta(days=days - 1),
+                    academic_year_id=year.id)
+        db.session.add(term)
+        term_rows.append(term)
+    course_rows = [
+        Course(name=f'Course {c + 1}', code=f'C{c + 1}', department_id=department.id,
+               institution_id=institution.id)
+        for c in range(courses)
+    ]
+    db.session.add_all(course_rows)
+    db.session.flush()
+    
+    records = []
+    for course in course_rows:
+        for term in term_rows:
+            enrollment = Enrollment(student_id=student.id, course_id=course.id, term_id=term.id)
+            db.session.add(enrollment)
+            db.session.flush()
+            records.extend(
+                {
+                    'enrollment_id': enrollment.id,
+                    'date': term.start_date + timedelta(days=d),
+                    'status': STATUSES[(d * 7 + course.id) % 5 % 3]
+                }
+                for d in range(days)
+            )
+    db.session.bulk_insert_mappings(AttendanceRecord, records)
+    db.session.commit()
+    return admin, student, term_rows, len(records)
+
+def expected_totals(student_id, start_date, end_date):
+    """Status counts straight from the attendance records"""
+    query = db.session.query(AttendanceRecord.status)\
+        .join(Enrollment, AttendanceRecord.enrollment_id == Enrollment.id)\
+        .filter(Enrollment.student_id == student_id)
+    if start_date:
+        query = query.filter(AttendanceRecord.date >= start_date)
+    if end_date:
+        query = query.filter(AttendanceRecord.date <= end_date)
+    return Counter(status for status, in query)
+
+def measure(client, headers, student_id, start_date, end_date):
+    """Fetch the report and count the statements it issued"""
+    statements = []
+    
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    params = {}
+    if start_date:
+        params['start_date'] = start_date.isoformat()
+    if end_date:
+        params['end_date'] = end_date.isoformat()
+    
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        started = time.perf_counter()
+        response = client.get(f'/api/attendance/student/{student_id}/report',
+                              query_string=params, headers=headers)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    
+    if response.status_code != 200:
+        raise RuntimeError(f"Report request failed with {response.status_code}: {response.get_json()}")
+    return response.get_json()['overall_statistics'], len(statements), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--courses', type=int, default=6, help='Courses the student is enrolled in')
+    parser.add_argument('--terms', type=int, default=2, help='Terms per course')
+    parser.add_argument('--days', type=int, default=300, help='Marked days per term')
+    args = parser.parse_args()
+    
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        admin, student, terms, total = seed(args.courses, args.terms, args.days)
+        rebuild_rollups()
+        rebuild_bitmaps()
+        
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
+        ranges = [
+            (None, None),
+            (terms[0].start_date + timedelta(days=10), terms[-1].end_date - timedelta(days=10)),
+            (terms[0].start_date + timedelta(days=3), terms[0].start_date + timedelta(days=40))
+        ]
+        
+        print(f"{total} attendance records over {args.courses} courses x {args.terms} terms")
+        expected = [expected_totals(student.id, start_date, end_date) for start_date, end_date in ranges]
+        
+        failures = []
+        passes = (('bitmaps', BITMAP_BUDGET), ('fallback', FALLBACK_BUDGET), ('archived', FALLBACK_BUDGET))
+        for label, budget in passes:
+            if label == 'fallback':
+                AttendanceBitmap.query.delete()
+                db.session.commit()
+            elif label == 'archived':
+                # Raw records of the first term now come from its archive file
+                archive_term(terms[0].id, tempfile.mkdtemp(prefix='report-archive-'), force=True)
+            
+            for (start_date, end_date), totals in zip(ranges, expected):
+                stats, statements, elapsed = measure(client, headers, student.id, start_date, end_date)
+                
+                span = f"{start_date or '-'}..{end_date or '-'}"
+                print(f"  {label:<8} {span:<24} {statements} statements  {elapsed * 1000:7.1f} ms")
+                if statements > budget:
+                    failures.append(f"{label} {span}: {statements} statements, budget {budget}")
+                if any(stats[status] != totals[status] for status in STATUSES):
+                    failures.append(f"{label} {span}: counts {stats} do not match records {dict(totals)}")
+    
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+import pandas as pd
+import json
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+model_cli = AppGroup('model', help='Manage performance prediction model artifacts.')
+
+@model_cli.command('train')
+@click.option('--data', 'data_path', type=click.Path(exists=True, dir_okay=False),
+              help='CSV of feature columns plus a "label" column. Defaults to the bootstrap data.')
+@click.option('--version', default=None, help='Version tag for the new artifact.')
+def train_model(data_path, version):
+    """Train the performance predictor offline and register the artifact"""
+    from utils.predict import train_and_register, BOOTSTRAP_TRAINING_DATA, BOOTSTRAP_LABELS
+    
+    if data_path:
+        frame = pd.read_csv(data_path)
+        if 'label' not in frame.columns:
+            raise click.ClickException('Training data must include a "label" column')
+        labels = frame.pop('label').tolist()
+        training_data = frame
+    else:
+        training_data, labels = BOOTSTRAP_TRAINING_DATA, BOOTSTRAP_LABELS
+    
+    version = train_and_register(current_app.config['MODEL_FOLDER'], training_data, labels, version)
+    click.echo(f"Registered model {version} trained on {len(labels)} rows")
+
+@model_cli.command('list')
+def list_models():
+    """List registered model artifacts"""
+    from utils.model_registry import ModelRegistry
+    
+    registry = ModelRegistry(current_app.config['MODEL_FOLDER'])
+    latest = registry.latest_version()
+    for version in registry.list_versions():
+        click.echo(f"{'*' if version == latest else ' '} {version}")
+
+@model_cli.command('promote')
+@click.argument('version')
+def promote_model(version):
+    """Point serving workers at a registered artifact"""
+    from utils.model_registry import ModelRegistry
+    
+    try:
+        ModelRegistry(current_app.config['MODEL_FOLDER']).promote(version)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Promoted model {version}")
+
+@model_cli.command('retrain')
+@click.option('--chunk-size', type=int, default=1000, show_default=True,
+              help='Enrollments read per chunk.')
+@click.option('--holdout', type=float, default=0.2, show_default=True,
+              help='Share of labelled rows held out for evaluation.')
+@click.option('--n-jobs', type=int, default=-1, show_default=True,
+              help='Parallel training jobs, -1 for every core.')
+@click.option('--force', is_flag=True, help='Promote even if the new model scores worse on the holdout.')
+@click.option('--interval', type=int, default=None,
+              help='Keep running and retrain every this many seconds.')
+def retrain_model(chunk_size, holdout, n_jobs, force, interval):
+    """Retrain the predictor on labelled history and promote it if it improves"""
+    from utils.training import retrain
+    
+    while True:
+        try:
+            report = retrain(current_app.config['MODEL_FOLDER'], chunk_size=chunk_size,
+                             holdout=holdout, n_jobs=n_jobs, force=force)
+            metrics, baseline = report['metrics'], report['baseline_metrics']
+            click.echo(f"Trained {report['version']} on {report['training_rows']} rows "
+                       f"in {report['elapsed_seconds']}s, holdout MAE {metrics['mae']}"
+                       + (f" vs {baseline['mae']} for {report['previous_version']}" if baseline else ''))
+            click.echo(f"{'Promoted' if report['promoted'] else 'Kept'} "
+                       f"{report['version'] if report['promoted'] else report['previous_version']}")
+        except ValueError as e:
+            if interval is None:
+                raise click.ClickException(str(e))
+            click.echo(f"Skipped retraining: {e}")
+        except Exception as e:
+            # A scheduled run must survive a failed cycle
+            if interval is None:
+                raise
+            logger.error(f"Error in scheduled retraining: {str(e)}")
+        
+        if interval is None:
+            return
+        time.sleep(interval)
+
+ocr_cli = AppGroup('ocr', help='Marksheet OCR utilities.')
+
+@ocr_cli.command('bulk')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--workers', type=int, default=None, help='Worker processes. Defaults to the number of cores.')
+@click.option('--term-id', type=int, default=None,
+              help='Store results as marksheets for this term, matching students by roll number.')
+def bulk_ocr(directory, workers, term_id):
+    """Process every marksheet in a directory in parallel"""
+    from app import db
+    from models.profiles import Student
+    from models.tracking import Marksheet
+    from utils.ocr import process_marksheets_parallel, get_ocr_config
+    
+    allowed = current_app.config['ALLOWED_EXTENSIONS']
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if '.' in name and name.rsplit('.', 1)[1].lower() in allowed
+    )
+    
+    processed, failed = 0, 0
+    started = time.perf_counter()
+    
+    # Results arrive in completion order, one JSON line per file
+    config = get_ocr_config(current_app.config)
+    for path, result, error in process_marksheets_parallel(paths, max_workers=workers, config=config):
+        record = {'file': path, 'status': 'completed'}
+        
+        if error is None and term_id is not None:
+            roll_number = result['student_info'].get('roll_number')
+            student = Student.query.filter_by(roll_number=roll_number).first() if roll_number else None
+            if student:
+                marksheet = Marksheet.from_ocr_result(student.id, term_id, path, result)
+                db.session.add(marksheet)
+                db.session.commit()
+                record['marksheet_id'] = marksheet.id
+            else:
+                error = f"No student found for roll number: {roll_number}"
+        
+        if error is None:
+            processed += 1
+            record['results'] = result
+        else:
+            failed += 1
+            record.update(status='failed', error=error)
+        
+        click.echo(json.dumps(record))
+    
+    elapsed = time.perf_counter() - started
+    rate = len(paths) / elapsed if elapsed > 0 else 0
+    click.echo(f"Processed {processed} of {len(paths)} files ({failed} failed) "
+               f"in {elapsed:.1f}s, {rate:.2f} files/sec", err=True)
+
+attendance_cli = AppGroup('attendance', help='Attendance maintenance commands.')
+
+@attendance_cli.command('rebuild-rollups')
+@click.option('--chunk-size', type=int, default=10000, show_default=True,
+              help='Attendance records streamed per batch.')
+def rebuild_attendance_rollups(chunk_size):
+    """Recompute attendance rollups, bitmaps and stats from live and archived attendance records"""
+    from app import db
+    from utils.attendance_rollup import rebuild_rollups
+    from utils.attendance_bitmap import rebuild_bitmaps
+    from utils.attendance_stats import rebuild_stats
+    from utils.feature_store import mark_features_stale
+    
+    started = time.perf_counter()
+    written = rebuild_rollups(chunk_size=chunk_size)
+    bitmaps = rebuild_bitmaps(chunk_size=chunk_size)
+    stats = rebuild_stats()
+    # Stored prediction features are recomputed from the new stats on next read
+    mark_features_stale(db.session)
+    db.session.commit()
+    click.echo(f"Rebuilt {written} attendance rollups, {bitmaps} bitmaps and {stats} stats rows "
+               f"in {time.perf_counter() - started:.1f}s")
+
+@attendance_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', type=int, default=1000, show_default=True,
+              help='Rows committed per transaction.')
+@click.option('--marked-by', type=int, default=None, help='User ID recorded as marking the imported rows.')
+def import_attendance_history(path, chunk_size, marked_by):
+    """Import attendance history from a CSV or .xlsx file"""
+    from utils.attendance_import import import_attendance, iter_csv_rows, iter_excel_rows
+    
+    try:
+        if path.lower().endswith('.xlsx'):
+            report = import_attendance(iter_excel_rows(path), marked_by, chunk_size)
+        else:
+            with open(path, newline='', encoding='utf-8-sig') as stream:
+                report = import_attendance(iter_csv_rows(stream), marked_by, chunk_size)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    
+    for rejection in report['rejections']:
+        click.echo(f"line {rejection['line']}: {rejection['error']}", err=True)
+    if report['rejected'] > len(report['rejections']):
+        click.echo(f"... {report['rejected'] - len(report['rejections'])} more rejected rows", err=True)
+    click.echo(f"Imported {report['imported']} of {report['rows']} rows ({report['rejected']} rejected) "
+               f"in {report['elapsed_seconds']:.1f}s, {report['rows_per_second']:.0f} rows/sec")
+
+@attendance_cli.command('archive')
+@click.argument('term_ids', nargs=-1, type=int)
+@click.option('--closed', is_flag=True, help='Archive every term that has ended and is not archived yet.')
+@click.option('--force', is_flag=True, help='Archive the given terms even if they have not ended.')
+def archive_attendance(term_ids, closed, force):
+    """Move attendance records of closed terms into per-term archive files"""
+    from datetime import date
+    from app import db
+    from models.academic import Term
+    from models.tracking import ArchivedTerm
+    from utils.attendance_archive import archive_term
+    
+    term_ids = list(term_ids)
+    if closed:
+        rows = db.session.query(Term.id)\
+            .outerjoin(ArchivedTerm, ArchivedTerm.term_id == Term.id)\
+            .filter(Term.end_date < date.today(), ArchivedTerm.id.is_(None)).all()
+        term_ids.extend(term_id for term_id, in rows if term_id not in term_ids)
+    if not term_ids:
+        raise click.UsageError('Give one or more term IDs or --closed')
+    
+    folder = current_app.config['ATTENDANCE_ARCHIVE_FOLDER']
+    for term_id in term_ids:
+        started = time.perf_counter()
+        try:
+            archive = archive_term(term_id, folder, force=force)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Archived {archive.record_count} records of term {term_id} to {archive.path} "
+                   f"in {time.perf_counter() - started:.1f}s")
+
+schema_cli = AppGroup('schema', help='Database schema maintenance.')
+
+@schema_cli.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='Stop after this version.')
+def upgrade_schema(target):
+    """Apply pending schema migrations"""
+    from utils.migrations import upgrade, current_version
+    
+    applied = upgrade(target)
+    for step in applied:
+        click.echo(f"Applied {step.version:04d} {step.description}")
+    click.echo(f"Schema at version {current_version()}")
+
+@schema_cli.command('current')
+def show_schema_version():
+    """Show the applied and latest schema versions"""
+    from utils.migrations import MIGRATIONS, current_version
+    
+    current = current_version()
+    for step in MIGRATIONS:
+        click.echo(f"{'*' if step.version <= current else ' '} {step.version:04d} {step.description}")
+    click.echo(f"Schema at version {current}")
+
+def register_cli(app):
+    """Register management command groups with the application"""
+    app.cli.add_command(model_cli)
+    app.cli.add_command(ocr_cli)
+    app.cli.add_command(attendance_cli)
+    app.cli.add_command(schema_cli)
@@ -11,6 +11,8 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///student_dashboard.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Apply pending migrations at startup instead of with `flask schema upgrade`
+    SCHEMA_AUTO_UPGRADE = os.environ.get('SCHEMA_AUTO_UPGRADE', '').lower() in ('1', 'true', 'yes')
     
     # File Upload
     UPLOAD_FOLDER = 'uploads'
@@ -19,6 +21,25 @@ class Config:
     
     # OCR Configuration
     OCR_LANGUAGE = 'eng'  # Default language for OCR
+    OCR_BACKEND = os.environ.get('OCR_BACKEND', 'auto')  # auto, tesserocr or pytesseract
+    OCR_WORKERS = int(os.environ.get('OCR_WORKERS', 2))  # Background OCR worker threads
+    OCR_JOB_STALE_AFTER = int(os.environ.get('OCR_JOB_STALE_AFTER', 1800))  # Seconds before startup requeues a processing job
+    OCR_CACHE_PATH = os.environ.get('OCR_CACHE_PATH', 'ocr_cache.db')  # Empty to disable result caching
+    OCR_CACHE_MAX_ENTRIES = 5000
+    OCR_PDF_DPI = 200  # Rasterization resolution for PDF marksheets
+    OCR_PAGE_WORKERS = 4  # PDF pages OCRed concurrently per marksheet
+    OCR_ADAPTIVE_PREPROCESSING = True  # Rescale to target text height and crop to the text region
+    OCR_TARGET_TEXT_HEIGHT = 32  # Median glyph height in pixels handed to tesseract
+    
+    # Attendance
+    ATTENDANCE_ARCHIVE_FOLDER = os.environ.get('ATTENDANCE_ARCHIVE_FOLDER', 'attendance_archive')
+    
+    # Prediction Model
+    MODEL_FOLDER = os.environ.get('MODEL_FOLDER', 'model_artifacts')
+    PREDICTOR_ENGINE = os.environ.get('PREDICTOR_ENGINE', 'sklearn')  # sklearn, or compiled for flat-array inference
+    MODEL_RELOAD_INTERVAL = int(os.environ.get('MODEL_RELOAD_INTERVAL', 60))  # Seconds between LATEST checks; 0 to disable
+    PREDICTION_CACHE_MAX_ENTRIES = 10000  # 0 to disable result caching
+    PREDICTION_CACHE_TTL = int(os.environ.get('PREDICTION_CACHE_TTL', 900))  # Seconds a cached prediction is reused
     
     # Cors Configuration
     CORS_HEADERS = 'Content-Type'
@@ -37,6 +58,7 @@ class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SCHEMA_AUTO_UPGRADE = True
 
 # Configuration dictionary
 config = {
@@ -89,6 +89,11 @@ class Term(db.Model):
 class Enrollment(db.Model):
     """Enrollment model for storing student course enrollments"""
     __tablename__ = 'enrollments'
+    __table_args__ = (
+        db.Index('ix_enrollments_student_course', 'student_id', 'course_id'),
+        db.Index('ix_enrollments_course_term', 'course_id', 'term_id'),
+        db.Index('ix_enrollments_term', 'term_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
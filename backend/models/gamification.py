@@ -84,6 +84,9 @@ class LeaderboardRanking(db.Model):
 class PointTransaction(db.Model):
     """Model for tracking point transactions"""
     __tablename__ = 'point_transactions'
+    __table_args__ = (
+        db.Index('ix_point_transactions_student_created', 'student_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
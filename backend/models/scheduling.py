@@ -26,6 +26,10 @@ class Timetable(db.Model):
 class TimeSlot(db.Model):
     """Model for storing individual time slots in a timetable"""
     __tablename__ = 'time_slots'
+    __table_args__ = (
+        db.Index('ix_time_slots_timetable_day', 'timetable_id', 'day_of_week'),
+        db.Index('ix_time_slots_teacher', 'teacher_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     timetable_id = db.Column(db.Integer, db.ForeignKey('timetables.id'), nullable=False)
@@ -76,6 +80,9 @@ class Notification(db.Model):
 class Assignment(db.Model):
     """Model for storing course assignments"""
     __tablename__ = 'assignments'
+    __table_args__ = (
+        db.Index('ix_assignments_course', 'course_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
@@ -99,6 +106,9 @@ class Assignment(db.Model):
 class AssignmentSubmission(db.Model):
     """Model for storing assignment submissions"""
     __tablename__ = 'assignment_submissions'
+    __table_args__ = (
+        db.Index('ix_assignment_submissions_student_assignment', 'student_id', 'assignment_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     assignment_id = db.Column(db.Integer, db.ForeignKey('assignments.id'), nullable=False)
@@ -4,6 +4,9 @@ from datetime import datetime
 class AttendanceRecord(db.Model):
     """Model for tracking student attendance"""
     __tablename__ = 'attendance_records'
+    __table_args__ = (
+        db.Index('uq_attendance_enrollment_date', 'enrollment_id', 'date', unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     enrollment_id = db.Column(db.Integer, db.ForeignKey('enrollments.id'), nullable=False)
@@ -21,9 +24,102 @@ class AttendanceRecord(db.Model):
     def __repr__(self):
         return f'<AttendanceRecord {self.enrollment_id}-{self.date}>'
 
+class AttendanceRollup(db.Model):
+    """Model for precomputed attendance counts per enrollment or course and period"""
+    __tablename__ = 'attendance_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('scope', 'scope_id', 'period', 'period_start', name='uq_attendance_rollup_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(20), nullable=False)  # enrollment, course
+    scope_id = db.Column(db.Integer, nullable=False)  # enrollment_id or course_id
+    period = db.Column(db.String(10), nullable=False)  # day, week, month
+    period_start = db.Column(db.Date, nullable=False)
+    present = db.Column(db.Integer, nullable=False, default=0)
+    absent = db.Column(db.Integer, nullable=False, default=0)
+    late = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<AttendanceRollup {self.scope}-{self.scope_id}-{self.period}-{self.period_start}>'
+
+class AttendanceBitmap(db.Model):
+    """Model for a compact per-day attendance status vector of an enrollment"""
+    __tablename__ = 'attendance_bitmaps'
+
+    id = db.Column(db.Integer, primary_key=True)
+    enrollment_id = db.Column(db.Integer, db.ForeignKey('enrollments.id'), nullable=False, unique=True)
+    base_date = db.Column(db.Date, nullable=False)  # Normally the term start date
+    # Bit i of a status column is set when that status was marked on base_date + i days,
+    # stored as little-endian integer bytes
+    present = db.Column(db.LargeBinary, nullable=False, default=b'')
+    absent = db.Column(db.LargeBinary, nullable=False, default=b'')
+    late = db.Column(db.LargeBinary, nullable=False, default=b'')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<AttendanceBitmap {self.enrollment_id}-{self.base_date}>'
+
+class AttendanceStats(db.Model):
+    """Model for running attendance counters and risk flags per enrollment"""
+    __tablename__ = 'attendance_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    enrollment_id = db.Column(db.Integer, db.ForeignKey('enrollments.id'), nullable=False, unique=True)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False, index=True)
+    present = db.Column(db.Integer, nullable=False, default=0)
+    absent = db.Column(db.Integer, nullable=False, default=0)
+    late = db.Column(db.Integer, nullable=False, default=0)
+    percentage = db.Column(db.Float, nullable=False, default=0.0)
+    # Counters over the sliding window ending at the last marked day
+    window_total = db.Column(db.Integer, nullable=False, default=0)
+    window_present = db.Column(db.Integer, nullable=False, default=0)
+    window_percentage = db.Column(db.Float, nullable=False, default=0.0)
+    current_streak = db.Column(db.Integer, nullable=False, default=0)
+    last_marked_date = db.Column(db.Date)
+    at_risk = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert attendance stats to dictionary"""
+        return {
+            'enrollment_id': self.enrollment_id,
+            'course_id': self.course_id,
+            'total': self.present + self.absent + self.late,
+            'present': self.present,
+            'absent': self.absent,
+            'late': self.late,
+            'percentage': round(self.percentage, 2),
+            'window_total': self.window_total,
+            'window_percentage': round(self.window_percentage, 2),
+            'current_streak': self.current_streak,
+            'last_marked_date': self.last_marked_date.isoformat() if self.last_marked_date else None,
+            'at_risk': self.at_risk
+        }
+
+    def __repr__(self):
+        return f'<AttendanceStats {self.enrollment_id}>'
+
+class ArchivedTerm(db.Model):
+    """Model for a term whose attendance records were moved to an archive file"""
+    __tablename__ = 'archived_terms'
+
+    id = db.Column(db.Integer, primary_key=True)
+    term_id = db.Column(db.Integer, db.ForeignKey('terms.id'), nullable=False, unique=True)
+    path = db.Column(db.String(255), nullable=False)
+    record_count = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ArchivedTerm {self.term_id}>'
+
 class Marksheet(db.Model):
     """Model for storing marksheet information"""
     __tablename__ = 'marksheets'
+    __table_args__ = (
+        db.Index('ix_marksheets_student', 'student_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
@@ -47,6 +143,28 @@ class Marksheet(db.Model):
     def __repr__(self):
         return f'<Marksheet {self.student_id}-{self.term_id}>'
 
+    @classmethod
+    def from_ocr_result(cls, student_id, term_id, scanned_copy_path, result):
+        """Build an unverified marksheet and its subject marks from OCR output"""
+        marksheet = cls(
+            student_id=student_id,
+            term_id=term_id,
+            total_marks=result['total_marks']['obtained'],
+            percentage=result['total_marks']['percentage'],
+            scanned_copy_path=scanned_copy_path,
+            verified=False,
+            verified_by_id=None
+        )
+        
+        for mark_data in result['marks_data']:
+            SubjectMark(
+                marksheet=marksheet,
+                marks_obtained=mark_data['marks_obtained'],
+                max_marks=mark_data['max_marks']
+            )
+        
+        return marksheet
+
     def calculate_total(self):
         """Calculate total marks and percentage"""
         total = sum(mark.marks_obtained for mark in self.subject_marks)
@@ -89,9 +207,56 @@ class SubjectMark(db.Model):
     def __repr__(self):
         return f'<SubjectMark {self.marksheet_id}-{self.course_id}>'
 
+class OCRJob(db.Model):
+    """Model for tracking background marksheet OCR jobs"""
+    __tablename__ = 'ocr_jobs'
+    __table_args__ = (
+        db.Index('ix_ocr_jobs_status', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    term_id = db.Column(db.Integer, db.ForeignKey('terms.id'), nullable=False)
+    file_path = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), default='queued')  # queued, processing, completed, failed
+    result = db.Column(db.JSON)  # Extracted OCR data once completed
+    error = db.Column(db.Text)
+    marksheet_id = db.Column(db.Integer, db.ForeignKey('marksheets.id'))
+    submitted_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+
+    # Relationships
+    student = db.relationship('Student')
+    term = db.relationship('Term')
+    marksheet = db.relationship('Marksheet')
+    submitted_by = db.relationship('User')
+
+    def __repr__(self):
+        return f'<OCRJob {self.id}-{self.status}>'
+
+    def to_dict(self):
+        """Convert job object to dictionary"""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'student_id': self.student_id,
+            'term_id': self.term_id,
+            'marksheet_id': self.marksheet_id,
+            'results': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+
 class PerformancePrediction(db.Model):
     """Model for storing AI-generated performance predictions"""
     __tablename__ = 'performance_predictions'
+    __table_args__ = (
+        db.Index('ix_performance_predictions_student_date', 'student_id', 'prediction_date'),
+        db.Index('ix_performance_predictions_course', 'course_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
@@ -107,4 +272,26 @@ class PerformancePrediction(db.Model):
     course = db.relationship('Course')
 
     def __repr__(self):
-        return f'<PerformancePrediction {self.student_id}-{self.course_id}>'
\ No newline at end of file
+        return f'<PerformancePrediction {self.student_id}-{self.course_id}>'
+
+class PredictionFeatures(db.Model):
+    """Model for precomputed prediction inputs per enrollment"""
+    __tablename__ = 'prediction_features'
+    __table_args__ = (
+        db.Index('ix_prediction_features_student_course', 'student_id', 'course_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    enrollment_id = db.Column(db.Integer, db.ForeignKey('enrollments.id'), nullable=False, unique=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    attendance_percentage = db.Column(db.Float, nullable=False, default=0.0)
+    assignment_completion_rate = db.Column(db.Float, nullable=False, default=0.0)
+    submission_timeliness = db.Column(db.Float, nullable=False, default=0.0)
+    previous_grade = db.Column(db.Float)  # Latest verified marksheet percentage before the term
+    # Set when a submission or marksheet changes; the row is recomputed on next read
+    stale = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<PredictionFeatures {self.enrollment_id}>'
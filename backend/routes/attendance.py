@@ -1,12 +1,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from utils.auth import role_required, student_access_required
-from models.tracking import AttendanceRecord
-from models.academic import Enrollment
+from utils.attendance_rollup import STATUSES, enrollment_status_counts, course_daily_counts
+from utils.attendance_store import upsert_attendance
+from utils.attendance_bitmap import StatusBitmap
+from utils.attendance_stats import RISK_THRESHOLD, RISK_WINDOW_DAYS, RISK_MIN_CLASSES
+from utils.attendance_archive import read_archived_counts
+from utils.attendance_import import import_attendance, iter_csv_rows, iter_excel_rows
+from models.tracking import AttendanceRecord, AttendanceBitmap, AttendanceStats, ArchivedTerm
+from models.academic import Enrollment, Course
 from models.profiles import Student
+from models.user import User
 from app import db
 import logging
 from datetime import datetime, timedelta
+from collections import Counter, defaultdict
 from sqlalchemy import func
 
 logger = logging.getLogger(__name__)
@@ -35,32 +43,20 @@ def mark_attendance():
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
         
-        # Check if attendance already marked
-        existing = AttendanceRecord.query.filter_by(
-            enrollment_id=data['enrollment_id'],
-            date=attendance_date
-        ).first()
-        
-        if existing:
-            # Update existing record
-            existing.status = data['status']
-            existing.remarks = data.get('remarks')
-            existing.marked_by_id = get_jwt_identity()
-        else:
-            # Create new record
-            record = AttendanceRecord(
-                enrollment_id=data['enrollment_id'],
-                date=attendance_date,
-                status=data['status'],
-                remarks=data.get('remarks'),
-                marked_by_id=get_jwt_identity()
-            )
-            db.session.add(record)
+        upsert_attendance([{
+            'enrollment_id': data['enrollment_id'],
+            'date': attendance_date,
+            'status': data['status'],
+            'remarks': data.get('remarks')
+        }], get_jwt_identity())
         
         db.session.commit()
         
         return jsonify({'message': 'Attendance marked successfully'}), 200
         
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error marking attendance: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -83,32 +79,21 @@ def mark_bulk_attendance():
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
         
-        # Process each attendance record
-        records_processed = 0
-        for record in data['attendance_data']:
-            if all(key in record for key in ['enrollment_id', 'status']):
-                # Check if attendance already marked
-                existing = AttendanceRecord.query.filter_by(
-                    enrollment_id=record['enrollment_id'],
-                    date=attendance_date
-                ).first()
-                
-                if existing:
-                    existing.status = record['status']
-                    existing.remarks = record.get('remarks')
-                    existing.marked_by_id = get_jwt_identity()
-                else:
-                    new_record = AttendanceRecord(
-                        enrollment_id=record['enrollment_id'],
-                        date=attendance_date,
-                        status=record['status'],
-                        remarks=record.get('remarks'),
-                        marked_by_id=get_jwt_identity()
-                    )
-                    db.session.add(new_record)
-                
-                records_processed += 1
+        # Validate records up front, then write them as one batch
+        rows = [
+            {
+                'enrollment_id': record['enrollment_id'],
+                'date': attendance_date,
+                'status': record['status'],
+                'remarks': record.get('remarks')
+            }
+            for record in data['attendance_data']
+            if all(key in record for key in ['enrollment_id', 'status'])
+            and record['status'] in STATUSES
+        ]
         
+        upsert_attendance(rows, get_jwt_identity())
+        records_processed = len(rows)
         db.session.commit()
         
         return jsonify({
@@ -116,10 +101,51 @@ def mark_bulk_attendance():
             'records_processed': records_processed
         }), 200
         
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error marking bulk attendance: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@attendance_bp.route('/import', methods=['POST'])
+@jwt_required()
+@role_required(['admin'])
+def import_attendance_file():
+    """
+    Import historical attendance from an uploaded CSV or Excel file
+    
+    The file needs roll_number, course_code, date (YYYY-MM-DD) and status
+    columns, plus optional remarks. Rows are streamed and committed in
+    chunks; rejected rows are reported, not fatal.
+    
+    Returns:
+        JSON response with row counts, rows per second and rejected rows
+    """
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
+        
+        file = request.files['file']
+        extension = file.filename.rsplit('.', 1)[-1].lower() if '.' in file.filename else ''
+        if extension == 'csv':
+            rows = iter_csv_rows(file.stream)
+        elif extension == 'xlsx':
+            rows = iter_excel_rows(file.stream)
+        else:
+            return jsonify({'error': 'File must be a .csv or .xlsx file'}), 400
+        
+        chunk_size = request.form.get('chunk_size', 1000, type=int)
+        report = import_attendance(rows, marked_by_id=get_jwt_identity(), chunk_size=max(chunk_size, 1))
+        
+        return jsonify(report), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error importing attendance: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @attendance_bp.route('/student/<int:student_id>/report', methods=['GET'])
 @jwt_required()
 @student_access_required
@@ -136,47 +162,89 @@ def get_student_attendance_report(student_id):
         if end_date:
             end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
         
-        # Query attendance records
-        query = AttendanceRecord.query.join(Enrollment)\
-            .filter(Enrollment.student_id == student_id)
-        
-        if start_date:
-            query = query.filter(AttendanceRecord.date >= start_date)
-        if end_date:
-            query = query.filter(AttendanceRecord.date <= end_date)
-        
-        records = query.all()
-        
-        # Calculate statistics
-        total_classes = len(records)
-        present_count = sum(1 for r in records if r.status == 'present')
-        absent_count = sum(1 for r in records if r.status == 'absent')
-        late_count = sum(1 for r in records if r.status == 'late')
+        # Enrollments, course names, day-status bitmaps and archive files in one query
+        rows = db.session.query(
+            Enrollment.id.label('enrollment_id'), Course.id.label('course_id'),
+            Course.name.label('course_name'), ArchivedTerm.path.label('archive_path'),
+            AttendanceBitmap.base_date, AttendanceBitmap.present, AttendanceBitmap.absent, AttendanceBitmap.late
+        ).join(Course, Enrollment.course_id == Course.id)\
+        .outerjoin(AttendanceBitmap, AttendanceBitmap.enrollment_id == Enrollment.id)\
+        .outerjoin(ArchivedTerm, ArchivedTerm.term_id == Enrollment.term_id)\
+        .filter(Enrollment.student_id == student_id).all()
+        
+        course_names = {}
+        course_bitmaps = {}
+        enrollment_courses = {}
+        missing = []
+        missing_archived = defaultdict(list)
+        for row in rows:
+            course_id = row.course_id
+            course_names[course_id] = row.course_name
+            enrollment_courses[row.enrollment_id] = course_id
+            if row.base_date is None:
+                if row.archive_path:
+                    missing_archived[row.archive_path].append(row.enrollment_id)
+                else:
+                    missing.append(row.enrollment_id)
+                continue
+            
+            # Enrollments in several terms of a course share one bitmap
+            bitmap = StatusBitmap.from_model(row)
+            course_bitmaps[course_id] = course_bitmaps[course_id].merge(bitmap) \
+                if course_id in course_bitmaps else bitmap
+        
+        # Enrollments without a bitmap yet are counted from the records,
+        # with one aggregate query grouped by course and status, or from
+        # the archive files of archived terms
+        fallback_counts = defaultdict(Counter)
+        if missing:
+            query = db.session.query(
+                Enrollment.course_id, AttendanceRecord.status, func.count(AttendanceRecord.id)
+            ).join(Enrollment, AttendanceRecord.enrollment_id == Enrollment.id)\
+            .filter(AttendanceRecord.enrollment_id.in_(missing))
+            if start_date:
+                query = query.filter(AttendanceRecord.date >= start_date)
+            if end_date:
+                query = query.filter(AttendanceRecord.date <= end_date)
+            
+            for course_id, status, count in query.group_by(Enrollment.course_id, AttendanceRecord.status):
+                fallback_counts[course_id][status] += count
         
-        attendance_percentage = (present_count / total_classes * 100) if total_classes > 0 else 0
+        for enrollment_id, counts in read_archived_counts(missing_archived, start_date, end_date).items():
+            fallback_counts[enrollment_courses[enrollment_id]].update(counts)
         
         # Group by course
         course_wise = {}
-        for record in records:
-            course_id = record.enrollment.course_id
-            course_name = record.enrollment.course.name
+        for course_id, course_name in course_names.items():
+            counts = Counter()
+            current_streak, longest_streak = 0, 0
+            if course_id in course_bitmaps:
+                counts = course_bitmaps[course_id].counts(start_date, end_date)
+                current_streak, longest_streak = course_bitmaps[course_id].streaks(start_date, end_date)
+            counts.update(fallback_counts.get(course_id, {}))
             
-            if course_id not in course_wise:
-                course_wise[course_id] = {
-                    'course_name': course_name,
-                    'total': 0,
-                    'present': 0,
-                    'absent': 0,
-                    'late': 0
-                }
+            total = sum(counts[status] for status in STATUSES)
+            if total == 0:
+                continue
             
-            course_wise[course_id]['total'] += 1
-            course_wise[course_id][record.status] += 1
+            course_wise[course_id] = {
+                'course_name': course_name,
+                'total': total,
+                'present': counts['present'],
+                'absent': counts['absent'],
+                'late': counts['late'],
+                'percentage': counts['present'] / total * 100,
+                'current_streak': current_streak,
+                'longest_streak': longest_streak
+            }
+        
+        # Calculate statistics
+        total_classes = sum(course['total'] for course in course_wise.values())
+        present_count = sum(course['present'] for course in course_wise.values())
+        absent_count = sum(course['absent'] for course in course_wise.values())
+        late_count = sum(course['late'] for course in course_wise.values())
         
-        # Calculate percentage for each course
-        for course in course_wise.values():
-            course['percentage'] = (course['present'] / course['total'] * 100) \
-                if course['total'] > 0 else 0
+        attendance_percentage = (present_count / total_classes * 100) if total_classes > 0 else 0
         
         result = {
             'overall_statistics': {
@@ -199,18 +267,84 @@ def get_student_attendance_report(student_id):
         logger.error(f"Error generating attendance report: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@attendance_bp.route('/at-risk', methods=['GET'])
+@jwt_required()
+@role_required(['teacher', 'admin'])
+def get_at_risk_students():
+    """
+    List students in a course whose recent attendance is below the risk threshold
+    
+    Reads only the precomputed attendance stats. The recent window covers
+    the last RISK_WINDOW_DAYS days up to each student's last marked day.
+    
+    Returns:
+        JSON response with at-risk students, lowest recent attendance first
+    """
+    try:
+        course_id = request.args.get('course_id', type=int)
+        if course_id is None:
+            return jsonify({'error': 'course_id is required'}), 400
+        threshold = request.args.get('threshold', RISK_THRESHOLD, type=float)
+        
+        query = db.session.query(AttendanceStats, Enrollment.student_id, User.name.label('student_name'))\
+            .join(Enrollment, AttendanceStats.enrollment_id == Enrollment.id)\
+            .join(Student, Enrollment.student_id == Student.id)\
+            .join(User, Student.user_id == User.id)\
+            .filter(
+                AttendanceStats.course_id == course_id,
+                AttendanceStats.window_total >= RISK_MIN_CLASSES,
+                AttendanceStats.window_percentage < threshold
+            )
+        
+        students = [
+            {'student_id': student_id, 'student_name': student_name, **stats.to_dict()}
+            for stats, student_id, student_name in query.order_by(AttendanceStats.window_percentage)
+        ]
+        
+        return jsonify({
+            'course_id': course_id,
+            'threshold': threshold,
+            'window_days': RISK_WINDOW_DAYS,
+            'students': students
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error listing at-risk students: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @attendance_bp.route('/analytics/course/<int:course_id>', methods=['GET'])
 @jwt_required()
 @role_required(['teacher', 'admin'])
 def get_course_attendance_analytics(course_id):
     """Get attendance analytics for a course"""
     try:
-        # Get enrollments for the course
-        enrollments = Enrollment.query.filter_by(course_id=course_id).all()
+        # Enrollments with student names in one query
+        enrollments = db.session.query(
+            Enrollment.id, Enrollment.student_id, User.name.label('student_name')
+        ).join(Student, Enrollment.student_id == Student.id)\
+        .join(User, Student.user_id == User.id)\
+        .filter(Enrollment.course_id == course_id)\
+        .all()
+        
+        # Status counts per enrollment from the monthly rollups
+        enrollment_counts = enrollment_status_counts(Enrollment.course_id == course_id)
+        
+        student_rows = []
+        for enrollment in enrollments:
+            counts = enrollment_counts.get(enrollment.id, {})
+            present, absent, late = (counts.get(status, 0) for status in STATUSES)
+            student_rows.append({
+                'student_id': enrollment.student_id,
+                'student_name': enrollment.student_name,
+                'total': present + absent + late,
+                'present': present,
+                'absent': absent,
+                'late': late
+            })
         
         analytics = {
             'overall_statistics': {
-                'total_students': len(enrollments),
+                'total_students': len(student_rows),
                 'average_attendance': 0,
                 'attendance_distribution': {
                     'above_90': 0,
@@ -225,12 +359,9 @@ def get_course_attendance_analytics(course_id):
         
         total_attendance_percentage = 0
         
-        for enrollment in enrollments:
+        for row in student_rows:
             # Calculate student's attendance
-            records = AttendanceRecord.query.filter_by(enrollment_id=enrollment.id).all()
-            total = len(records)
-            present = sum(1 for r in records if r.status == 'present')
-            percentage = (present / total * 100) if total > 0 else 0
+            percentage = (row['present'] / row['total'] * 100) if row['total'] > 0 else 0
             
             # Update distribution counts
             if percentage >= 90:
@@ -246,39 +377,34 @@ def get_course_attendance_analytics(course_id):
             
             # Add to student-wise statistics
             analytics['student_wise_statistics'].append({
-                'student_id': enrollment.student_id,
-                'student_name': enrollment.student.user.name,
+                'student_id': row['student_id'],
+                'student_name': row['student_name'],
                 'attendance_percentage': round(percentage, 2),
-                'total_classes': total,
-                'present': present,
-                'absent': sum(1 for r in records if r.status == 'absent'),
-                'late': sum(1 for r in records if r.status == 'late')
+                'total_classes': row['total'],
+                'present': row['present'],
+                'absent': row['absent'],
+                'late': row['late']
             })
         
         # Calculate average attendance
-        if enrollments:
+        if student_rows:
             analytics['overall_statistics']['average_attendance'] = \
-                round(total_attendance_percentage / len(enrollments), 2)
+                round(total_attendance_percentage / len(student_rows), 2)
         
         # Get daily attendance statistics for the last 30 days
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=30)
         
-        daily_records = db.session.query(
-            AttendanceRecord.date,
-            func.count().label('total'),
-            func.sum(case([(AttendanceRecord.status == 'present', 1)], else_=0)).label('present')
-        ).join(Enrollment)\
-        .filter(
-            Enrollment.course_id == course_id,
-            AttendanceRecord.date.between(start_date, end_date)
-        ).group_by(AttendanceRecord.date).all()
-        
-        for record in daily_records:
-            analytics['daily_statistics'][record.date.isoformat()] = {
-                'total': record.total,
-                'present': record.present,
-                'percentage': round((record.present / record.total * 100), 2)
+        daily_counts = course_daily_counts(course_id, start_date, end_date)
+        
+        for day, counts in daily_counts.items():
+            total = sum(counts[status] for status in STATUSES)
+            if total == 0:
+                continue
+            analytics['daily_statistics'][day.isoformat()] = {
+                'total': total,
+                'present': counts['present'],
+                'percentage': round((counts['present'] / total * 100), 2)
             }
         
         return jsonify(analytics), 200
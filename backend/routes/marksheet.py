@@ -1,11 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
+import hashlib
 import os
-from datetime import datetime
-from utils.ocr import process_marksheet
+import tempfile
 from utils.auth import role_required
-from models.tracking import Marksheet, SubjectMark
+from utils.jobs import ocr_job_queue
+from models.tracking import Marksheet, OCRJob
 from models.profiles import Student
 from app import db
 import logging
@@ -18,11 +19,40 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
+def save_upload(file):
+    """
+    Store an uploaded file under the SHA-256 of its contents
+    
+    Identical uploads resolve to the same path, so the file is only kept once
+    and the OCR result cache can recognise it.
+    """
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    extension = secure_filename(file.filename).rsplit('.', 1)[1].lower()
+    
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            for chunk in iter(lambda: file.stream.read(1024 * 1024), b''):
+                digest.update(chunk)
+                handle.write(chunk)
+        
+        filepath = os.path.join(upload_folder, f"{digest.hexdigest()}.{extension}")
+        if os.path.exists(filepath):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, filepath)
+        return filepath
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 @marksheet_bp.route('/upload', methods=['POST'])
 @jwt_required()
 @role_required(['teacher', 'admin'])
 def upload_marksheet():
-    """Upload and process marksheet"""
+    """Upload a marksheet and queue it for OCR processing"""
     try:
         # Check if file was uploaded
         if 'file' not in request.files:
@@ -42,56 +72,51 @@ def upload_marksheet():
         if not student_id or not term_id:
             return jsonify({'error': 'Student ID and Term ID are required'}), 400
         
-        # Save file
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Process marksheet using OCR
-        try:
-            result = process_marksheet(filepath)
-        except Exception as e:
-            logger.error(f"OCR processing error: {str(e)}")
-            return jsonify({'error': 'Error processing marksheet'}), 500
-        
-        # Create marksheet record
         student = Student.query.get(student_id)
         if not student:
             return jsonify({'error': 'Student not found'}), 404
         
-        marksheet = Marksheet(
+        # Save file under its content hash so re-uploaded scans share one copy
+        filepath = save_upload(file)
+        
+        # Queue OCR processing so the request does not wait on tesseract
+        job = OCRJob(
             student_id=student_id,
             term_id=term_id,
-            total_marks=result['total_marks']['obtained'],
-            percentage=result['total_marks']['percentage'],
-            scanned_copy_path=filepath,
-            verified=False,
-            verified_by_id=None
+            file_path=filepath,
+            status='queued',
+            submitted_by_id=get_jwt_identity()
         )
-        
-        db.session.add(marksheet)
-        
-        # Add subject marks
-        for mark_data in result['marks_data']:
-            subject_mark = SubjectMark(
-                marksheet=marksheet,
-                marks_obtained=mark_data['marks_obtained'],
-                max_marks=mark_data['max_marks']
-            )
-            db.session.add(subject_mark)
-        
+        db.session.add(job)
         db.session.commit()
         
+        ocr_job_queue.submit(job.id)
+        
         return jsonify({
-            'message': 'Marksheet processed successfully',
-            'marksheet_id': marksheet.id,
-            'results': result
-        }), 201
+            'message': 'Marksheet queued for processing',
+            'job_id': job.id,
+            'status': job.status
+        }), 202
         
     except Exception as e:
         logger.error(f"Error in marksheet upload: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
+@marksheet_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+@role_required(['teacher', 'admin'])
+def get_marksheet_job(job_id):
+    """Get the status of a marksheet OCR job"""
+    try:
+        job = OCRJob.query.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job.to_dict()), 200
+        
+    except Exception as e:
+        logger.error(f"Error fetching marksheet job: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @marksheet_bp.route('/<int:marksheet_id>/verify', methods=['POST'])
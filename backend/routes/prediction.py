@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from utils.predict import predict_performance
+from utils.predict import get_predictor, predict_performance_batch
+from utils.prediction_cache import prediction_cache
 from utils.auth import role_required, student_access_required
+from utils.feature_store import STORED_FEATURES, load_features
 from models.tracking import PerformancePrediction
 from models.profiles import Student
 from models.academic import Enrollment
@@ -12,6 +14,13 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 prediction_bp = Blueprint('prediction', __name__)
 
+# Prediction inputs supplied by the caller rather than derived from stored records
+MANUAL_FEATURE_FIELDS = [
+    'class_participation_score', 'study_hours_per_week',
+    'self_study_score', 'group_study_score', 'extra_curricular_participation',
+    'project_scores'
+]
+
 @prediction_bp.route('/predict', methods=['POST'])
 @jwt_required()
 @student_access_required
@@ -38,23 +47,20 @@ def predict_student_performance():
         if not enrollment:
             return jsonify({'error': 'Student not enrolled in this course'}), 404
         
-        # Prepare student data for prediction
-        student_data = {
-            'previous_grade': data.get('previous_grade', 0),
-            'attendance_percentage': enrollment.attendance_records.filter_by(status='present').count() / 
-                                   enrollment.attendance_records.count() * 100 if enrollment.attendance_records.count() > 0 else 0,
-            'assignment_completion_rate': _calculate_assignment_completion_rate(enrollment),
-            'class_participation_score': data.get('class_participation_score', 0),
-            'study_hours_per_week': data.get('study_hours_per_week', 0),
-            'self_study_score': data.get('self_study_score', 0),
-            'group_study_score': data.get('group_study_score', 0),
-            'submission_timeliness': _calculate_submission_timeliness(enrollment),
-            'extra_curricular_participation': data.get('extra_curricular_participation', 0),
-            'project_scores': data.get('project_scores', 0)
-        }
+        # Prepare student data for prediction from the feature store
+        features = load_features([enrollment.id]).get(enrollment.id, {})
+        student_data = _build_student_data(data, features)
+        
+        # Unchanged inputs under the same model return the stored prediction
+        predictor = get_predictor()
+        cache_key = prediction_cache.key(data['student_id'], data['course_id'], student_data)
+        cached = prediction_cache.get(predictor.model_version, cache_key)
+        if cached is not None:
+            db.session.commit()
+            return jsonify(cached), 200
         
         # Get prediction
-        prediction_result = predict_performance(student_data)
+        prediction_result = predictor.predict(student_data)
         
         # Store prediction
         prediction = PerformancePrediction(
@@ -68,15 +74,81 @@ def predict_student_performance():
         db.session.add(prediction)
         db.session.commit()
         
-        return jsonify({
+        response = {
             'prediction_id': prediction.id,
             'results': prediction_result
-        }), 200
+        }
+        prediction_cache.put(predictor.model_version, cache_key, response)
+        
+        return jsonify(response), 200
         
     except Exception as e:
         logger.error(f"Error in performance prediction: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@prediction_bp.route('/course/<int:course_id>/predict-all', methods=['POST'])
+@jwt_required()
+@role_required(['teacher', 'admin'])
+def predict_course_performance(course_id):
+    """Predict performance for every student enrolled in a course"""
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        # Optional per-student manual inputs keyed by student ID
+        student_inputs = data.get('students', {})
+        
+        query = Enrollment.query.filter_by(course_id=course_id)
+        if data.get('term_id'):
+            query = query.filter_by(term_id=data['term_id'])
+        enrollments = query.all()
+        
+        if not enrollments:
+            return jsonify({'error': 'No enrollments found for this course'}), 404
+        
+        # Stored features for the whole cohort in one lookup
+        features = load_features(e.id for e in enrollments)
+        
+        # Build one feature row per enrollment
+        student_data_list = []
+        for enrollment in enrollments:
+            inputs = dict(data, **student_inputs.get(str(enrollment.student_id), {}))
+            student_data_list.append(_build_student_data(inputs, features.get(enrollment.id, {})))
+        
+        # Score the whole cohort in a single model call
+        prediction_results = predict_performance_batch(student_data_list)
+        
+        # Store all predictions in one flush
+        predictions = [
+            PerformancePrediction(
+                student_id=enrollment.student_id,
+                course_id=course_id,
+                predicted_grade=result['predicted_grade'],
+                confidence_score=result['confidence_score'],
+                factors=result['importance_factors']
+            )
+            for enrollment, result in zip(enrollments, prediction_results)
+        ]
+        db.session.add_all(predictions)
+        db.session.commit()
+        
+        return jsonify({
+            'course_id': course_id,
+            'total_predictions': len(predictions),
+            'results': [
+                {
+                    'student_id': prediction.student_id,
+                    'prediction_id': prediction.id,
+                    'results': result
+                }
+                for prediction, result in zip(predictions, prediction_results)
+            ]
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error in course performance prediction: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
 @prediction_bp.route('/student/<int:student_id>/history', methods=['GET'])
 @jwt_required()
 @student_access_required
@@ -160,29 +232,11 @@ def get_course_analytics(course_id):
         logger.error(f"Error fetching course analytics: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
-def _calculate_assignment_completion_rate(enrollment):
-    """Calculate assignment completion rate for an enrollment"""
-    assignments = enrollment.course.assignments
-    if not assignments:
-        return 0
-    
-    completed = sum(1 for a in assignments if any(
-        s.student_id == enrollment.student_id for s in a.submissions
-    ))
-    
-    return (completed / len(assignments)) * 100
-
-def _calculate_submission_timeliness(enrollment):
-    """Calculate submission timeliness score"""
-    submissions = []
-    for assignment in enrollment.course.assignments:
-        submission = next((s for s in assignment.submissions 
-                         if s.student_id == enrollment.student_id), None)
-        if submission:
-            submissions.append(submission)
-    
-    if not submissions:
-        return 0
-    
-    on_time = sum(1 for s in submissions if s.submission_date <= s.assignment.due_date)
-    return (on_time / len(submissions)) * 100
\ No newline at end of file
+def _build_student_data(inputs, features):
+    """Assemble the prediction inputs for an enrollment from caller inputs and stored features"""
+    student_data = {field: inputs.get(field, 0) for field in MANUAL_FEATURE_FIELDS}
+    student_data.update({name: features.get(name) or 0 for name in STORED_FEATURES})
+    # A caller-supplied previous grade overrides the one from verified marksheets
+    if inputs.get('previous_grade') is not None:
+        student_data['previous_grade'] = inputs['previous_grade']
+    return student_data
@@ -0,0 +1,46 @@
+from typing import Dict
+from sqlalchemy import and_, case, distinct, func
+
+def assignment_features(enrollment_filter) -> Dict[int, Dict[str, float]]:
+    """
+    Get assignment completion and submission timeliness per enrollment
+    
+    Both features come from one grouped query joining each enrollment's
+    course assignments to the student's own submissions, instead of
+    loading every submission of every assignment. An assignment counts as
+    on time if any of the student's submissions for it was made by the
+    due date.
+    
+    Args:
+        enrollment_filter: SQL criterion on Enrollment selecting the enrollments
+    
+    Returns:
+        Dict[int, Dict[str, float]]: 'assignment_completion_rate' and
+        'submission_timeliness' percentages keyed by enrollment ID; enrollments
+        whose course has no assignments are left out
+    """
+    from app import db
+    from models.academic import Enrollment
+    from models.scheduling import Assignment, AssignmentSubmission
+    
+    rows = db.session.query(
+        Enrollment.id,
+        func.count(distinct(Assignment.id)),
+        func.count(distinct(AssignmentSubmission.assignment_id)),
+        func.count(distinct(case(
+            (AssignmentSubmission.submission_date <= Assignment.due_date, AssignmentSubmission.assignment_id)
+        )))
+    ).join(Assignment, Assignment.course_id == Enrollment.course_id)\
+    .outerjoin(AssignmentSubmission, and_(
+        AssignmentSubmission.assignment_id == Assignment.id,
+        AssignmentSubmission.student_id == Enrollment.student_id
+    )).filter(enrollment_filter)\
+    .group_by(Enrollment.id).all()
+    
+    return {
+        enrollment_id: {
+            'assignment_completion_rate': (submitted / total) * 100,
+            'submission_timeliness': (on_time / submitted) * 100 if submitted else 0
+        }
+        for enrollment_id, total, submitted, on_time in rows
+    }
@@ -0,0 +1,254 @@
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import os
+import sqlite3
+import logging
+
+from utils.attendance_rollup import STATUSES
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement; enrollment IDs are sent in batches
+ARCHIVE_QUERY_BATCH = 500
+
+ARCHIVE_SCHEMA = """
+    CREATE TABLE attendance_records (
+        enrollment_id INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        remarks TEXT,
+        marked_by_id INTEGER,
+        created_at TEXT,
+        updated_at TEXT,
+        PRIMARY KEY (enrollment_id, day)
+    ) WITHOUT ROWID
+"""
+
+def archive_path(folder: str, term_id: int) -> str:
+    """Get the archive file path for a term"""
+    return os.path.join(folder, f'attendance_term_{term_id}.sqlite')
+
+def archive_term(term_id: int, folder: str, chunk_size: int = 10000, force: bool = False):
+    """
+    Move a closed term's attendance records into a per-term SQLite file
+    
+    Records are streamed into a compact table keyed by (enrollment_id, day)
+    with dates stored as day ordinals, then deleted from the hot table in
+    the same transaction that registers the archive. Rollups, bitmaps and
+    stats are kept, so reports that read them never open the archive.
+    
+    Args:
+        term_id (int): Term to archive
+        folder (str): Directory holding archive files
+        chunk_size (int): Records copied per batch
+        force (bool): Archive even if the term has not ended yet
+    
+    Returns:
+        ArchivedTerm: The registered archive
+    
+    Raises:
+        ValueError: If the term does not exist, is still open or is already archived
+    """
+    from app import db
+    from models.academic import Enrollment, Term
+    from models.tracking import AttendanceRecord, ArchivedTerm
+    
+    term = db.session.get(Term, term_id)
+    if term is None:
+        raise ValueError(f"Term {term_id} not found")
+    if ArchivedTerm.query.filter_by(term_id=term_id).first():
+        raise ValueError(f"Term {term_id} is already archived")
+    if not force and term.end_date >= date.today():
+        raise ValueError(f"Term {term_id} has not ended yet")
+    
+    os.makedirs(folder, exist_ok=True)
+    path = archive_path(folder, term_id)
+    temp_path = f'{path}.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    
+    term_enrollments = db.select(Enrollment.id).where(Enrollment.term_id == term_id)
+    
+    published = False
+    try:
+        rows = db.session.query(
+            AttendanceRecord.enrollment_id, AttendanceRecord.date, AttendanceRecord.status,
+            AttendanceRecord.remarks, AttendanceRecord.marked_by_id,
+            AttendanceRecord.created_at, AttendanceRecord.updated_at
+        ).filter(AttendanceRecord.enrollment_id.in_(term_enrollments))\
+        .execution_options(yield_per=chunk_size)
+        
+        archived = 0
+        conn = sqlite3.connect(temp_path)
+        try:
+            conn.execute(ARCHIVE_SCHEMA)
+            batch = []
+            for enrollment_id, day, status, remarks, marked_by_id, created_at, updated_at in rows:
+                batch.append((
+                    enrollment_id, day.toordinal(), status, remarks, marked_by_id,
+                    created_at.isoformat() if created_at else None,
+                    updated_at.isoformat() if updated_at else None
+                ))
+                if len(batch) >= chunk_size:
+                    conn.executemany("INSERT INTO attendance_records VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                    archived += len(batch)
+                    batch = []
+            if batch:
+                conn.executemany("INSERT INTO attendance_records VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                archived += len(batch)
+            conn.commit()
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        
+        deleted = AttendanceRecord.query.filter(AttendanceRecord.enrollment_id.in_(term_enrollments))\
+            .delete(synchronize_session=False)
+        if deleted != archived:
+            raise RuntimeError(f"Archived {archived} records but {deleted} matched for deletion")
+        
+        # Published before the commit so a committed ArchivedTerm always has its
+        # file; if the commit fails the file is removed below, and a file left
+        # by a crash in between has no ArchivedTerm and is overwritten on retry
+        os.replace(temp_path, path)
+        published = True
+        archive = ArchivedTerm(term_id=term_id, path=path, record_count=archived)
+        db.session.add(archive)
+        db.session.commit()
+        
+        logger.info(f"Archived {archived} attendance records of term {term_id} to {path}")
+        return archive
+    except Exception as e:
+        logger.error(f"Error archiving attendance for term {term_id}: {str(e)}")
+        db.session.rollback()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        if published and os.path.exists(path):
+            os.remove(path)
+        raise
+
+def archived_enrollments(enrollment_ids: Iterable[int]) -> Set[int]:
+    """Get the enrollments among a set whose term has been archived"""
+    from app import db
+    from models.academic import Enrollment
+    from models.tracking import ArchivedTerm
+    
+    rows = db.session.query(Enrollment.id)\
+        .join(ArchivedTerm, ArchivedTerm.term_id == Enrollment.term_id)\
+        .filter(Enrollment.id.in_(set(enrollment_ids))).all()
+    return {enrollment_id for enrollment_id, in rows}
+
+def iter_archived_records(chunk_size: int = 10000) -> Iterator[Tuple[int, int, date, date, str]]:
+    """
+    Stream every archived attendance record for rebuilding derived data
+    
+    Archive files are read one at a time in chunks, so memory is bounded
+    by the chunk size. A registered archive whose file is missing raises
+    instead of being skipped, so a rebuild never silently drops a term.
+    
+    Args:
+        chunk_size (int): Records fetched per batch
+    
+    Yields:
+        Tuple[int, int, date, date, str]: Enrollment ID, course ID, term start, date and status
+    """
+    from app import db
+    from models.academic import Enrollment, Term
+    from models.tracking import ArchivedTerm
+    
+    rows = db.session.query(ArchivedTerm.path, Enrollment.id, Enrollment.course_id, Term.start_date)\
+        .join(Enrollment, Enrollment.term_id == ArchivedTerm.term_id)\
+        .join(Term, Term.id == ArchivedTerm.term_id).all()
+    enrollments_by_path = defaultdict(dict)
+    for path, enrollment_id, course_id, term_start in rows:
+        enrollments_by_path[path][enrollment_id] = (course_id, term_start)
+    
+    for path, enrollments in enrollments_by_path.items():
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            cursor = conn.execute("SELECT enrollment_id, day, status FROM attendance_records")
+            while True:
+                batch = cursor.fetchmany(chunk_size)
+                if not batch:
+                    break
+                for enrollment_id, day, status in batch:
+                    if enrollment_id in enrollments:
+                        course_id, term_start = enrollments[enrollment_id]
+                        yield enrollment_id, course_id, term_start, date.fromordinal(day), status
+        finally:
+            conn.close()
+
+def archived_status_counts(enrollment_filter, start_date: Optional[date] = None,
+                           end_date: Optional[date] = None) -> Dict[int, Counter]:
+    """
+    Get status counts per enrollment from archived terms for a date range
+    
+    Only archives of terms overlapping the range are opened.
+    
+    Args:
+        enrollment_filter: SQL criterion on Enrollment selecting the enrollments
+        start_date (Optional[date]): Inclusive start of the range
+        end_date (Optional[date]): Inclusive end of the range
+    
+    Returns:
+        Dict[int, Counter]: Status counts keyed by enrollment ID
+    """
+    from app import db
+    from models.academic import Enrollment, Term
+    from models.tracking import ArchivedTerm
+    
+    query = db.session.query(Enrollment.id, ArchivedTerm.path)\
+        .join(ArchivedTerm, ArchivedTerm.term_id == Enrollment.term_id)\
+        .join(Term, Enrollment.term_id == Term.id)\
+        .filter(enrollment_filter)
+    if start_date is not None:
+        query = query.filter(Term.end_date >= start_date)
+    if end_date is not None:
+        query = query.filter(Term.start_date <= end_date)
+    
+    by_path = defaultdict(list)
+    for enrollment_id, path in query:
+        by_path[path].append(enrollment_id)
+    
+    return read_archived_counts(by_path, start_date, end_date)
+
+def read_archived_counts(enrollments_by_path: Dict[str, List[int]], start_date: Optional[date] = None,
+                         end_date: Optional[date] = None) -> Dict[int, Counter]:
+    """
+    Get status counts per enrollment straight from archive files
+    
+    Args:
+        enrollments_by_path (Dict[str, List[int]]): Enrollment IDs keyed by archive file
+        start_date (Optional[date]): Inclusive start of the range
+        end_date (Optional[date]): Inclusive end of the range
+    
+    Returns:
+        Dict[int, Counter]: Status counts keyed by enrollment ID
+    """
+    conditions, params = [], []
+    if start_date is not None:
+        conditions.append("day >= ?")
+        params.append(start_date.toordinal())
+    if end_date is not None:
+        conditions.append("day <= ?")
+        params.append(end_date.toordinal())
+    
+    counts = defaultdict(Counter)
+    for path, enrollment_ids in enrollments_by_path.items():
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            for i in range(0, len(enrollment_ids), ARCHIVE_QUERY_BATCH):
+                batch = list(enrollment_ids[i:i + ARCHIVE_QUERY_BATCH])
+                where = ' AND '.join([f"enrollment_id IN ({', '.join('?' * len(batch))})"] + conditions)
+                rows = conn.execute(
+                    f"SELECT enrollment_id, status, COUNT(*) FROM attendance_records "
+                    f"WHERE {where} GROUP BY enrollment_id, status",
+                    batch + params
+                )
+                for enrollment_id, status, count in rows:
+                    if status in STATUSES:
+                        counts[enrollment_id][status] += count
+        finally:
+            conn.close()
+    
+    return counts
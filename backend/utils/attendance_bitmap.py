@@ -0,0 +1,252 @@
+from collections import Counter
+from datetime import date, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from utils.attendance_rollup import STATUSES, AttendanceChange
+
+logger = logging.getLogger(__name__)
+
+def _to_int(data: Optional[bytes]) -> int:
+    """Decode a stored bitset"""
+    return int.from_bytes(data or b'', 'little')
+
+def _to_bytes(bits: int) -> bytes:
+    """Encode a bitset for storage"""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+class StatusBitmap:
+    """
+    Day-status vector of one enrollment held as one integer bitset per status
+    
+    Bit i of a status set means that status was marked on base_date + i days.
+    Counts, ranges and streaks are answered with masks and popcounts instead
+    of reading attendance records.
+    """
+    
+    def __init__(self, base_date: date, bits: Optional[Dict[str, int]] = None):
+        self.base_date = base_date
+        self.bits = {status: 0 for status in STATUSES}
+        if bits:
+            self.bits.update(bits)
+    
+    @classmethod
+    def from_model(cls, bitmap) -> 'StatusBitmap':
+        """Decode an AttendanceBitmap row or a row of its columns"""
+        return cls(bitmap.base_date, {status: _to_int(getattr(bitmap, status)) for status in STATUSES})
+    
+    def to_columns(self) -> Dict:
+        """Encode as AttendanceBitmap column values"""
+        return {'base_date': self.base_date, **{status: _to_bytes(bits) for status, bits in self.bits.items()}}
+    
+    def set(self, day: date, status: Optional[str]) -> None:
+        """
+        Record the status for a day, clearing any previous status
+        
+        Args:
+            day (date): Attendance date
+            status (Optional[str]): New status, or None to clear the day
+        """
+        offset = (day - self.base_date).days
+        if offset < 0:
+            # Earlier than any day held so far, move the base back
+            self.bits = {s: bits << -offset for s, bits in self.bits.items()}
+            self.base_date = day
+            offset = 0
+        
+        bit = 1 << offset
+        for s in self.bits:
+            self.bits[s] &= ~bit
+        if status in self.bits:
+            self.bits[status] |= bit
+    
+    def last_marked_date(self) -> Optional[date]:
+        """Latest day with any status marked"""
+        length = max(bits.bit_length() for bits in self.bits.values())
+        return self.base_date + timedelta(days=length - 1) if length else None
+    
+    def merge(self, other: 'StatusBitmap') -> 'StatusBitmap':
+        """Combine with another bitmap, e.g. several terms of the same course"""
+        base_date = min(self.base_date, other.base_date)
+        shift_self = (self.base_date - base_date).days
+        shift_other = (other.base_date - base_date).days
+        return StatusBitmap(base_date, {
+            status: (self.bits[status] << shift_self) | (other.bits[status] << shift_other)
+            for status in STATUSES
+        })
+    
+    def _mask(self, start_date: Optional[date], end_date: Optional[date]) -> Optional[int]:
+        """Bit mask for an inclusive date range, or None when unbounded"""
+        if start_date is None and end_date is None:
+            return None
+        
+        low = max((start_date - self.base_date).days, 0) if start_date else 0
+        if end_date is None:
+            high = max(bits.bit_length() for bits in self.bits.values())
+        else:
+            high = (end_date - self.base_date).days + 1
+        if high <= low:
+            return 0
+        return ((1 << (high - low)) - 1) << low
+    
+    def _range_bits(self, start_date: Optional[date], end_date: Optional[date]) -> Dict[str, int]:
+        """Status bitsets restricted to an inclusive date range"""
+        mask = self._mask(start_date, end_date)
+        if mask is None:
+            return dict(self.bits)
+        return {status: bits & mask for status, bits in self.bits.items()}
+    
+    def counts(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Counter:
+        """Status counts within an inclusive date range"""
+        return Counter({status: bits.bit_count() for status, bits in self._range_bits(start_date, end_date).items()})
+    
+    def streaks(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Tuple[int, int]:
+        """
+        Attendance streaks within an inclusive date range
+        
+        A streak is a run of marked days attended (present or late) with no
+        absence in between; days without a mark do not break it.
+        
+        Returns:
+            Tuple[int, int]: (current streak up to the last marked day, longest streak)
+        """
+        bits = self._range_bits(start_date, end_date)
+        attended = bits['present'] | bits['late']
+        absent = bits['absent']
+        
+        # Days attended after the last absence
+        current = (attended >> absent.bit_length()).bit_count()
+        
+        longest, previous = current, 0
+        remaining = absent
+        while remaining:
+            lowest = remaining & -remaining
+            run = attended & (lowest - 1) & ~(previous - 1 if previous else 0)
+            longest = max(longest, run.bit_count())
+            previous = lowest << 1
+            remaining ^= lowest
+        
+        return current, longest
+
+def _term_starts(enrollment_ids: Iterable[int]) -> Dict[int, date]:
+    """Map enrollment IDs to their term start dates in one query"""
+    from app import db
+    from models.academic import Enrollment, Term
+    
+    rows = db.session.query(Enrollment.id, Term.start_date)\
+        .join(Term, Enrollment.term_id == Term.id)\
+        .filter(Enrollment.id.in_(set(enrollment_ids))).all()
+    return dict(rows)
+
+def apply_bitmap_changes(changes: List[AttendanceChange]) -> Dict[int, StatusBitmap]:
+    """
+    Apply a set of attendance writes to the enrollment bitmaps
+    
+    Bitmap rows are locked for update where the database supports it,
+    updated in Python and written back with one bulk update and one bulk
+    insert in the current session. The caller commits.
+    
+    Args:
+        changes (List[AttendanceChange]): Attendance writes to apply
+        
+    Returns:
+        Dict[int, StatusBitmap]: Updated bitmaps keyed by enrollment ID
+    """
+    from app import db
+    from models.tracking import AttendanceBitmap
+    
+    changes = [change for change in changes if change.old_status != change.new_status]
+    if not changes:
+        return {}
+    
+    enrollment_ids = {change.enrollment_id for change in changes}
+    rows = db.session.query(
+        AttendanceBitmap.id, AttendanceBitmap.enrollment_id, AttendanceBitmap.base_date,
+        *(getattr(AttendanceBitmap, status) for status in STATUSES)
+    ).filter(AttendanceBitmap.enrollment_id.in_(enrollment_ids)).with_for_update().all()
+    existing = {row.enrollment_id: row.id for row in rows}
+    bitmaps = {row.enrollment_id: StatusBitmap.from_model(row) for row in rows}
+    
+    missing = enrollment_ids - set(bitmaps)
+    if missing:
+        term_starts = _term_starts(missing)
+        for enrollment_id in missing:
+            day = min(change.date for change in changes if change.enrollment_id == enrollment_id)
+            bitmaps[enrollment_id] = StatusBitmap(min(term_starts.get(enrollment_id, day), day))
+    
+    for change in changes:
+        bitmaps[change.enrollment_id].set(change.date, change.new_status)
+    
+    updates = [
+        {'id': existing[enrollment_id], **bitmap.to_columns()}
+        for enrollment_id, bitmap in bitmaps.items() if enrollment_id in existing
+    ]
+    inserts = [
+        {'enrollment_id': enrollment_id, **bitmap.to_columns()}
+        for enrollment_id, bitmap in bitmaps.items() if enrollment_id not in existing
+    ]
+    
+    if updates:
+        db.session.bulk_update_mappings(AttendanceBitmap, updates)
+    if inserts:
+        db.session.bulk_insert_mappings(AttendanceBitmap, inserts)
+    return bitmaps
+
+def load_bitmaps(enrollment_ids: Iterable[int]) -> Dict[int, StatusBitmap]:
+    """Load the bitmaps of a set of enrollments in one query"""
+    from models.tracking import AttendanceBitmap
+    
+    rows = AttendanceBitmap.query.filter(AttendanceBitmap.enrollment_id.in_(set(enrollment_ids))).all()
+    return {row.enrollment_id: StatusBitmap.from_model(row) for row in rows}
+
+def rebuild_bitmaps(chunk_size: int = 10000) -> int:
+    """
+    Recompute every enrollment bitmap from the attendance records
+    
+    Records are streamed in chunks; memory is bounded by one bitset per
+    enrollment and status. Records of archived terms are read back from
+    their archive files.
+    
+    Returns:
+        int: Number of bitmap rows written
+    """
+    from app import db
+    from models.academic import Enrollment, Term
+    from models.tracking import AttendanceRecord, AttendanceBitmap
+    from utils.attendance_archive import iter_archived_records
+    
+    try:
+        bitmaps = {}
+        rows = db.session.query(
+            AttendanceRecord.enrollment_id, Term.start_date,
+            AttendanceRecord.date, AttendanceRecord.status
+        ).join(Enrollment, AttendanceRecord.enrollment_id == Enrollment.id)\
+        .join(Term, Enrollment.term_id == Term.id)\
+        .execution_options(yield_per=chunk_size)
+        archived = (
+            (enrollment_id, term_start, day, status)
+            for enrollment_id, _, term_start, day, status in iter_archived_records(chunk_size)
+        )
+        
+        for enrollment_id, term_start, day, status in chain(rows, archived):
+            if status not in STATUSES:
+                continue
+            bitmap = bitmaps.get(enrollment_id)
+            if bitmap is None:
+                bitmap = bitmaps[enrollment_id] = StatusBitmap(min(term_start, day))
+            bitmap.set(day, status)
+        
+        AttendanceBitmap.query.delete()
+        db.session.bulk_insert_mappings(AttendanceBitmap, [
+            {'enrollment_id': enrollment_id, **bitmap.to_columns()}
+            for enrollment_id, bitmap in bitmaps.items()
+        ])
+        db.session.commit()
+        
+        logger.info(f"Rebuilt {len(bitmaps)} attendance bitmaps")
+        return len(bitmaps)
+    except Exception as e:
+        logger.error(f"Error rebuilding attendance bitmaps: {str(e)}")
+        db.session.rollback()
+        raise
@@ -0,0 +1,207 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, IO, Iterable, Iterator, List, Tuple
+import csv
+import io
+import logging
+import time
+
+from utils.attendance_rollup import STATUSES
+from utils.attendance_store import upsert_attendance
+
+# Optional dependency for Excel imports
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = ('roll_number', 'course_code', 'date', 'status')
+
+# Rejected rows beyond this many are counted but not listed in the report
+MAX_REPORTED_REJECTIONS = 100
+
+def iter_csv_rows(stream: IO) -> Iterator[Dict]:
+    """
+    Stream attendance rows from a CSV file
+    
+    Args:
+        stream (IO): Text or binary file object with a header row
+    
+    Returns:
+        Iterator[Dict]: One dict per data row keyed by lower-cased header
+    """
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    
+    reader = csv.reader(stream)
+    header = [column.strip().lower() for column in next(reader, [])]
+    for values in reader:
+        yield dict(zip(header, values))
+
+def iter_excel_rows(path_or_stream) -> Iterator[Dict]:
+    """
+    Stream attendance rows from the first sheet of an Excel workbook
+    
+    The workbook is opened read-only, so rows are read lazily instead of
+    loading the whole sheet into memory.
+    
+    Args:
+        path_or_stream: Path or binary file object of an .xlsx workbook
+    
+    Returns:
+        Iterator[Dict]: One dict per data row keyed by lower-cased header
+    """
+    if openpyxl is None:
+        raise ValueError("Excel imports require the openpyxl package")
+    
+    workbook = openpyxl.load_workbook(path_or_stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(column or '').strip().lower() for column in next(rows, ())]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+def build_enrollment_lookup() -> Dict[Tuple[str, str], List[Tuple]]:
+    """
+    Map (roll_number, course_code) to the enrollments and term dates behind it
+    
+    Built with one query; a student can be enrolled in the same course in
+    several terms, so each key holds every matching enrollment. Archived
+    terms are left out since their attendance is read-only.
+    
+    Returns:
+        Dict[Tuple[str, str], List[Tuple]]: (enrollment_id, term start, term end) lists
+    """
+    from app import db
+    from models.academic import Enrollment, Course, Term
+    from models.profiles import Student
+    from models.tracking import ArchivedTerm
+    
+    rows = db.session.query(
+        Student.roll_number, Course.code, Enrollment.id, Term.start_date, Term.end_date
+    ).join(Enrollment, Enrollment.student_id == Student.id)\
+    .join(Course, Enrollment.course_id == Course.id)\
+    .join(Term, Enrollment.term_id == Term.id)\
+    .outerjoin(ArchivedTerm, ArchivedTerm.term_id == Term.id)\
+    .filter(Student.roll_number.isnot(None), ArchivedTerm.id.is_(None))
+    
+    lookup = defaultdict(list)
+    for roll_number, course_code, enrollment_id, start, end in rows:
+        lookup[(roll_number.strip().upper(), course_code.strip().upper())].append((enrollment_id, start, end))
+    return dict(lookup)
+
+def _parse_date(value):
+    """Parse an import date cell, accepting date objects from Excel"""
+    if isinstance(value, datetime):
+        return value.date()
+    if hasattr(value, 'isoformat'):
+        return value
+    return datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+
+def _resolve_row(row: Dict, lookup: Dict) -> Dict:
+    """Turn an import row into an attendance write, raising ValueError if rejected"""
+    missing = [column for column in IMPORT_COLUMNS if not str(row.get(column) or '').strip()]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    
+    status = str(row['status']).strip().lower()
+    if status not in STATUSES:
+        raise ValueError(f"Invalid status: {row['status']}")
+    
+    try:
+        day = _parse_date(row['date'])
+    except ValueError:
+        raise ValueError(f"Invalid date: {row['date']}")
+    
+    key = (str(row['roll_number']).strip().upper(), str(row['course_code']).strip().upper())
+    enrollments = lookup.get(key)
+    if not enrollments:
+        raise ValueError(f"No enrollment for roll number {key[0]} in course {key[1]}")
+    
+    for enrollment_id, start, end in enrollments:
+        if start <= day <= end:
+            return {
+                'enrollment_id': enrollment_id,
+                'date': day,
+                'status': status,
+                'remarks': str(row.get('remarks') or '').strip() or None
+            }
+    raise ValueError(f"Date {day} is outside every term of this enrollment")
+
+def import_attendance(rows: Iterable[Dict], marked_by_id=None, chunk_size: int = 1000) -> Dict:
+    """
+    Import attendance rows keyed by roll number and course code
+    
+    Rows are consumed as a stream and written through the bulk upsert in
+    chunks of chunk_size, each committed on its own. Memory is bounded by
+    the enrollment lookup and one chunk, not by the size of the input. A
+    chunk that fails to write is rolled back and its rows are rejected.
+    
+    Args:
+        rows (Iterable[Dict]): Rows with roll_number, course_code, date
+            (YYYY-MM-DD), status and optional remarks
+        marked_by_id: ID of the user running the import
+        chunk_size (int): Rows written per transaction
+    
+    Returns:
+        Dict: Row counts, rows per second and a sample of rejected rows
+    """
+    from app import db
+    
+    started = time.perf_counter()
+    lookup = build_enrollment_lookup()
+    
+    report = {'rows': 0, 'imported': 0, 'rejected': 0, 'rejections': []}
+    
+    def reject(line, reason):
+        report['rejected'] += 1
+        if len(report['rejections']) < MAX_REPORTED_REJECTIONS:
+            report['rejections'].append({'line': line, 'error': reason})
+    
+    def flush(chunk, lines):
+        # The upsert keeps the last row per (enrollment, date); earlier ones
+        # in the chunk are never stored, so they are reported as rejected
+        kept = {}
+        for write, line in zip(chunk, lines):
+            key = (write['enrollment_id'], write['date'])
+            if key in kept:
+                reject(kept[key][1], f"Superseded by line {line} for the same enrollment and date")
+            kept[key] = (write, line)
+        
+        try:
+            changes = upsert_attendance([write for write, _ in kept.values()], marked_by_id)
+            db.session.commit()
+            report['imported'] += len(changes)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error importing attendance rows from line {lines[0]}: {str(e)}")
+            for _, line in kept.values():
+                reject(line, 'Chunk failed to write')
+    
+    chunk, lines = [], []
+    # Line numbers count the header as line 1
+    for line, row in enumerate(rows, start=2):
+        report['rows'] += 1
+        try:
+            write = _resolve_row(row, lookup)
+        except ValueError as e:
+            reject(line, str(e))
+            continue
+        
+        chunk.append(write)
+        lines.append(line)
+        if len(chunk) >= chunk_size:
+            flush(chunk, lines)
+            chunk, lines = [], []
+    
+    if chunk:
+        flush(chunk, lines)
+    
+    elapsed = time.perf_counter() - started
+    report['elapsed_seconds'] = round(elapsed, 3)
+    report['rows_per_second'] = round(report['rows'] / elapsed, 1) if elapsed > 0 else 0.0
+    return report
@@ -0,0 +1,295 @@
+from collections import Counter, defaultdict, namedtuple
+from datetime import date, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, func
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ('present', 'absent', 'late')
+
+# Maintained rollup granularities: per-enrollment monthly counts back student
+# reports and per-student course analytics, per-course daily counts back the
+# course daily statistics.
+ROLLUP_LEVELS = (
+    ('enrollment', 'month'),
+    ('course', 'day')
+)
+
+# A single attendance write; old_status is None for a new record
+AttendanceChange = namedtuple('AttendanceChange', ['enrollment_id', 'date', 'old_status', 'new_status'])
+
+def period_start(day: date, period: str) -> date:
+    """Get the first day of the period containing a date"""
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    raise ValueError(f"Unknown rollup period: {period}")
+
+def next_month(day: date) -> date:
+    """Get the first day of the month after a date"""
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+def _course_ids(enrollment_ids: Iterable[int]) -> Dict[int, int]:
+    """Map enrollment IDs to course IDs in one query"""
+    from app import db
+    from models.academic import Enrollment
+    
+    rows = db.session.query(Enrollment.id, Enrollment.course_id)\
+        .filter(Enrollment.id.in_(set(enrollment_ids))).all()
+    return dict(rows)
+
+def _rollup_deltas(changes: Iterable[AttendanceChange], course_ids: Dict[int, int]) -> Dict[Tuple, Counter]:
+    """Net status count changes per rollup key"""
+    deltas = defaultdict(Counter)
+    for change in changes:
+        if change.old_status == change.new_status:
+            continue
+        
+        scope_ids = {'enrollment': change.enrollment_id, 'course': course_ids.get(change.enrollment_id)}
+        for scope, period in ROLLUP_LEVELS:
+            if scope_ids[scope] is None:
+                continue
+            key = (scope, scope_ids[scope], period, period_start(change.date, period))
+            if change.old_status in STATUSES:
+                deltas[key][change.old_status] -= 1
+            if change.new_status in STATUSES:
+                deltas[key][change.new_status] += 1
+    
+    return {key: delta for key, delta in deltas.items() if any(delta.values())}
+
+def apply_rollup_changes(changes: List[AttendanceChange]) -> None:
+    """
+    Incrementally update attendance rollups for a set of attendance writes
+    
+    Writes run in the current session's transaction and are committed by
+    the caller together with the attendance records themselves. New rollup
+    rows go out as one bulk insert and existing ones as one batched UPDATE
+    that increments counters in SQL, so concurrent writers do not overwrite
+    each other.
+    
+    Args:
+        changes (List[AttendanceChange]): Attendance writes to apply
+    """
+    from app import db
+    from models.tracking import AttendanceRollup
+    
+    if not changes:
+        return
+    
+    deltas = _rollup_deltas(changes, _course_ids(c.enrollment_id for c in changes))
+    if not deltas:
+        return
+    
+    # Load existing rollup rows with one query per rollup level
+    existing = {}
+    for scope, period in ROLLUP_LEVELS:
+        keys = [key for key in deltas if key[0] == scope and key[2] == period]
+        if not keys:
+            continue
+        rows = db.session.query(
+            AttendanceRollup.id, AttendanceRollup.scope_id, AttendanceRollup.period_start
+        ).filter(
+            AttendanceRollup.scope == scope,
+            AttendanceRollup.period == period,
+            AttendanceRollup.scope_id.in_({key[1] for key in keys}),
+            AttendanceRollup.period_start.in_({key[3] for key in keys})
+        ).all()
+        existing.update({(scope, scope_id, period, start): rollup_id for rollup_id, scope_id, start in rows})
+    
+    inserts, updates = [], []
+    for key, delta in deltas.items():
+        counts = {status: delta[status] for status in STATUSES}
+        if key in existing:
+            updates.append({'rollup_id': existing[key], **{f'delta_{s}': n for s, n in counts.items()}})
+        else:
+            scope, scope_id, period, start = key
+            inserts.append({'scope': scope, 'scope_id': scope_id, 'period': period, 'period_start': start, **counts})
+    
+    if inserts:
+        db.session.bulk_insert_mappings(AttendanceRollup, inserts)
+    if updates:
+        # One executemany; counters are incremented in SQL
+        table = AttendanceRollup.__table__
+        db.session.execute(
+            table.update()
+            .where(table.c.id == bindparam('rollup_id'))
+            .values({status: table.c[status] + bindparam(f'delta_{status}') for status in STATUSES}),
+            updates
+        )
+
+def rebuild_rollups(chunk_size: int = 10000) -> int:
+    """
+    Recompute every attendance rollup from the attendance records
+    
+    Records are streamed in chunks so memory is bounded by the number of
+    rollup rows rather than the number of attendance records. Records of
+    archived terms are read back from their archive files.
+    
+    Returns:
+        int: Number of rollup rows written
+    """
+    from app import db
+    from models.academic import Enrollment
+    from models.tracking import AttendanceRecord, AttendanceRollup
+    from utils.attendance_archive import iter_archived_records
+    
+    try:
+        counts = defaultdict(Counter)
+        rows = db.session.query(
+            AttendanceRecord.enrollment_id, Enrollment.course_id,
+            AttendanceRecord.date, AttendanceRecord.status
+        ).join(Enrollment, AttendanceRecord.enrollment_id == Enrollment.id)\
+        .execution_options(yield_per=chunk_size)
+        archived = (
+            (enrollment_id, course_id, day, status)
+            for enrollment_id, course_id, _, day, status in iter_archived_records(chunk_size)
+        )
+        
+        for enrollment_id, course_id, day, status in chain(rows, archived):
+            if status not in STATUSES:
+                continue
+            scope_ids = {'enrollment': enrollment_id, 'course': course_id}
+            for scope, period in ROLLUP_LEVELS:
+                counts[(scope, scope_ids[scope], period, period_start(day, period))][status] += 1
+        
+        AttendanceRollup.query.delete()
+        db.session.bulk_insert_mappings(AttendanceRollup, [
+            {
+                'scope': scope, 'scope_id': scope_id, 'period': period, 'period_start': start,
+                **{status: counter[status] for status in STATUSES}
+            }
+            for (scope, scope_id, period, start), counter in counts.items()
+        ])
+        db.session.commit()
+        
+        logger.info(f"Rebuilt {len(counts)} attendance rollups")
+        return len(counts)
+    except Exception as e:
+        logger.error(f"Error rebuilding attendance rollups: {str(e)}")
+        db.session.rollback()
+        raise
+
+def _month_bounds(start_date: Optional[date], end_date: Optional[date]):
+    """
+    Split a date range into whole months served by rollups and partial edges
+    
+    Returns:
+        Tuple: (start of the first whole month, exclusive end of the last whole month,
+                inclusive (start, end) edge ranges to read from raw records,
+                whether any whole month is covered). Open range ends are None.
+    """
+    # First whole month starting on or after start_date
+    if start_date is None or start_date.day == 1:
+        first = start_date
+    else:
+        first = next_month(start_date)
+    
+    # Day after the last whole month ending on or before end_date
+    if end_date is None:
+        last = None
+    elif next_month(end_date) - timedelta(days=1) == end_date:
+        last = next_month(end_date)
+    else:
+        last = end_date.replace(day=1)
+    
+    if first is not None and last is not None and first >= last:
+        # No whole month inside the range, read it all from raw records
+        return None, None, [(start_date, end_date)], False
+    
+    edges = []
+    if start_date is not None and first != start_date:
+        edges.append((start_date, first - timedelta(days=1)))
+    if end_date is not None and last - timedelta(days=1) != end_date:
+        edges.append((last, end_date))
+    return first, last, edges, True
+
+def enrollment_status_counts(enrollment_filter, start_date: Optional[date] = None,
+                             end_date: Optional[date] = None) -> Dict[int, Counter]:
+    """
+    Get status counts per enrollment for a date range from rollups
+    
+    Whole months are read from the monthly enrollment rollups and only the
+    partial months at either end of the range touch attendance records,
+    including archived ones.
+    
+    Args:
+        enrollment_filter: SQL criterion on Enrollment selecting the enrollments
+        start_date (Optional[date]): Inclusive start of the range
+        end_date (Optional[date]): Inclusive end of the range
+        
+    Returns:
+        Dict[int, Counter]: Status counts keyed by enrollment ID
+    """
+    from app import db
+    from models.academic import Enrollment
+    from models.tracking import AttendanceRecord, AttendanceRollup
+    from utils.attendance_archive import archived_status_counts
+    
+    counts = defaultdict(Counter)
+    first, last, edges, use_rollups = _month_bounds(start_date, end_date)
+    
+    if use_rollups:
+        query = db.session.query(
+            AttendanceRollup.scope_id,
+            func.sum(AttendanceRollup.present),
+            func.sum(AttendanceRollup.absent),
+            func.sum(AttendanceRollup.late)
+        ).join(Enrollment, AttendanceRollup.scope_id == Enrollment.id)\
+        .filter(
+            AttendanceRollup.scope == 'enrollment',
+            AttendanceRollup.period == 'month',
+            enrollment_filter
+        )
+        if first is not None:
+            query = query.filter(AttendanceRollup.period_start >= first)
+        if last is not None:
+            query = query.filter(AttendanceRollup.period_start < last)
+        
+        for enrollment_id, present, absent, late in query.group_by(AttendanceRollup.scope_id):
+            counts[enrollment_id].update(present=present or 0, absent=absent or 0, late=late or 0)
+    
+    for edge_start, edge_end in edges:
+        query = db.session.query(
+            AttendanceRecord.enrollment_id, AttendanceRecord.status, func.count()
+        ).join(Enrollment, AttendanceRecord.enrollment_id == Enrollment.id)\
+        .filter(enrollment_filter)
+        if edge_start is not None:
+            query = query.filter(AttendanceRecord.date >= edge_start)
+        if edge_end is not None:
+            query = query.filter(AttendanceRecord.date <= edge_end)
+        
+        for enrollment_id, status, count in query.group_by(AttendanceRecord.enrollment_id, AttendanceRecord.status):
+            if status in STATUSES:
+                counts[enrollment_id][status] += count
+        
+        # Records of archived terms live in the per-term archive files
+        for enrollment_id, archived in archived_status_counts(enrollment_filter, edge_start, edge_end).items():
+            counts[enrollment_id].update(archived)
+    
+    return counts
+
+def course_daily_counts(course_id: int, start_date: date, end_date: date) -> Dict[date, Counter]:
+    """
+    Get status counts per day for a course from the daily course rollups
+    
+    Returns:
+        Dict[date, Counter]: Status counts keyed by date
+    """
+    from models.tracking import AttendanceRollup
+    
+    rows = AttendanceRollup.query.filter(
+        AttendanceRollup.scope == 'course',
+        AttendanceRollup.scope_id == course_id,
+        AttendanceRollup.period == 'day',
+        AttendanceRollup.period_start.between(start_date, end_date)
+    ).order_by(AttendanceRollup.period_start).all()
+    
+    return {
+        row.period_start: Counter(present=row.present, absent=row.absent, late=row.late)
+        for row in rows
+    }
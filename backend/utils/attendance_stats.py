@@ -0,0 +1,137 @@
+from datetime import timedelta
+from typing import Dict
+import logging
+
+from utils.attendance_bitmap import StatusBitmap
+
+logger = logging.getLogger(__name__)
+
+# An enrollment is at risk when its attendance over the last
+# RISK_WINDOW_DAYS days drops below RISK_THRESHOLD percent. Windows with
+# fewer than RISK_MIN_CLASSES marked days are too short to judge.
+RISK_THRESHOLD = 75.0
+RISK_WINDOW_DAYS = 28
+RISK_MIN_CLASSES = 5
+
+def compute_stats(bitmap: StatusBitmap) -> Dict:
+    """
+    Derive running counters and the sliding-window percentage from a bitmap
+    
+    The window ends at the enrollment's last marked day, so the values
+    only change when attendance is written.
+    
+    Args:
+        bitmap (StatusBitmap): Day-status vector of an enrollment
+    
+    Returns:
+        Dict: AttendanceStats column values
+    """
+    counts = bitmap.counts()
+    total = sum(counts.values())
+    last_marked = bitmap.last_marked_date()
+    
+    window_total, window_present = 0, 0
+    if last_marked is not None:
+        window = bitmap.counts(last_marked - timedelta(days=RISK_WINDOW_DAYS - 1), last_marked)
+        window_total, window_present = sum(window.values()), window['present']
+    window_percentage = window_present / window_total * 100 if window_total else 0.0
+    
+    return {
+        'present': counts['present'],
+        'absent': counts['absent'],
+        'late': counts['late'],
+        'percentage': counts['present'] / total * 100 if total else 0.0,
+        'window_total': window_total,
+        'window_present': window_present,
+        'window_percentage': window_percentage,
+        'current_streak': bitmap.streaks()[0],
+        'last_marked_date': last_marked,
+        'at_risk': window_total >= RISK_MIN_CLASSES and window_percentage < RISK_THRESHOLD
+    }
+
+def apply_stats_changes(bitmaps: Dict[int, StatusBitmap]) -> Dict[int, Dict]:
+    """
+    Refresh attendance stats for enrollments whose bitmaps just changed
+    
+    Reads only the updated bitmaps, never the attendance records. Writes go
+    out as one bulk update and one bulk insert in the current session; the
+    caller commits.
+    
+    Args:
+        bitmaps (Dict[int, StatusBitmap]): Updated bitmaps keyed by enrollment ID
+    
+    Returns:
+        Dict[int, Dict]: The new AttendanceStats column values keyed by enrollment ID
+    """
+    from app import db
+    from models.academic import Enrollment
+    from models.tracking import AttendanceStats
+    
+    if not bitmaps:
+        return {}
+    
+    rows = db.session.query(AttendanceStats.enrollment_id, AttendanceStats.id)\
+        .filter(AttendanceStats.enrollment_id.in_(set(bitmaps))).all()
+    existing = dict(rows)
+    
+    missing = set(bitmaps) - set(existing)
+    course_ids = dict(
+        db.session.query(Enrollment.id, Enrollment.course_id).filter(Enrollment.id.in_(missing))
+    ) if missing else {}
+    
+    stats, updates, inserts = {}, [], []
+    for enrollment_id, bitmap in bitmaps.items():
+        values = stats[enrollment_id] = compute_stats(bitmap)
+        if enrollment_id in existing:
+            updates.append({'id': existing[enrollment_id], **values})
+        elif enrollment_id in course_ids:
+            inserts.append({'enrollment_id': enrollment_id, 'course_id': course_ids[enrollment_id], **values})
+    
+    if updates:
+        db.session.bulk_update_mappings(AttendanceStats, updates)
+    if inserts:
+        db.session.bulk_insert_mappings(AttendanceStats, inserts)
+    return stats
+
+def rebuild_stats(chunk_size: int = 1000) -> int:
+    """
+    Recompute attendance stats for every enrollment from the bitmaps
+    
+    Returns:
+        int: Number of stats rows written
+    """
+    from app import db
+    from models.academic import Enrollment
+    from models.tracking import AttendanceBitmap, AttendanceStats
+    
+    try:
+        AttendanceStats.query.delete()
+        
+        written, batch = 0, []
+        rows = db.session.query(
+            AttendanceBitmap.enrollment_id, Enrollment.course_id, AttendanceBitmap.base_date,
+            AttendanceBitmap.present, AttendanceBitmap.absent, AttendanceBitmap.late
+        ).join(Enrollment, AttendanceBitmap.enrollment_id == Enrollment.id)\
+        .execution_options(yield_per=chunk_size)
+        for row in rows:
+            batch.append({
+                'enrollment_id': row.enrollment_id,
+                'course_id': row.course_id,
+                **compute_stats(StatusBitmap.from_model(row))
+            })
+            if len(batch) >= chunk_size:
+                db.session.bulk_insert_mappings(AttendanceStats, batch)
+                written += len(batch)
+                batch = []
+        
+        if batch:
+            db.session.bulk_insert_mappings(AttendanceStats, batch)
+            written += len(batch)
+        db.session.commit()
+        
+        logger.info(f"Rebuilt {written} attendance stats rows")
+        return written
+    except Exception as e:
+        logger.error(f"Error rebuilding attendance stats: {str(e)}")
+        db.session.rollback()
+        raise
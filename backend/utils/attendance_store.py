@@ -0,0 +1,83 @@
+from typing import Dict, List, Optional
+
+from utils.attendance_rollup import AttendanceChange, apply_rollup_changes
+from utils.attendance_bitmap import apply_bitmap_changes
+from utils.attendance_stats import apply_stats_changes
+from utils.attendance_archive import archived_enrollments
+from utils.feature_store import apply_feature_attendance
+
+def upsert_attendance(rows: List[Dict], marked_by_id: Optional[int]) -> List[AttendanceChange]:
+    """
+    Insert or update a batch of attendance records
+    
+    Existing records for the batch are loaded with a single query and the
+    writes go out as one bulk insert and one bulk update, so the number of
+    statements does not grow with the batch size. When the same
+    (enrollment_id, date) appears more than once the last row wins.
+    Rollups, bitmaps, attendance stats and the attendance feature of
+    stored prediction features are updated in the same session; the
+    caller commits.
+    
+    Args:
+        rows (List[Dict]): Records with enrollment_id, date (a date), status
+            and optional remarks
+        marked_by_id (Optional[int]): ID of the user marking attendance
+    
+    Returns:
+        List[AttendanceChange]: The applied writes with their previous status
+        
+    Raises:
+        ValueError: If a record belongs to an archived term
+    """
+    from app import db
+    from models.tracking import AttendanceRecord
+    
+    batch: Dict[tuple, Dict] = {}
+    for row in rows:
+        batch[(int(row['enrollment_id']), row['date'])] = row
+    if not batch:
+        return []
+    
+    # Archived terms are read-only; a new hot row would be counted twice
+    archived = archived_enrollments(key[0] for key in batch)
+    if archived:
+        raise ValueError(f"Attendance of archived terms cannot be changed (enrollments {sorted(archived)})")
+    
+    # One round trip for every existing record in the batch; the IN lists
+    # can match a few extra (enrollment, date) pairs, which are dropped here
+    existing = {}
+    for record_id, enrollment_id, day, status in db.session.query(
+        AttendanceRecord.id, AttendanceRecord.enrollment_id,
+        AttendanceRecord.date, AttendanceRecord.status
+    ).filter(
+        AttendanceRecord.enrollment_id.in_({key[0] for key in batch}),
+        AttendanceRecord.date.in_({key[1] for key in batch})
+    ):
+        if (enrollment_id, day) in batch:
+            existing[(enrollment_id, day)] = (record_id, status)
+    
+    inserts, updates, changes = [], [], []
+    for (enrollment_id, day), row in batch.items():
+        values = {
+            'status': row['status'],
+            'remarks': row.get('remarks'),
+            'marked_by_id': marked_by_id
+        }
+        
+        if (enrollment_id, day) in existing:
+            record_id, old_status = existing[(enrollment_id, day)]
+            updates.append({'id': record_id, **values})
+        else:
+            old_status = None
+            inserts.append({'enrollment_id': enrollment_id, 'date': day, **values})
+        
+        changes.append(AttendanceChange(enrollment_id, day, old_status, row['status']))
+    
+    if inserts:
+        db.session.bulk_insert_mappings(AttendanceRecord, inserts)
+    if updates:
+        db.session.bulk_update_mappings(AttendanceRecord, updates)
+    
+    apply_rollup_changes(changes)
+    apply_feature_attendance(apply_stats_changes(apply_bitmap_changes(changes)))
+    return changes
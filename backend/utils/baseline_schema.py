@@ -0,0 +1,458 @@
+from sqlalchemy import (
+    JSON, Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, MetaData,
+    String, Table, Text, Time, UniqueConstraint
+)
+
+def baseline_metadata() -> MetaData:
+    """
+    Build the tables as they stood at schema version 1
+    
+    A frozen copy of the model declarations at the time migrations were
+    introduced, so migration 1 creates the same schema no matter how the
+    models change later. Later migrations build on a fresh copy of this
+    metadata; never edit it to follow the models.
+    
+    Returns:
+        MetaData: Version 1 tables, indexes and constraints
+    """
+    metadata = MetaData()
+    
+    # models.institution
+    Table(
+        'institutions', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(255), nullable=False),
+        Column('code', String(50), nullable=False, unique=True),
+        Column('type', String(50), nullable=False),
+        Column('address', Text),
+        Column('contact_email', String(120)),
+        Column('contact_phone', String(20)),
+        Column('website', String(255)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('is_active', Boolean)
+    )
+    
+    # models.user
+    Table(
+        'users', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('email', String(120), nullable=False, unique=True),
+        Column('password', String(255), nullable=False),
+        Column('name', String(120), nullable=False),
+        Column('role', String(20), nullable=False),
+        Column('institution_id', Integer, ForeignKey('institutions.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('is_active', Boolean),
+        Column('last_login', DateTime)
+    )
+    
+    # models.profiles
+    Table(
+        'students', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False, unique=True),
+        Column('roll_number', String(50), unique=True),
+        Column('date_of_birth', Date),
+        Column('admission_date', Date),
+        Column('current_year', Integer),
+        Column('department_id', Integer, ForeignKey('departments.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'teachers', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False, unique=True),
+        Column('employee_id', String(50), unique=True),
+        Column('department_id', Integer, ForeignKey('departments.id')),
+        Column('designation', String(100)),
+        Column('joining_date', Date),
+        Column('specialization', String(255)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'parents', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False, unique=True),
+        Column('occupation', String(100)),
+        Column('relationship', String(50)),
+        Column('alternate_phone', String(20)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'student_parent_association', metadata,
+        Column('student_id', Integer, ForeignKey('students.id'), primary_key=True),
+        Column('parent_id', Integer, ForeignKey('parents.id'), primary_key=True),
+        Column('created_at', DateTime)
+    )
+    
+    Table(
+        'teacher_course_association', metadata,
+        Column('teacher_id', Integer, ForeignKey('teachers.id'), primary_key=True),
+        Column('course_id', Integer, ForeignKey('courses.id'), primary_key=True),
+        Column('created_at', DateTime)
+    )
+    
+    Table(
+        'achievements', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('title', String(255), nullable=False),
+        Column('description', Text),
+        Column('achievement_date', Date),
+        Column('category', String(50)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    # models.academic
+    Table(
+        'departments', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(255), nullable=False),
+        Column('code', String(50), nullable=False),
+        Column('institution_id', Integer, ForeignKey('institutions.id'), nullable=False),
+        Column('head_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('is_active', Boolean)
+    )
+    
+    Table(
+        'courses', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(255), nullable=False),
+        Column('code', String(50), nullable=False),
+        Column('description', Text),
+        Column('credits', Integer),
+        Column('department_id', Integer, ForeignKey('departments.id'), nullable=False),
+        Column('institution_id', Integer, ForeignKey('institutions.id'), nullable=False),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('is_active', Boolean)
+    )
+    
+    Table(
+        'academic_years', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(50), nullable=False),
+        Column('start_date', Date, nullable=False),
+        Column('end_date', Date, nullable=False),
+        Column('institution_id', Integer, ForeignKey('institutions.id'), nullable=False),
+        Column('is_current', Boolean),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'terms', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(50), nullable=False),
+        Column('start_date', Date, nullable=False),
+        Column('end_date', Date, nullable=False),
+        Column('academic_year_id', Integer, ForeignKey('academic_years.id'), nullable=False),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'enrollments', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('course_id', Integer, ForeignKey('courses.id'), nullable=False),
+        Column('term_id', Integer, ForeignKey('terms.id'), nullable=False),
+        Column('status', String(20)),
+        Column('grade', String(2)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    # models.scheduling
+    Table(
+        'timetables', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(255), nullable=False),
+        Column('department_id', Integer, ForeignKey('departments.id'), nullable=False),
+        Column('term_id', Integer, ForeignKey('terms.id'), nullable=False),
+        Column('is_active', Boolean),
+        Column('generated_by_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'time_slots', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('timetable_id', Integer, ForeignKey('timetables.id'), nullable=False),
+        Column('course_id', Integer, ForeignKey('courses.id'), nullable=False),
+        Column('teacher_id', Integer, ForeignKey('teachers.id'), nullable=False),
+        Column('day_of_week', Integer, nullable=False),
+        Column('start_time', Time, nullable=False),
+        Column('end_time', Time, nullable=False),
+        Column('room_number', String(50)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'notifications', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+        Column('title', String(255), nullable=False),
+        Column('message', Text, nullable=False),
+        Column('type', String(50)),
+        Column('priority', String(20)),
+        Column('read', Boolean),
+        Column('read_at', DateTime),
+        Column('expires_at', DateTime),
+        Column('created_at', DateTime)
+    )
+    
+    Table(
+        'assignments', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('course_id', Integer, ForeignKey('courses.id'), nullable=False),
+        Column('title', String(255), nullable=False),
+        Column('description', Text),
+        Column('due_date', DateTime, nullable=False),
+        Column('max_marks', Float),
+        Column('weight_percentage', Float),
+        Column('created_by_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'assignment_submissions', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('assignment_id', Integer, ForeignKey('assignments.id'), nullable=False),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('submission_date', DateTime),
+        Column('file_path', String(255)),
+        Column('marks_obtained', Float),
+        Column('remarks', Text),
+        Column('status', String(20)),
+        Column('graded_by_id', Integer, ForeignKey('users.id')),
+        Column('graded_at', DateTime),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    # models.tracking
+    Table(
+        'attendance_records', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('enrollment_id', Integer, ForeignKey('enrollments.id'), nullable=False),
+        Column('date', Date, nullable=False),
+        Column('status', String(20), nullable=False),
+        Column('remarks', String(255)),
+        Column('marked_by_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Index('uq_attendance_enrollment_date', 'enrollment_id', 'date', unique=True)
+    )
+    
+    Table(
+        'attendance_rollups', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('scope', String(20), nullable=False),
+        Column('scope_id', Integer, nullable=False),
+        Column('period', String(10), nullable=False),
+        Column('period_start', Date, nullable=False),
+        Column('present', Integer, nullable=False),
+        Column('absent', Integer, nullable=False),
+        Column('late', Integer, nullable=False),
+        Column('updated_at', DateTime),
+        UniqueConstraint('scope', 'scope_id', 'period', 'period_start', name='uq_attendance_rollup_key')
+    )
+    
+    Table(
+        'attendance_bitmaps', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('enrollment_id', Integer, ForeignKey('enrollments.id'), nullable=False, unique=True),
+        Column('base_date', Date, nullable=False),
+        Column('present', LargeBinary, nullable=False),
+        Column('absent', LargeBinary, nullable=False),
+        Column('late', LargeBinary, nullable=False),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'attendance_stats', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('enrollment_id', Integer, ForeignKey('enrollments.id'), nullable=False, unique=True),
+        Column('course_id', Integer, ForeignKey('courses.id'), nullable=False, index=True),
+        Column('present', Integer, nullable=False),
+        Column('absent', Integer, nullable=False),
+        Column('late', Integer, nullable=False),
+        Column('percentage', Float, nullable=False),
+        Column('window_total', Integer, nullable=False),
+        Column('window_present', Integer, nullable=False),
+        Column('window_percentage', Float, nullable=False),
+        Column('current_streak', Integer, nullable=False),
+        Column('last_marked_date', Date),
+        Column('at_risk', Boolean, nullable=False),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'archived_terms', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('term_id', Integer, ForeignKey('terms.id'), nullable=False, unique=True),
+        Column('path', String(255), nullable=False),
+        Column('record_count', Integer, nullable=False),
+        Column('archived_at', DateTime)
+    )
+    
+    Table(
+        'marksheets', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('term_id', Integer, ForeignKey('terms.id'), nullable=False),
+        Column('total_marks', Float),
+        Column('percentage', Float),
+        Column('grade', String(2)),
+        Column('remarks', Text),
+        Column('scanned_copy_path', String(255)),
+        Column('verified', Boolean),
+        Column('verified_by_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'subject_marks', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('marksheet_id', Integer, ForeignKey('marksheets.id'), nullable=False),
+        Column('course_id', Integer, ForeignKey('courses.id'), nullable=False),
+        Column('marks_obtained', Float, nullable=False),
+        Column('max_marks', Float, nullable=False),
+        Column('remarks', String(255)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'ocr_jobs', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('term_id', Integer, ForeignKey('terms.id'), nullable=False),
+        Column('file_path', String(255), nullable=False),
+        Column('status', String(20)),
+        Column('result', JSON),
+        Column('error', Text),
+        Column('marksheet_id', Integer, ForeignKey('marksheets.id')),
+        Column('submitted_by_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('completed_at', DateTime)
+    )
+    
+    Table(
+        'performance_predictions', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('course_id', Integer, ForeignKey('courses.id'), nullable=False),
+        Column('predicted_grade', String(2)),
+        Column('confidence_score', Float),
+        Column('factors', JSON),
+        Column('prediction_date', DateTime),
+        Column('created_at', DateTime)
+    )
+    
+    # models.gamification
+    Table(
+        'badges', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100), nullable=False),
+        Column('description', Text),
+        Column('icon_path', String(255)),
+        Column('category', String(50)),
+        Column('points', Integer),
+        Column('criteria', JSON),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'student_badges', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('badge_id', Integer, ForeignKey('badges.id'), nullable=False),
+        Column('earned_date', DateTime),
+        Column('awarded_by_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime)
+    )
+    
+    Table(
+        'leaderboards', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100), nullable=False),
+        Column('category', String(50)),
+        Column('term_id', Integer, ForeignKey('terms.id')),
+        Column('department_id', Integer, ForeignKey('departments.id')),
+        Column('is_active', Boolean),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'leaderboard_rankings', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('leaderboard_id', Integer, ForeignKey('leaderboards.id'), nullable=False),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('points', Integer),
+        Column('rank', Integer),
+        Column('last_calculated', DateTime),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'point_transactions', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('points', Integer, nullable=False),
+        Column('reason', String(255)),
+        Column('category', String(50)),
+        Column('reference_type', String(50)),
+        Column('reference_id', Integer),
+        Column('awarded_by_id', Integer, ForeignKey('users.id')),
+        Column('created_at', DateTime)
+    )
+    
+    Table(
+        'rewards', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100), nullable=False),
+        Column('description', Text),
+        Column('points_required', Integer, nullable=False),
+        Column('quantity_available', Integer),
+        Column('is_active', Boolean),
+        Column('expiry_date', DateTime),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    Table(
+        'reward_redemptions', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('reward_id', Integer, ForeignKey('rewards.id'), nullable=False),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('points_spent', Integer, nullable=False),
+        Column('status', String(20)),
+        Column('redeemed_at', DateTime),
+        Column('processed_by_id', Integer, ForeignKey('users.id')),
+        Column('processed_at', DateTime),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    )
+    
+    return metadata
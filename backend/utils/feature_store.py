@@ -0,0 +1,217 @@
+from typing import Dict, Iterable
+from sqlalchemy import bindparam, event, inspect, select, update
+import logging
+
+from utils.assignment_features import assignment_features
+
+logger = logging.getLogger(__name__)
+
+# Prediction inputs kept in the feature store, in PredictionFeatures columns
+STORED_FEATURES = (
+    'attendance_percentage', 'assignment_completion_rate', 'submission_timeliness', 'previous_grade'
+)
+
+def compute_features(enrollment_ids: Iterable[int]) -> Dict[int, Dict]:
+    """
+    Compute stored prediction features for a set of enrollments
+    
+    Attendance comes from the attendance stats, assignment features from
+    one grouped query and the previous grade from the student's latest
+    verified marksheet of a term that started before the enrollment's.
+    
+    Args:
+        enrollment_ids (Iterable[int]): Enrollments to compute
+    
+    Returns:
+        Dict[int, Dict]: PredictionFeatures column values keyed by enrollment ID
+    """
+    from app import db
+    from models.academic import Enrollment, Term
+    from models.tracking import AttendanceStats, Marksheet
+    
+    enrollment_ids = set(enrollment_ids)
+    if not enrollment_ids:
+        return {}
+    
+    rows = db.session.query(
+        Enrollment.id, Enrollment.student_id, Enrollment.course_id, AttendanceStats.percentage
+    ).outerjoin(AttendanceStats, AttendanceStats.enrollment_id == Enrollment.id)\
+    .filter(Enrollment.id.in_(enrollment_ids)).all()
+    
+    assignment_rates = assignment_features(Enrollment.id.in_(enrollment_ids))
+    
+    enrollment_term = db.aliased(Term)
+    marksheet_term = db.aliased(Term)
+    previous = db.session.query(Enrollment.id, Marksheet.percentage)\
+        .join(enrollment_term, enrollment_term.id == Enrollment.term_id)\
+        .join(Marksheet, Marksheet.student_id == Enrollment.student_id)\
+        .join(marksheet_term, marksheet_term.id == Marksheet.term_id)\
+        .filter(
+            Enrollment.id.in_(enrollment_ids),
+            Marksheet.verified == True,
+            marksheet_term.start_date < enrollment_term.start_date
+        ).order_by(marksheet_term.start_date, Marksheet.id)
+    # Ordered oldest first, so the latest marksheet wins
+    previous_grades = {enrollment_id: percentage for enrollment_id, percentage in previous}
+    
+    features = {}
+    for enrollment_id, student_id, course_id, attendance_percentage in rows:
+        rates = assignment_rates.get(enrollment_id, {})
+        features[enrollment_id] = {
+            'enrollment_id': enrollment_id,
+            'student_id': student_id,
+            'course_id': course_id,
+            'attendance_percentage': attendance_percentage or 0.0,
+            'assignment_completion_rate': rates.get('assignment_completion_rate', 0.0),
+            'submission_timeliness': rates.get('submission_timeliness', 0.0),
+            'previous_grade': previous_grades.get(enrollment_id),
+            'stale': False
+        }
+    return features
+
+def load_features(enrollment_ids: Iterable[int]) -> Dict[int, Dict]:
+    """
+    Get stored prediction features for a set of enrollments
+    
+    Fresh rows come from one indexed lookup. Missing or stale rows are
+    recomputed and written back in the current session; the caller commits.
+    
+    Args:
+        enrollment_ids (Iterable[int]): Enrollments to load
+    
+    Returns:
+        Dict[int, Dict]: Values of STORED_FEATURES keyed by enrollment ID
+    """
+    from app import db
+    from models.tracking import PredictionFeatures
+    
+    enrollment_ids = set(enrollment_ids)
+    if not enrollment_ids:
+        return {}
+    
+    columns = [getattr(PredictionFeatures, name) for name in STORED_FEATURES]
+    rows = db.session.query(PredictionFeatures.enrollment_id, PredictionFeatures.id, PredictionFeatures.stale, *columns)\
+        .filter(PredictionFeatures.enrollment_id.in_(enrollment_ids)).all()
+    
+    features, existing = {}, {}
+    for enrollment_id, row_id, stale, *values in rows:
+        existing[enrollment_id] = row_id
+        if not stale:
+            features[enrollment_id] = dict(zip(STORED_FEATURES, values))
+    
+    refresh = enrollment_ids - set(features)
+    if refresh:
+        computed = compute_features(refresh)
+        updates = [{'id': existing[e], **values} for e, values in computed.items() if e in existing]
+        inserts = [values for e, values in computed.items() if e not in existing]
+        if updates:
+            db.session.bulk_update_mappings(PredictionFeatures, updates)
+        if inserts:
+            db.session.bulk_insert_mappings(PredictionFeatures, inserts)
+        features.update({e: {name: values[name] for name in STORED_FEATURES} for e, values in computed.items()})
+    
+    return features
+
+def apply_feature_attendance(stats: Dict[int, Dict]) -> None:
+    """
+    Copy freshly computed attendance percentages into stored feature rows
+    
+    Rows that do not exist yet are left alone; they are computed on first
+    read. Runs as one executemany in the current session; the caller commits.
+    
+    Args:
+        stats (Dict[int, Dict]): AttendanceStats column values keyed by enrollment ID
+    """
+    from app import db
+    from models.tracking import PredictionFeatures
+    
+    if not stats:
+        return
+    
+    table = PredictionFeatures.__table__
+    db.session.execute(
+        table.update()
+        .where(table.c.enrollment_id == bindparam('feature_enrollment_id'))
+        .values(attendance_percentage=bindparam('feature_attendance')),
+        [
+            {'feature_enrollment_id': enrollment_id, 'feature_attendance': values['percentage']}
+            for enrollment_id, values in stats.items()
+        ]
+    )
+
+def mark_features_stale(connection, criterion=None) -> None:
+    """
+    Flag stored feature rows for recomputation on their next read
+    
+    Args:
+        connection: SQLAlchemy connection or session to run the update on
+        criterion: SQL criterion on PredictionFeatures; all rows if omitted
+    """
+    from models.tracking import PredictionFeatures
+    
+    statement = update(PredictionFeatures).values(stale=True)
+    if criterion is not None:
+        statement = statement.where(criterion)
+    connection.execute(statement)
+
+def _submission_changed(mapper, connection, target):
+    """Flag the submitting student's features for the assignment's course"""
+    from models.scheduling import Assignment
+    from models.tracking import PredictionFeatures
+    
+    mark_features_stale(connection, (PredictionFeatures.student_id == target.student_id) &
+                        PredictionFeatures.course_id.in_(
+                            select(Assignment.course_id).where(Assignment.id == target.assignment_id)
+                        ))
+
+def _assignment_changed(mapper, connection, target):
+    """Flag the course's features; assignment count and due dates feed the assignment rates"""
+    from models.tracking import PredictionFeatures
+    
+    # A moved assignment changes the rates of both the old and the new course
+    course_ids = {target.course_id, *inspect(target).attrs.course_id.history.deleted}
+    mark_features_stale(connection, PredictionFeatures.course_id.in_(course_ids))
+
+def _marksheet_changed(mapper, connection, target):
+    """Flag the student's features when a verified marksheet is saved or loses verification"""
+    from models.tracking import PredictionFeatures
+    
+    state = inspect(target)
+    changed = any(state.attrs[name].history.has_changes() for name in ('verified', 'percentage', 'term_id'))
+    was_verified = target.verified or True in state.attrs.verified.history.deleted
+    if changed and was_verified:
+        mark_features_stale(connection, PredictionFeatures.student_id == target.student_id)
+
+def _marksheet_deleted(mapper, connection, target):
+    """Flag the student's features when a verified marksheet is deleted"""
+    from models.tracking import PredictionFeatures
+    
+    if target.verified:
+        mark_features_stale(connection, PredictionFeatures.student_id == target.student_id)
+
+def register_feature_listeners() -> None:
+    """
+    Keep stored features in step with assignments, submissions and marksheets
+    
+    Listens on ORM flushes, so any code path that saves an assignment, a
+    submission or a marksheet through the session is covered. Attendance goes through the
+    bulk upsert, which bypasses ORM events and calls
+    apply_feature_attendance instead.
+    """
+    from models.scheduling import Assignment, AssignmentSubmission
+    from models.tracking import Marksheet
+    
+    listeners = [
+        (Assignment, 'after_insert', _assignment_changed),
+        (Assignment, 'after_update', _assignment_changed),
+        (Assignment, 'after_delete', _assignment_changed),
+        (AssignmentSubmission, 'after_insert', _submission_changed),
+        (AssignmentSubmission, 'after_update', _submission_changed),
+        (AssignmentSubmission, 'after_delete', _submission_changed),
+        (Marksheet, 'after_insert', _marksheet_changed),
+        (Marksheet, 'after_update', _marksheet_changed),
+        (Marksheet, 'after_delete', _marksheet_deleted)
+    ]
+    for model, identifier, listener in listeners:
+        if not event.contains(model, identifier, listener):
+            event.listen(model, identifier, listener)
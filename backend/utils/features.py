@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Feature schema shared by training and inference: (input key, importance factor label).
+# Column order here is the column order of every feature matrix the model sees.
+FEATURE_SCHEMA = [
+    # Academic performance features
+    ('previous_grade', 'previous_grade'),
+    ('attendance_percentage', 'attendance'),
+    ('assignment_completion_rate', 'assignment_completion'),
+    ('class_participation_score', 'class_participation'),
+    # Study pattern features
+    ('study_hours_per_week', 'study_hours'),
+    ('self_study_score', 'self_study'),
+    ('group_study_score', 'group_study'),
+    # Engagement metrics
+    ('submission_timeliness', 'submission_timeliness'),
+    ('extra_curricular_participation', 'extra_curricular'),
+    ('project_scores', 'project_scores')
+]
+
+FEATURE_NAMES = [key for key, _ in FEATURE_SCHEMA]
+FEATURE_LABELS = [label for _, label in FEATURE_SCHEMA]
+FEATURE_DTYPE = np.float32
+
+def build_feature_matrix(records: Union[List[Dict], pd.DataFrame]) -> np.ndarray:
+    """
+    Build a feature matrix from student records column by column
+    
+    Missing fields are treated as 0.
+    
+    Args:
+        records (Union[List[Dict], pd.DataFrame]): Student records or a frame with feature columns
+        
+    Returns:
+        np.ndarray: Matrix of shape (len(records), len(FEATURE_SCHEMA)) in FEATURE_DTYPE
+    """
+    try:
+        n_rows = len(records)
+        X = np.zeros((n_rows, len(FEATURE_NAMES)), dtype=FEATURE_DTYPE)
+        
+        if isinstance(records, pd.DataFrame):
+            for column, name in enumerate(FEATURE_NAMES):
+                if name in records.columns:
+                    X[:, column] = pd.to_numeric(records[name], errors='coerce').fillna(0).to_numpy()
+        else:
+            for column, name in enumerate(FEATURE_NAMES):
+                X[:, column] = np.fromiter(
+                    (record.get(name) or 0 for record in records),
+                    dtype=FEATURE_DTYPE,
+                    count=n_rows
+                )
+        
+        return X
+    except Exception as e:
+        logger.error(f"Error building feature matrix: {str(e)}")
+        raise
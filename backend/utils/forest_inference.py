@@ -0,0 +1,125 @@
+from typing import Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# sklearn marks leaves with this child index
+TREE_LEAF = -1
+
+class CompiledForest:
+    """Flat-array evaluator for a fitted RandomForestRegressor and its StandardScaler
+    
+    Every tree's nodes are concatenated into shared feature, threshold,
+    child and value arrays. Rows are routed through all trees at once with
+    one vectorized step per tree level; leaves point at themselves, so a
+    fixed number of steps settles every path. Children are packed as
+    [right, left] pairs so a step is a single gather at
+    2 * node + go_left. Scaling, the float32 cast, the split comparison
+    and the per-tree summation order all follow sklearn, so predictions
+    are bit-for-bit those of scaler.transform followed by model.predict
+    with n_jobs=None.
+    """
+    
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, max_depth: int, feature_importances: np.ndarray,
+                 mean: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.feature_importances = feature_importances
+        self.mean = mean
+        self.scale = scale
+    
+    @classmethod
+    def from_sklearn(cls, model, scaler=None) -> 'CompiledForest':
+        """
+        Export a fitted forest, and optionally the scaler in front of it, to flat arrays
+        
+        Args:
+            model: Fitted single-output RandomForestRegressor
+            scaler: Fitted StandardScaler applied before the forest
+        
+        Returns:
+            CompiledForest: Evaluator equivalent to the pair
+        """
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+        
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == TREE_LEAF
+            
+            roots.append(offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, 0.0, tree.threshold))
+            children.append(np.stack([
+                np.where(leaf, nodes, tree.children_right),
+                np.where(leaf, nodes, tree.children_left)
+            ], axis=1).ravel() + offset)
+            values.append(tree.value[:, 0, 0])
+            offset += tree.node_count
+        
+        mean = scale = None
+        if scaler is not None:
+            mean = scaler.mean_ if scaler.with_mean else None
+            scale = scaler.scale_ if scaler.with_std else None
+        
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=np.concatenate(children).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(estimator.tree_.max_depth for estimator in model.estimators_),
+            feature_importances=np.array(model.feature_importances_),
+            mean=mean,
+            scale=scale
+        )
+    
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+    
+    def _prepare(self, X: np.ndarray) -> np.ndarray:
+        """Scale a feature matrix the way StandardScaler does, then cast it to the forest's float32"""
+        X = np.array(X, dtype=X.dtype if X.dtype in (np.float32, np.float64) else np.float64, ndmin=2)
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        return X.astype(np.float32, copy=False)
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict scores for a feature matrix
+        
+        Args:
+            X (np.ndarray): Unscaled matrix of shape (n_rows, n_features)
+        
+        Returns:
+            np.ndarray: Predicted score per row, as float64
+        """
+        X = self._prepare(np.asarray(X))
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        
+        # Tree-major: position t * n_rows + r follows row r through tree t
+        nodes = np.repeat(self.roots, n_rows)
+        row_offsets = np.tile(np.arange(0, n_rows * n_features, n_features), self.n_trees)
+        for _ in range(self.max_depth):
+            go_left = flat[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        
+        # add.accumulate sums tree by tree in estimator order, as sklearn does
+        leaf_values = self.value[nodes].reshape(self.n_trees, n_rows)
+        scores = np.add.accumulate(leaf_values, axis=0)[-1]
+        scores /= self.n_trees
+        return scores
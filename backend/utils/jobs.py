@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class OCRJobQueue:
+    """In-process worker pool that runs marksheet OCR outside the request thread
+    
+    Job state lives in the ocr_jobs table, so queued jobs survive a restart and
+    any worker process can answer status polls.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.logger = logging.getLogger(__name__)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Bind the queue to an application and start its worker pool"""
+        self.app = app
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config['OCR_WORKERS'],
+            thread_name_prefix='ocr-worker'
+        )
+        app.extensions['ocr_job_queue'] = self
+
+    def submit(self, job_id: int) -> None:
+        """Schedule a queued job on the worker pool"""
+        if self.executor is None:
+            raise RuntimeError("OCR job queue is not initialized")
+        self.executor.submit(self._run, job_id)
+
+    def resume_pending(self) -> int:
+        """Re-schedule jobs that were queued but never picked up
+        
+        Jobs still processing OCR_JOB_STALE_AFTER seconds after they were
+        claimed belonged to a worker that crashed or restarted mid-run; they
+        are moved back to queued first so they are picked up again.
+        """
+        from app import db
+        from models.tracking import OCRJob
+        
+        with self.app.app_context():
+            # _claim stamps updated_at, and nothing else writes a job until it finishes
+            cutoff = datetime.utcnow() - timedelta(seconds=self.app.config['OCR_JOB_STALE_AFTER'])
+            requeued = OCRJob.query.filter(OCRJob.status == 'processing', OCRJob.updated_at < cutoff).update(
+                {'status': 'queued', 'updated_at': datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.session.commit()
+            if requeued:
+                self.logger.warning(f"Requeued {requeued} OCR jobs left processing by a stopped worker")
+            
+            job_ids = [job_id for (job_id,) in
+                       OCRJob.query.with_entities(OCRJob.id).filter_by(status='queued')]
+        
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    def _claim(self, job_id: int) -> bool:
+        """Atomically move a job from queued to processing"""
+        from app import db
+        from models.tracking import OCRJob
+        
+        claimed = OCRJob.query.filter_by(id=job_id, status='queued').update(
+            {'status': 'processing', 'updated_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return claimed == 1
+
+    def _run(self, job_id: int) -> None:
+        """Process a single job and persist its marksheet"""
+        from app import db
+        from models.tracking import OCRJob, Marksheet
+        from utils.ocr import process_marksheet, get_ocr_config, upload_content_hash
+        
+        with self.app.app_context():
+            try:
+                if not self._claim(job_id):
+                    return
+                
+                job = OCRJob.query.get(job_id)
+                # Uploads are named by their SHA-256, so the cache key needs no second read
+                result = process_marksheet(job.file_path, get_ocr_config(self.app.config),
+                                           upload_content_hash(job.file_path))
+                
+                marksheet = Marksheet.from_ocr_result(
+                    job.student_id, job.term_id, job.file_path, result
+                )
+                db.session.add(marksheet)
+                db.session.flush()
+                
+                job.status = 'completed'
+                job.result = result
+                job.marksheet_id = marksheet.id
+                job.completed_at = datetime.utcnow()
+                db.session.commit()
+                
+                self.logger.info(f"OCR job {job_id} completed")
+            except Exception as e:
+                self.logger.error(f"OCR job {job_id} failed: {str(e)}")
+                db.session.rollback()
+                OCRJob.query.filter_by(id=job_id).update(
+                    {'status': 'failed', 'error': str(e), 'completed_at': datetime.utcnow()},
+                    synchronize_session=False
+                )
+                db.session.commit()
+
+ocr_job_queue = OCRJobQueue()
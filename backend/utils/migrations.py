@@ -0,0 +1,167 @@
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+import importlib
+import logging
+
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, select
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# Every model module, so db.metadata is complete before the app queries it
+MODEL_MODULES = (
+    'models.institution', 'models.user', 'models.profiles', 'models.academic',
+    'models.scheduling', 'models.tracking', 'models.gamification'
+)
+
+# Kept out of db.metadata so it is managed only by the migration runner
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable
+
+MIGRATIONS: List[Migration] = []
+
+def migration(version: int, description: str):
+    """Register a schema migration; versions must be applied in increasing order"""
+    def register(fn):
+        MIGRATIONS.append(Migration(version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return fn
+    return register
+
+# Migrations build their DDL from pinned table definitions, never from the
+# live models, so replaying them always yields the schema of their version
+
+# Version 2 indexes as (table, name, columns, unique)
+HOT_LOOKUP_INDEXES = (
+    ('enrollments', 'ix_enrollments_student_course', ('student_id', 'course_id'), False),
+    ('enrollments', 'ix_enrollments_course_term', ('course_id', 'term_id'), False),
+    ('enrollments', 'ix_enrollments_term', ('term_id',), False),
+    ('time_slots', 'ix_time_slots_timetable_day', ('timetable_id', 'day_of_week'), False),
+    ('time_slots', 'ix_time_slots_teacher', ('teacher_id',), False),
+    ('assignments', 'ix_assignments_course', ('course_id',), False),
+    ('assignment_submissions', 'ix_assignment_submissions_student_assignment', ('student_id', 'assignment_id'), False),
+    ('marksheets', 'ix_marksheets_student', ('student_id',), False),
+    ('attendance_records', 'uq_attendance_enrollment_date', ('enrollment_id', 'date'), True),
+    ('ocr_jobs', 'ix_ocr_jobs_status', ('status',), False),
+    ('performance_predictions', 'ix_performance_predictions_student_date', ('student_id', 'prediction_date'), False),
+    ('performance_predictions', 'ix_performance_predictions_course', ('course_id',), False),
+    ('point_transactions', 'ix_point_transactions_student_created', ('student_id', 'created_at'), False)
+)
+
+def _hot_lookup_indexes(metadata: MetaData) -> List[Index]:
+    """Bind the version 2 indexes to their tables in metadata"""
+    return [
+        Index(name, *(metadata.tables[table].c[column] for column in columns), unique=unique)
+        for table, name, columns, unique in HOT_LOOKUP_INDEXES
+    ]
+
+def _prediction_features_table(metadata: MetaData) -> Table:
+    """Define the version 3 feature store table in metadata"""
+    return Table(
+        'prediction_features', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('enrollment_id', Integer, ForeignKey('enrollments.id'), nullable=False, unique=True),
+        Column('student_id', Integer, ForeignKey('students.id'), nullable=False),
+        Column('course_id', Integer, ForeignKey('courses.id'), nullable=False),
+        Column('attendance_percentage', Float, nullable=False),
+        Column('assignment_completion_rate', Float, nullable=False),
+        Column('submission_timeliness', Float, nullable=False),
+        Column('previous_grade', Float),
+        Column('stale', Boolean, nullable=False),
+        Column('updated_at', DateTime),
+        Index('ix_prediction_features_student_course', 'student_id', 'course_id')
+    )
+
+@migration(1, 'Create tables')
+def _create_tables(connection):
+    # checkfirst leaves tables of databases created before migrations alone
+    from utils.baseline_schema import baseline_metadata
+    baseline_metadata().create_all(connection, checkfirst=True)
+
+@migration(2, 'Add hot lookup indexes and the unique attendance index')
+def _add_indexes(connection):
+    # Databases created by create_all before these indexes were declared
+    from utils.baseline_schema import baseline_metadata
+    from utils.schema import ensure_indexes
+    ensure_indexes(connection, _hot_lookup_indexes(baseline_metadata()))
+
+@migration(3, 'Add the prediction feature store')
+def _add_prediction_features(connection):
+    # The referenced tables must be in the same metadata for the foreign keys
+    from utils.baseline_schema import baseline_metadata
+    _prediction_features_table(baseline_metadata()).create(connection, checkfirst=True)
+
+def load_models() -> None:
+    """Import every model module so all tables are registered"""
+    for module in MODEL_MODULES:
+        importlib.import_module(module)
+
+def latest_version() -> int:
+    """Get the version the code expects the schema to be at"""
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+def current_version() -> int:
+    """
+    Get the version the database schema is at
+    
+    Reads the version table directly instead of reflecting the schema, so
+    it costs one query on worker start.
+    
+    Returns:
+        int: Applied version, 0 for a database never migrated
+    """
+    from app import db
+    
+    try:
+        with db.engine.connect() as connection:
+            version = connection.execute(select(schema_version.c.version)
+                                         .order_by(schema_version.c.version.desc()).limit(1)).scalar()
+    except DBAPIError:
+        # No version table yet
+        return 0
+    return version or 0
+
+def upgrade(target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations in order
+    
+    Each migration runs in its own transaction together with the version
+    row recording it, so an interrupted upgrade resumes where it stopped.
+    Run it once per deploy, not from every worker.
+    
+    Args:
+        target (Optional[int]): Stop after this version, defaults to the latest
+    
+    Returns:
+        List[Migration]: Migrations applied
+    """
+    from app import db
+    
+    schema_version.create(db.engine, checkfirst=True)
+    
+    current = current_version()
+    target = latest_version() if target is None else target
+    
+    applied = []
+    for step in MIGRATIONS:
+        if step.version <= current or step.version > target:
+            continue
+        
+        with db.engine.begin() as connection:
+            step.apply(connection)
+            connection.execute(schema_version.insert().values(
+                version=step.version, description=step.description, applied_at=datetime.utcnow()
+            ))
+        logger.info(f"Applied schema migration {step.version}: {step.description}")
+        applied.append(step)
+    
+    return applied
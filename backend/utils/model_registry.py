@@ -0,0 +1,117 @@
+import joblib
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Class for storing and loading versioned model artifacts on disk"""
+
+    ARTIFACT_EXTENSION = '.joblib'
+    LATEST_POINTER = 'LATEST'
+
+    def __init__(self, folder: str):
+        """Initialize registry rooted at the given folder"""
+        self.folder = folder
+        self.logger = logging.getLogger(__name__)
+
+    def _artifact_path(self, version: str) -> str:
+        return os.path.join(self.folder, f"{version}{self.ARTIFACT_EXTENSION}")
+
+    def _pointer_path(self) -> str:
+        return os.path.join(self.folder, self.LATEST_POINTER)
+
+    def _atomic_write(self, path: str, write_fn) -> None:
+        """Write a file next to its destination and move it into place atomically"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                write_fn(handle)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def new_version() -> str:
+        """Generate a version tag from the current UTC time"""
+        return datetime.utcnow().strftime('v%Y%m%d%H%M%S%f')
+
+    def save(self, artifact: Dict, version: Optional[str] = None, promote: bool = True) -> str:
+        """
+        Serialize a model artifact to disk under a version tag
+
+        Args:
+            artifact (Dict): Fitted estimator, scaler and metadata
+            version (Optional[str]): Version tag, generated when omitted
+            promote (bool): Whether to point LATEST at the new artifact
+
+        Returns:
+            str: Version tag of the stored artifact
+        """
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            version = version or self.new_version()
+            artifact = dict(artifact, version=version, saved_at=datetime.utcnow().isoformat())
+
+            self._atomic_write(self._artifact_path(version),
+                               lambda handle: joblib.dump(artifact, handle))
+            if promote:
+                self.promote(version)
+
+            self.logger.info(f"Stored model artifact {version}")
+            return version
+        except Exception as e:
+            self.logger.error(f"Error saving model artifact: {str(e)}")
+            raise
+
+    def promote(self, version: str) -> None:
+        """Point LATEST at an existing artifact version"""
+        if not os.path.exists(self._artifact_path(version)):
+            raise ValueError(f"Unknown model version: {version}")
+        self._atomic_write(self._pointer_path(),
+                           lambda handle: handle.write(version.encode('utf-8')))
+
+    def latest_version(self) -> Optional[str]:
+        """Return the version LATEST points at, if any"""
+        try:
+            with open(self._pointer_path(), 'r') as handle:
+                return handle.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self) -> List[str]:
+        """List stored artifact versions, oldest first"""
+        if not os.path.isdir(self.folder):
+            return []
+        return sorted(
+            name[:-len(self.ARTIFACT_EXTENSION)]
+            for name in os.listdir(self.folder)
+            if name.endswith(self.ARTIFACT_EXTENSION) and not name.startswith('.')
+        )
+
+    def load(self, version: Optional[str] = None) -> Dict:
+        """
+        Load a model artifact from disk
+
+        Args:
+            version (Optional[str]): Version tag, defaults to LATEST
+
+        Returns:
+            Dict: Deserialized artifact
+        """
+        version = version or self.latest_version()
+        if not version:
+            raise FileNotFoundError(f"No model artifact registered in {self.folder}")
+
+        try:
+            artifact = joblib.load(self._artifact_path(version))
+            self.logger.info(f"Loaded model artifact {version}")
+            return artifact
+        except Exception as e:
+            self.logger.error(f"Error loading model artifact {version}: {str(e)}")
+            raise
@@ -2,24 +2,359 @@ import pytesseract
 from PIL import Image
 import cv2
 import numpy as np
+import atexit
+import hashlib
+import json
+import os
 import re
-from typing import Dict, List, Tuple, Optional
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import logging
+from utils.ocr_cache import get_result_cache
+
+try:
+    import pymupdf
+except ImportError:  # PDF marksheets are unsupported without PyMuPDF
+    pymupdf = None
+
+try:
+    import tesserocr
+except ImportError:  # Falls back to the pytesseract subprocess backend
+    tesserocr = None
 
 logger = logging.getLogger(__name__)
 
+# Uploads are stored as <sha256>.<extension> (see routes.marksheet.save_upload)
+CONTENT_ADDRESSED_NAME = re.compile(r'^([0-9a-f]{64})\.[A-Za-z0-9]+$')
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file without loading it into memory
+    
+    Args:
+        path (str): Path to the file
+        chunk_size (int): Bytes read per iteration
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def upload_content_hash(path: str) -> Optional[str]:
+    """
+    Get the SHA-256 a content-addressed upload carries in its filename
+    
+    Args:
+        path (str): Path to the file
+        
+    Returns:
+        Optional[str]: Hex digest, or None if the name is not a digest
+    """
+    match = CONTENT_ADDRESSED_NAME.match(os.path.basename(path))
+    return match.group(1) if match else None
+
+class OCRBackend(ABC):
+    """Base class for engines that turn a preprocessed image into text"""
+    
+    name = None
+    
+    @abstractmethod
+    def image_to_text(self, image: np.ndarray, language: str, oem: int, psm: int) -> str:
+        """
+        Run OCR on an in-memory image
+        
+        Args:
+            image (np.ndarray): Preprocessed grayscale or BGR image
+            language (str): Tesseract language code
+            oem (int): Tesseract OCR engine mode
+            psm (int): Tesseract page segmentation mode
+            
+        Returns:
+            str: Extracted text
+        """
+    
+    def close(self) -> None:
+        """Release engine resources held by the backend"""
+
+class PytesseractBackend(OCRBackend):
+    """Runs a tesseract subprocess per call through pytesseract"""
+    
+    name = 'pytesseract'
+    
+    def image_to_text(self, image: np.ndarray, language: str, oem: int, psm: int) -> str:
+        return pytesseract.image_to_string(image, lang=language, config=f'--oem {oem} --psm {psm}')
+
+class TesserocrBackend(OCRBackend):
+    """Keeps resident tesseract engines through tesserocr
+    
+    Engines are pooled per (language, oem, psm) and checked out for one call
+    at a time, so short-lived page threads reuse engines whose language
+    models are already loaded instead of each loading its own. Images are
+    handed over as raw pixel buffers, so there is no subprocess or temp file
+    per page.
+    """
+    
+    name = 'tesserocr'
+    
+    def __init__(self):
+        if tesserocr is None:
+            raise ValueError("The tesserocr backend requires the tesserocr package")
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    @contextmanager
+    def _checkout(self, language: str, oem: int, psm: int):
+        """Borrow an idle engine for the given settings, creating one when none is free"""
+        key = (language, oem, psm)
+        with self._lock:
+            api = self._idle[key].pop() if self._idle[key] else None
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=language, oem=tesserocr.OEM(oem), psm=tesserocr.PSM(psm))
+        
+        try:
+            yield api
+        finally:
+            with self._lock:
+                if not self._closed:
+                    self._idle[key].append(api)
+                    api = None
+            if api is not None:
+                api.End()
+    
+    def close(self) -> None:
+        """End every pooled engine; engines still checked out are ended when returned"""
+        with self._lock:
+            self._closed = True
+            apis = [api for idle in self._idle.values() for api in idle]
+            self._idle.clear()
+        for api in apis:
+            api.End()
+    
+    def image_to_text(self, image: np.ndarray, language: str, oem: int, psm: int) -> str:
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        if bytes_per_pixel == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        with self._checkout(language, oem, psm) as api:
+            api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+            return api.GetUTF8Text()
+
+OCR_BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend
+}
+
+_backends: Dict[str, OCRBackend] = {}
+_backends_lock = threading.Lock()
+
+def get_ocr_backend(name: str = 'auto') -> OCRBackend:
+    """
+    Get the process-wide OCR backend instance
+    
+    Args:
+        name (str): Backend name, or 'auto' to prefer tesserocr when installed
+        
+    Returns:
+        OCRBackend: Shared backend instance
+    """
+    if name == 'auto':
+        name = TesserocrBackend.name if tesserocr is not None else PytesseractBackend.name
+    
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name}")
+    
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = OCR_BACKENDS[name]()
+        return _backends[name]
+
+def close_ocr_backends() -> None:
+    """Shut down every process-wide OCR backend, ending resident engines"""
+    with _backends_lock:
+        backends = list(_backends.values())
+        _backends.clear()
+    for backend in backends:
+        backend.close()
+
+atexit.register(close_ocr_backends)
+
+def get_ocr_config(app_config) -> Dict[str, any]:
+    """
+    Build a picklable OCR processor configuration from application config
+    
+    Args:
+        app_config: Flask application config mapping
+        
+    Returns:
+        Dict[str, any]: Configuration for OCRProcessor
+    """
+    return {
+        'language': app_config.get('OCR_LANGUAGE', 'eng'),
+        'backend': app_config.get('OCR_BACKEND', 'auto'),
+        'pdf_dpi': app_config.get('OCR_PDF_DPI', 200),
+        'page_workers': app_config.get('OCR_PAGE_WORKERS', 4),
+        'adaptive_preprocessing': app_config.get('OCR_ADAPTIVE_PREPROCESSING', True),
+        'target_text_height': app_config.get('OCR_TARGET_TEXT_HEIGHT', 32),
+        'cache_path': app_config.get('OCR_CACHE_PATH'),
+        'cache_max_entries': app_config.get('OCR_CACHE_MAX_ENTRIES', 5000)
+    }
+
 class OCRProcessor:
     """Class for handling OCR processing of marksheets"""
     
+    # Bump when preprocessing or extraction changes so cached results are not reused
+    PIPELINE_VERSION = 2
+    TESSERACT_OEM = 3  # Default engine
+    TESSERACT_PSM = 6  # Assume a single uniform block of text
+    
     def __init__(self, config=None):
         """Initialize OCR processor with optional configuration"""
         self.config = config or {}
+        self.language = self.config.get('language', 'eng')
+        self.backend = get_ocr_backend(self.config.get('backend', 'auto'))
+        self.pdf_dpi = self.config.get('pdf_dpi', 200)
+        self.page_workers = self.config.get('page_workers', 4)
+        self.adaptive_preprocessing = self.config.get('adaptive_preprocessing', True)
+        self.target_text_height = self.config.get('target_text_height', 32)
         self.logger = logging.getLogger(__name__)
+        
+        self.cache = None
+        if self.config.get('cache_path'):
+            self.cache = get_result_cache(
+                self.config['cache_path'],
+                max_entries=self.config.get('cache_max_entries', 5000)
+            )
+
+    def config_fingerprint(self) -> str:
+        """Fingerprint of every setting that affects OCR output"""
+        settings = {
+            'pipeline_version': self.PIPELINE_VERSION,
+            'backend': self.backend.name,
+            'tesseract_oem': self.TESSERACT_OEM,
+            'tesseract_psm': self.TESSERACT_PSM,
+            'language': self.language,
+            'pdf_dpi': self.pdf_dpi,
+            'adaptive_preprocessing': self.adaptive_preprocessing,
+            'target_text_height': self.target_text_height
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def estimate_text_height(self, gray: np.ndarray) -> Optional[float]:
+        """
+        Estimate the typical character height of an image in pixels
+        
+        Args:
+            gray (np.ndarray): Grayscale image
+            
+        Returns:
+            Optional[float]: Median glyph height, or None when too few glyphs are found
+        """
+        # Very large photos are measured at reduced resolution
+        factor = 1
+        while max(gray.shape) / factor > 2000:
+            factor *= 2
+        sample = gray[::factor, ::factor] if factor > 1 else gray
+        
+        binary = cv2.threshold(sample, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+        _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        widths = stats[1:, cv2.CC_STAT_WIDTH]
+        
+        # Keep glyph-like components, dropping specks, rules and large blobs
+        glyphs = (heights >= 3) & (heights <= sample.shape[0] * 0.1) & (widths <= heights * 3)
+        if glyphs.sum() < 10:
+            return None
+        
+        return float(np.median(heights[glyphs])) * factor
+
+    def normalize_scale(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Resize an image so its text height matches target_text_height
+        
+        Tesseract time grows with pixel count while accuracy depends on glyph
+        size, so oversized phone photos are shrunk and tiny scans enlarged.
+        
+        Args:
+            gray (np.ndarray): Grayscale image
+            
+        Returns:
+            np.ndarray: Rescaled grayscale image
+        """
+        text_height = self.estimate_text_height(gray)
+        if not text_height:
+            return gray
+        
+        scale = min(max(self.target_text_height / text_height, 0.2), 2.0)
+        if 0.9 <= scale <= 1.1:
+            return gray
+        
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+        return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+
+    def detect_content_region(self, gray: np.ndarray) -> Tuple[int, int, int, int]:
+        """
+        Find the bounding box of the text-bearing region of a marksheet
+        
+        Text is merged into blocks with a wide dilation and the union of the
+        blocks is returned, which drops photo background and empty margins
+        while keeping the header fields together with the marks table.
+        
+        Args:
+            gray (np.ndarray): Grayscale image
+            
+        Returns:
+            Tuple[int, int, int, int]: (x, y, width, height) of the region
+        """
+        height, width = gray.shape[:2]
+        binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+        
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, width // 40), max(3, height // 120)))
+        blocks = cv2.dilate(binary, kernel, iterations=1)
+        # Two-level retrieval keeps text blocks that sit inside a dark background frame
+        contours, hierarchy = cv2.findContours(blocks, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        if hierarchy is None:
+            return 0, 0, width, height
+        
+        min_area = 0.0005 * width * height
+        boxes = []
+        for contour, (_, _, _, parent) in zip(contours, hierarchy[0]):
+            if parent != -1:
+                continue  # Hole boundary, not a block
+            x, y, w, h = cv2.boundingRect(contour)
+            # Skip specks and background regions that span the whole frame
+            if w * h < min_area or (w >= width * 0.98 and h >= height * 0.98):
+                continue
+            boxes.append((x, y, x + w, y + h))
+        
+        if not boxes:
+            return 0, 0, width, height
+        
+        margin_x, margin_y = width // 50, height // 50
+        x0 = max(min(b[0] for b in boxes) - margin_x, 0)
+        y0 = max(min(b[1] for b in boxes) - margin_y, 0)
+        x1 = min(max(b[2] for b in boxes) + margin_x, width)
+        y1 = min(max(b[3] for b in boxes) + margin_y, height)
+        return x0, y0, x1 - x0, y1 - y0
 
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """
         Preprocess image for better OCR accuracy
         
+        With adaptive preprocessing enabled the image is first rescaled to the
+        target text height and cropped to its text region.
+        
         Args:
             image (np.ndarray): Input image in numpy array format
             
@@ -33,6 +368,11 @@ class OCRProcessor:
             else:
                 gray = image
 
+            if self.adaptive_preprocessing:
+                gray = self.normalize_scale(gray)
+                x, y, w, h = self.detect_content_region(gray)
+                gray = gray[y:y + h, x:x + w]
+
             # Apply thresholding to preprocess the image
             threshold = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
 
@@ -64,18 +404,89 @@ class OCRProcessor:
             if image is None:
                 raise ValueError(f"Could not read image at path: {image_path}")
 
-            # Preprocess the image
-            processed_image = self.preprocess_image(image)
+            return self.extract_text_from_image(image)
+        except Exception as e:
+            self.logger.error(f"Error in OCR text extraction: {str(e)}")
+            raise
+
+    def extract_text_from_image(self, image: np.ndarray) -> str:
+        """
+        Extract text from an in-memory image using OCR
+        
+        Args:
+            image (np.ndarray): Input image in numpy array format
+            
+        Returns:
+            str: Extracted text from the image
+        """
+        # Preprocess the image
+        processed_image = self.preprocess_image(image)
+
+        # Perform OCR
+        text = self.backend.image_to_text(
+            processed_image, self.language, self.TESSERACT_OEM, self.TESSERACT_PSM
+        )
 
-            # Perform OCR
-            custom_config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(processed_image, config=custom_config)
+        return text.strip()
 
-            return text.strip()
+    def iter_pdf_pages(self, pdf_path: str) -> Iterator[np.ndarray]:
+        """
+        Rasterize PDF pages one at a time at the configured DPI
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            
+        Yields:
+            np.ndarray: Grayscale page image
+        """
+        if pymupdf is None:
+            raise ValueError("PDF marksheets require PyMuPDF to be installed")
+        
+        zoom = self.pdf_dpi / 72
+        with pymupdf.open(pdf_path) as document:
+            for page in document:
+                pixmap = page.get_pixmap(
+                    matrix=pymupdf.Matrix(zoom, zoom), colorspace=pymupdf.csGRAY, alpha=False
+                )
+                rows = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.stride)
+                yield rows[:, :pixmap.width].copy()
+
+    def extract_pdf_text(self, pdf_path: str) -> List[str]:
+        """
+        Extract text from every page of a PDF, OCRing pages in parallel
+        
+        Pages are rendered lazily and at most page_workers bitmaps are held
+        in memory at once.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            
+        Returns:
+            List[str]: Extracted text per page, in page order
+        """
+        try:
+            texts = []
+            with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+                in_flight = deque()
+                for page in self.iter_pdf_pages(pdf_path):
+                    if len(in_flight) >= self.page_workers:
+                        texts.append(in_flight.popleft().result())
+                    in_flight.append(executor.submit(self.extract_text_from_image, page))
+                
+                while in_flight:
+                    texts.append(in_flight.popleft().result())
+            
+            return texts
         except Exception as e:
-            self.logger.error(f"Error in OCR text extraction: {str(e)}")
+            self.logger.error(f"Error in PDF text extraction: {str(e)}")
             raise
 
+    def extract_page_texts(self, path: str) -> List[str]:
+        """Extract text per page from an image or PDF marksheet"""
+        if path.lower().endswith('.pdf'):
+            return self.extract_pdf_text(path)
+        return [self.extract_text(path)]
+
     def extract_marks(self, text: str) -> List[Dict[str, float]]:
         """
         Extract subject marks from OCR text
@@ -124,9 +535,9 @@ class OCRProcessor:
             # Regular expressions for different fields
             patterns = {
                 'roll_number': r'Roll(?:\s+)?(?:No|Number|#)?\s*[:.-]\s*(\w+)',
-                'name': r'Name\s*[:.-]\s*([A-Za-z\s]+)',
+                'name': r'Name\s*[:.-][ \t]*([A-Za-z][A-Za-z \t]*)',
                 'class': r'Class\s*[:.-]\s*(\w+)',
-                'term': r'Term|Semester\s*[:.-]\s*(\w+)'
+                'term': r'(?:Term|Semester)\s*[:.-]\s*(\w+)'
             }
             
             for field, pattern in patterns.items():
@@ -141,25 +552,51 @@ class OCRProcessor:
             self.logger.error(f"Error in student info extraction: {str(e)}")
             raise
 
-    def process_marksheet(self, image_path: str) -> Dict[str, any]:
+    def process_marksheet(self, image_path: str, content_hash: Optional[str] = None) -> Dict[str, any]:
         """
         Process marksheet image and extract all relevant information
         
+        When a result cache is configured, scans with identical content and
+        OCR settings are served from the cache without running tesseract.
+        
         Args:
-            image_path (str): Path to the marksheet image
+            image_path (str): Path to the marksheet image or PDF
+            content_hash (Optional[str]): SHA-256 of the file if already known,
+                saving a full read to hash it
             
         Returns:
             Dict[str, any]: Dictionary containing extracted information
         """
+        if self.cache is None:
+            return self._process_uncached(image_path)
+        
+        content_hash = content_hash or hash_file(image_path)
+        config_key = self.config_fingerprint()
+        
+        cached = self.cache.get(content_hash, config_key)
+        if cached is not None:
+            self.logger.info(f"OCR cache hit for {image_path}")
+            return cached
+        
+        result = self._process_uncached(image_path)
+        self.cache.put(content_hash, config_key, result)
+        return result
+
+    def _process_uncached(self, image_path: str) -> Dict[str, any]:
+        """Run OCR and extraction on a marksheet image"""
         try:
-            # Extract text from image
-            text = self.extract_text(image_path)
+            # Extract text from every page
+            page_texts = self.extract_page_texts(image_path)
             
-            # Extract student information
-            student_info = self.extract_student_info(text)
+            # Extract student information, keeping the first value found for each field
+            student_info = {}
+            for text in page_texts:
+                for field, value in self.extract_student_info(text).items():
+                    if student_info.get(field) is None:
+                        student_info[field] = value
             
-            # Extract marks
-            marks_data = self.extract_marks(text)
+            # Extract marks across all pages
+            marks_data = [mark for text in page_texts for mark in self.extract_marks(text)]
             
             # Calculate total and percentage
             total_obtained = sum(mark['marks_obtained'] for mark in marks_data)
@@ -179,15 +616,76 @@ class OCRProcessor:
             self.logger.error(f"Error in marksheet processing: {str(e)}")
             raise
 
-def process_marksheet(image_path: str) -> Dict[str, any]:
+def process_marksheet(image_path: str, config: Optional[Dict] = None,
+                      content_hash: Optional[str] = None) -> Dict[str, any]:
     """
     Wrapper function for processing marksheet
     
     Args:
-        image_path (str): Path to the marksheet image
+        image_path (str): Path to the marksheet image or PDF
+        config (Optional[Dict]): OCR processor configuration
+        content_hash (Optional[str]): SHA-256 of the file if already known
         
     Returns:
         Dict[str, any]: Extracted information from marksheet
     """
-    processor = OCRProcessor()
-    return processor.process_marksheet(image_path)
\ No newline at end of file
+    processor = OCRProcessor(config)
+    return processor.process_marksheet(image_path, content_hash)
+
+def _init_ocr_worker():
+    """Limit each pool process to one thread so processes do not oversubscribe cores"""
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    cv2.setNumThreads(1)
+
+def _process_marksheet_file(image_path: str, config: Optional[Dict]) -> Dict[str, any]:
+    """Process a single marksheet inside a pool process"""
+    try:
+        return OCRProcessor(config).process_marksheet(image_path)
+    except Exception as e:
+        # Some OCR library exceptions cannot be unpickled in the parent, so send back a plain one
+        raise RuntimeError(str(e) or type(e).__name__) from None
+
+def process_marksheets_parallel(image_paths: Iterable[str], max_workers: Optional[int] = None,
+                                config: Optional[Dict] = None
+                                ) -> Iterator[Tuple[str, Optional[Dict[str, any]], Optional[str]]]:
+    """
+    Process many marksheets across a process pool
+    
+    Results are yielded in completion order. A failure on one file is
+    reported in its tuple and does not stop the rest of the batch. At most
+    two files per worker are in flight, so memory stays flat however many
+    paths the iterable yields.
+    
+    Args:
+        image_paths (Iterable[str]): Paths to marksheet images
+        max_workers (Optional[int]): Pool size, defaults to the number of cores
+        config (Optional[Dict]): OCR processor configuration
+        
+    Yields:
+        Tuple[str, Optional[Dict], Optional[str]]: (path, extracted information, error message)
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    
+    # The pool already uses every core, so PDFs are OCRed one page at a time per process
+    config = dict(config or {}, page_workers=1)
+    
+    paths = iter(image_paths)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_ocr_worker) as executor:
+        in_flight = {
+            executor.submit(_process_marksheet_file, path, config): path
+            for path in islice(paths, max_workers * 2)
+        }
+        
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = in_flight.pop(future)
+                # Refill before yielding so workers stay busy while the caller handles the result
+                for next_path in islice(paths, 1):
+                    in_flight[executor.submit(_process_marksheet_file, next_path, config)] = next_path
+                
+                try:
+                    yield path, future.result(), None
+                except Exception as e:
+                    logger.error(f"Error processing marksheet {path}: {str(e)}")
+                    yield path, None, str(e)
@@ -0,0 +1,127 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class OCRResultCache:
+    """SQLite-backed cache of marksheet OCR results keyed by content hash
+    
+    Entries are keyed by (content hash, OCR config fingerprint) and evicted
+    least-recently-used first once the cache grows past max_entries. The
+    cache file is shared safely between worker threads and processes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000):
+        """Initialize cache stored in the given SQLite file"""
+        self.path = path
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Used as closing(conn), conn: the connection's own context manager
+        # only commits or rolls back, it never closes
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _ensure_schema(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_results (
+                    content_hash TEXT NOT NULL,
+                    config_key TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (content_hash, config_key)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_ocr_results_last_used ON ocr_results (last_used)"
+            )
+
+    def get(self, content_hash: str, config_key: str) -> Optional[Dict[str, any]]:
+        """
+        Look up a cached result and mark it as recently used
+        
+        Args:
+            content_hash (str): SHA-256 of the scanned file
+            config_key (str): Fingerprint of the OCR configuration
+            
+        Returns:
+            Optional[Dict[str, any]]: Cached result, or None on a miss
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT result FROM ocr_results WHERE content_hash = ? AND config_key = ?",
+                    (content_hash, config_key)
+                ).fetchone()
+                if row is None:
+                    return None
+                
+                conn.execute(
+                    "UPDATE ocr_results SET last_used = ? WHERE content_hash = ? AND config_key = ?",
+                    (time.time(), content_hash, config_key)
+                )
+                return json.loads(row[0])
+        except sqlite3.Error as e:
+            # A broken cache should never block OCR, so treat errors as a miss
+            self.logger.error(f"Error reading OCR cache: {str(e)}")
+            return None
+
+    def put(self, content_hash: str, config_key: str, result: Dict[str, any]) -> None:
+        """
+        Store a result and evict the least recently used entries over the limit
+        
+        Args:
+            content_hash (str): SHA-256 of the scanned file
+            config_key (str): Fingerprint of the OCR configuration
+            result (Dict[str, any]): Output of process_marksheet
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ocr_results (content_hash, config_key, result, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    (content_hash, config_key, json.dumps(result), time.time())
+                )
+                conn.execute(
+                    "DELETE FROM ocr_results WHERE rowid IN ("
+                    "  SELECT rowid FROM ocr_results ORDER BY last_used DESC LIMIT -1 OFFSET ?"
+                    ")",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error writing OCR cache: {str(e)}")
+
+_caches: Dict[Tuple[str, int], OCRResultCache] = {}
+_caches_lock = threading.Lock()
+
+def get_result_cache(path: str, max_entries: int = 5000) -> OCRResultCache:
+    """
+    Get the process-wide cache for a cache file
+    
+    Processors built per job share one instance, so the schema is checked
+    once per worker rather than on every marksheet.
+    
+    Args:
+        path (str): SQLite file holding the cache
+        max_entries (int): Entries kept before least recently used ones are evicted
+        
+    Returns:
+        OCRResultCache: Shared cache instance
+    """
+    key = (path, max_entries)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = OCRResultCache(path, max_entries=max_entries)
+        return _caches[key]
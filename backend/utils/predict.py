@@ -2,9 +2,15 @@ import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+import sklearn
+import threading
+import time
+from typing import Dict, List, Tuple, Optional, Union
 import logging
 from datetime import datetime
+from utils.features import FEATURE_SCHEMA, build_feature_matrix
+from utils.forest_inference import CompiledForest
+from utils.model_registry import ModelRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +26,49 @@ class PerformancePredictor:
         )
         self.scaler = StandardScaler()
         self.is_trained = False
+        self.model_version = None
+        self.engine = 'sklearn'
+        self.compiled: Optional[CompiledForest] = None
         self.logger = logging.getLogger(__name__)
 
+    def to_artifact(self) -> Dict[str, any]:
+        """Bundle the fitted estimator and scaler for serialization"""
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        return {
+            'model': self.model,
+            'scaler': self.scaler,
+            'trained_at': datetime.utcnow().isoformat(),
+            'sklearn_version': sklearn.__version__
+        }
+
+    @classmethod
+    def from_artifact(cls, artifact: Dict[str, any], engine: str = 'sklearn') -> 'PerformancePredictor':
+        """
+        Build a ready-to-serve predictor from a stored artifact
+        
+        Args:
+            artifact (Dict[str, any]): Stored artifact
+            engine (str): 'sklearn' to score with the estimator, or 'compiled'
+                to score with flat node arrays exported from it
+            
+        Returns:
+            PerformancePredictor: Trained predictor
+        """
+        if engine not in ('sklearn', 'compiled'):
+            raise ValueError(f"Unknown predictor engine: {engine}")
+        
+        predictor = cls()
+        predictor.model = artifact['model']
+        predictor.scaler = artifact['scaler']
+        predictor.model_version = artifact['version']
+        predictor.is_trained = True
+        predictor.engine = engine
+        if engine == 'compiled':
+            predictor.compiled = CompiledForest.from_sklearn(predictor.model, predictor.scaler)
+        return predictor
+
     def _prepare_features(self, student_data: Dict) -> np.ndarray:
         """
         Prepare feature vector from student data
@@ -30,50 +77,22 @@ class PerformancePredictor:
             student_data (Dict): Dictionary containing student information
             
         Returns:
-            np.ndarray: Prepared feature vector
+            np.ndarray: Prepared feature vector of shape (1, n_features)
         """
-        try:
-            features = []
-            
-            # Academic performance features
-            features.extend([
-                float(student_data.get('previous_grade', 0)),
-                float(student_data.get('attendance_percentage', 0)),
-                float(student_data.get('assignment_completion_rate', 0)),
-                float(student_data.get('class_participation_score', 0))
-            ])
-            
-            # Study pattern features
-            features.extend([
-                float(student_data.get('study_hours_per_week', 0)),
-                float(student_data.get('self_study_score', 0)),
-                float(student_data.get('group_study_score', 0))
-            ])
-            
-            # Engagement metrics
-            features.extend([
-                float(student_data.get('submission_timeliness', 0)),
-                float(student_data.get('extra_curricular_participation', 0)),
-                float(student_data.get('project_scores', 0))
-            ])
-            
-            return np.array(features).reshape(1, -1)
-        except Exception as e:
-            self.logger.error(f"Error in feature preparation: {str(e)}")
-            raise
+        return build_feature_matrix([student_data])
 
-    def train(self, training_data: List[Dict], labels: List[float]):
+    def train(self, training_data: Union[List[Dict], pd.DataFrame], labels: List[float]):
         """
         Train the ML model with historical data
         
         Args:
-            training_data (List[Dict]): List of student data dictionaries
+            training_data (Union[List[Dict], pd.DataFrame]): Student records or a frame of feature columns
             labels (List[float]): Corresponding performance labels
         """
         try:
             # Prepare feature matrix
-            X = np.array([self._prepare_features(data).flatten() for data in training_data])
-            y = np.array(labels)
+            X = build_feature_matrix(training_data)
+            y = np.asarray(labels, dtype=np.float64)
             
             # Scale features
             X_scaled = self.scaler.fit_transform(X)
@@ -101,40 +120,95 @@ class PerformancePredictor:
             if not self.is_trained:
                 raise ValueError("Model not trained yet")
             
-            # Prepare and scale features
+            # Prepare features and score them
             X = self._prepare_features(student_data)
-            X_scaled = self.scaler.transform(X)
-            
-            # Make prediction
-            predicted_score = self.model.predict(X_scaled)[0]
-            
-            # Calculate confidence score (using prediction probabilities)
-            confidence_score = min(
-                max(
-                    0.5 + abs(predicted_score - 70) / 100,  # Base confidence on distance from average
-                    0.1  # Minimum confidence
-                ),
-                0.95  # Maximum confidence
-            )
-            
-            # Determine predicted grade
-            predicted_grade = self._score_to_grade(predicted_score)
-            
-            # Get feature importances
-            importance_factors = self._get_importance_factors(student_data)
-            
-            return {
-                'predicted_score': round(predicted_score, 2),
-                'predicted_grade': predicted_grade,
-                'confidence_score': round(confidence_score, 2),
-                'importance_factors': importance_factors,
-                'prediction_date': datetime.utcnow().isoformat(),
-                'model_version': '1.0'
-            }
+            predicted_score = self.score_matrix(X)[0]
+            
+            return self._build_result(predicted_score, student_data)
         except Exception as e:
             self.logger.error(f"Error in performance prediction: {str(e)}")
             raise
 
+    def predict_batch(self, student_data_list: List[Dict]) -> List[Dict[str, any]]:
+        """
+        Predict performance for many students in a single model call
+        
+        Args:
+            student_data_list (List[Dict]): Student information and metrics per student
+            
+        Returns:
+            List[Dict[str, any]]: Prediction results in input order
+        """
+        try:
+            if not self.is_trained:
+                raise ValueError("Model not trained yet")
+            
+            if not student_data_list:
+                return []
+            
+            # Score the full feature matrix in one model call
+            X = build_feature_matrix(student_data_list)
+            predicted_scores = self.score_matrix(X)
+            
+            return [
+                self._build_result(score, data)
+                for score, data in zip(predicted_scores, student_data_list)
+            ]
+        except Exception as e:
+            self.logger.error(f"Error in batch performance prediction: {str(e)}")
+            raise
+
+    def score_matrix(self, X: np.ndarray) -> np.ndarray:
+        """
+        Score a prepared feature matrix
+        
+        Args:
+            X (np.ndarray): Matrix from build_feature_matrix
+            
+        Returns:
+            np.ndarray: Raw predicted score per row
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        if self.compiled is not None:
+            return self.compiled.predict(X)
+        return self.model.predict(self.scaler.transform(X))
+
+    def _build_result(self, predicted_score: float, student_data: Dict) -> Dict[str, any]:
+        """
+        Build the prediction response for a single predicted score
+        
+        Args:
+            predicted_score (float): Raw model output
+            student_data (Dict): Student information and metrics
+            
+        Returns:
+            Dict[str, any]: Prediction results and confidence metrics
+        """
+        # Calculate confidence score (using prediction probabilities)
+        confidence_score = min(
+            max(
+                0.5 + abs(predicted_score - 70) / 100,  # Base confidence on distance from average
+                0.1  # Minimum confidence
+            ),
+            0.95  # Maximum confidence
+        )
+        
+        # Determine predicted grade
+        predicted_grade = self._score_to_grade(predicted_score)
+        
+        # Get feature importances
+        importance_factors = self._get_importance_factors(student_data)
+        
+        return {
+            'predicted_score': round(float(predicted_score), 2),
+            'predicted_grade': predicted_grade,
+            'confidence_score': round(float(confidence_score), 2),
+            'importance_factors': importance_factors,
+            'prediction_date': datetime.utcnow().isoformat(),
+            'model_version': self.model_version
+        }
+
     def _score_to_grade(self, score: float) -> str:
         """
         Convert numerical score to letter grade
@@ -168,28 +242,118 @@ class PerformancePredictor:
         Returns:
             List[Dict[str, any]]: List of important factors and their impacts
         """
-        feature_names = [
-            'previous_grade', 'attendance', 'assignment_completion',
-            'class_participation', 'study_hours', 'self_study',
-            'group_study', 'submission_timeliness', 'extra_curricular',
-            'project_scores'
-        ]
-        
         # Get feature importances from model
-        importances = self.model.feature_importances_
+        importances = (self.compiled.feature_importances if self.compiled is not None
+                       else self.model.feature_importances_)
         
         # Sort features by importance
         factors = []
-        for name, importance in zip(feature_names, importances):
+        for (key, label), importance in zip(FEATURE_SCHEMA, importances):
             if importance > 0.05:  # Only include significant factors
                 factors.append({
-                    'factor': name,
+                    'factor': label,
                     'importance': round(float(importance), 3),
-                    'current_value': student_data.get(name, 0)
+                    'current_value': student_data.get(key, 0)
                 })
         
         return sorted(factors, key=lambda x: x['importance'], reverse=True)
 
+# Seed data used to bootstrap a model when no artifact has been registered yet
+BOOTSTRAP_TRAINING_DATA = [
+    {'previous_grade': 85, 'attendance_percentage': 90, 'assignment_completion_rate': 95},
+    {'previous_grade': 75, 'attendance_percentage': 80, 'assignment_completion_rate': 85},
+    {'previous_grade': 65, 'attendance_percentage': 70, 'assignment_completion_rate': 75}
+]
+BOOTSTRAP_LABELS = [87, 78, 68]
+
+_predictor: Optional[PerformancePredictor] = None
+_predictor_lock = threading.Lock()
+_last_reload_check = 0.0
+
+def train_and_register(model_folder: str, training_data: Union[List[Dict], pd.DataFrame],
+                       labels: List[float], version: Optional[str] = None) -> str:
+    """
+    Train a predictor offline and store it in the model registry
+    
+    Args:
+        model_folder (str): Registry folder
+        training_data (Union[List[Dict], pd.DataFrame]): Student records or a frame of feature columns
+        labels (List[float]): Corresponding performance labels
+        version (Optional[str]): Version tag, generated when omitted
+        
+    Returns:
+        str: Version tag of the registered artifact
+    """
+    predictor = PerformancePredictor()
+    predictor.train(training_data, labels)
+    return ModelRegistry(model_folder).save(predictor.to_artifact(), version=version)
+
+def load_predictor(model_folder: str, engine: str = 'sklearn') -> PerformancePredictor:
+    """
+    Load the latest registered predictor into this worker
+    
+    A bootstrap artifact is trained and registered when the registry is empty
+    so a fresh deployment can still serve predictions.
+    
+    Args:
+        model_folder (str): Registry folder
+        engine (str): Inference engine, 'sklearn' or 'compiled'
+        
+    Returns:
+        PerformancePredictor: Warm predictor used for serving
+    """
+    global _predictor, _last_reload_check
+    
+    with _predictor_lock:
+        registry = ModelRegistry(model_folder)
+        if registry.latest_version() is None:
+            logger.warning(f"No model artifact found in {model_folder}, registering bootstrap model")
+            train_and_register(model_folder, BOOTSTRAP_TRAINING_DATA, BOOTSTRAP_LABELS)
+        
+        _predictor = PerformancePredictor.from_artifact(registry.load(), engine)
+        _last_reload_check = time.monotonic()
+        return _predictor
+
+def _reload_if_promoted(model_folder: str) -> None:
+    """Swap in the artifact LATEST points at if it differs from the served one"""
+    global _predictor, _last_reload_check
+    
+    # One thread checks; the others keep serving the current model meanwhile
+    if not _predictor_lock.acquire(blocking=False):
+        return
+    try:
+        _last_reload_check = time.monotonic()
+        registry = ModelRegistry(model_folder)
+        latest = registry.latest_version()
+        if latest and latest != _predictor.model_version:
+            _predictor = PerformancePredictor.from_artifact(registry.load(latest), _predictor.engine)
+            logger.info(f"Reloaded promoted model {latest}")
+    except Exception as e:
+        logger.error(f"Error reloading promoted model, still serving {_predictor.model_version}: {str(e)}")
+    finally:
+        _predictor_lock.release()
+
+def get_predictor() -> PerformancePredictor:
+    """
+    Get the warm predictor for this worker, loading it on first use
+    
+    Every MODEL_RELOAD_INTERVAL seconds the registry's LATEST pointer is
+    checked and a newly promoted artifact replaces the served one, so
+    retraining reaches running workers without a restart.
+    
+    Returns:
+        PerformancePredictor: Warm predictor used for serving
+    """
+    from flask import current_app
+    
+    if _predictor is None:
+        return load_predictor(current_app.config['MODEL_FOLDER'], current_app.config['PREDICTOR_ENGINE'])
+    
+    interval = current_app.config.get('MODEL_RELOAD_INTERVAL', 0)
+    if interval and time.monotonic() - _last_reload_check >= interval:
+        _reload_if_promoted(current_app.config['MODEL_FOLDER'])
+    return _predictor
+
 def predict_performance(student_data: Dict) -> Dict[str, any]:
     """
     Wrapper function for performance prediction
@@ -200,16 +364,16 @@ def predict_performance(student_data: Dict) -> Dict[str, any]:
     Returns:
         Dict[str, any]: Prediction results
     """
-    predictor = PerformancePredictor()
-    
-    # In a real application, we would load a pre-trained model here
-    # For demonstration, we'll use some dummy training data
-    dummy_training_data = [
-        {'previous_grade': 85, 'attendance_percentage': 90, 'assignment_completion_rate': 95},
-        {'previous_grade': 75, 'attendance_percentage': 80, 'assignment_completion_rate': 85},
-        {'previous_grade': 65, 'attendance_percentage': 70, 'assignment_completion_rate': 75}
-    ]
-    dummy_labels = [87, 78, 68]
+    return get_predictor().predict(student_data)
+
+def predict_performance_batch(student_data_list: List[Dict]) -> List[Dict[str, any]]:
+    """
+    Wrapper function for batch performance prediction
     
-    predictor.train(dummy_training_data, dummy_labels)
-    return predictor.predict(student_data)
\ No newline at end of file
+    Args:
+        student_data_list (List[Dict]): Student information and metrics per student
+        
+    Returns:
+        List[Dict[str, any]]: Prediction results in input order
+    """
+    return get_predictor().predict_batch(student_data_list)
\ No newline at end of file
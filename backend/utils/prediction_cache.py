@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+import hashlib
+import threading
+import time
+import logging
+
+from utils.features import build_feature_matrix
+
+logger = logging.getLogger(__name__)
+
+class PredictionCache:
+    """In-process LRU cache of prediction responses with a time-to-live
+    
+    Entries are keyed by (model version, student, course, feature
+    fingerprint), so a result is reused only while the model and every
+    input it was scored on are unchanged. The whole cache is dropped the
+    first time a lookup sees a new model version.
+    """
+    
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 900):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._model_version = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    def init_app(self, app):
+        """Size the cache from the application config"""
+        self.max_entries = app.config['PREDICTION_CACHE_MAX_ENTRIES']
+        self.ttl_seconds = app.config['PREDICTION_CACHE_TTL']
+        self.clear()
+        app.extensions['prediction_cache'] = self
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+    
+    @staticmethod
+    def key(student_id: int, course_id: int, student_data: Dict) -> Tuple[int, int, str]:
+        """
+        Build the cache key for a student's prediction inputs
+        
+        The fingerprint hashes the feature row exactly as the model sees it,
+        so inputs that differ only in fields the model ignores share a key.
+        
+        Args:
+            student_id (int): Student ID
+            course_id (int): Course ID
+            student_data (Dict): Prediction inputs
+        
+        Returns:
+            Tuple[int, int, str]: Key for get and put
+        """
+        row = build_feature_matrix([student_data])
+        return int(student_id), int(course_id), hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest()
+    
+    def get(self, model_version: str, key: Hashable) -> Optional[Dict]:
+        """
+        Look up a cached response and mark it as recently used
+        
+        Args:
+            model_version (str): Version of the model that would score the request
+            key (Hashable): Key from PredictionCache.key
+        
+        Returns:
+            Optional[Dict]: Cached response, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            if model_version != self._model_version:
+                if self._entries:
+                    self.logger.info(f"Model version changed to {model_version}, dropping cached predictions")
+                self._entries.clear()
+                self._model_version = model_version
+            
+            entry = self._entries.get((model_version, key))
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[(model_version, key)]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end((model_version, key))
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, model_version: str, key: Hashable, response: Dict) -> None:
+        """
+        Store a response and evict the least recently used entries over the limit
+        
+        Args:
+            model_version (str): Version of the model that scored the request
+            key (Hashable): Key from PredictionCache.key
+            response (Dict): Response to replay on a hit
+        """
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            self._entries[(model_version, key)] = (time.monotonic(), response)
+            self._entries.move_to_end((model_version, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+            self._model_version = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+prediction_cache = PredictionCache()
@@ -0,0 +1,66 @@
+from typing import Iterable, List
+import logging
+
+from sqlalchemy import Index, Table, delete, func, inspect, select
+
+logger = logging.getLogger(__name__)
+
+def remove_duplicate_attendance(connection, records: Table) -> int:
+    """
+    Delete duplicate attendance records so the (enrollment_id, date) unique index can be built
+    
+    The most recently inserted record of each (enrollment_id, date) is kept,
+    matching what the mark endpoints would have shown last. Rollups, bitmaps
+    and stats should be rebuilt afterwards.
+    
+    Args:
+        connection: SQLAlchemy connection to delete on
+        records (Table): attendance_records as defined at the caller's schema version
+    
+    Returns:
+        int: Number of records deleted
+    """
+    latest = select(func.max(records.c.id)).group_by(records.c.enrollment_id, records.c.date)
+    result = connection.execute(delete(records).where(records.c.id.not_in(latest)))
+    return result.rowcount or 0
+
+def ensure_indexes(connection, indexes: Iterable[Index]) -> List[str]:
+    """
+    Create the given indexes where the database is missing them
+    
+    Tables that do not exist yet are skipped; they get their indexes when
+    they are created.
+    
+    Args:
+        connection: SQLAlchemy connection to create the indexes on
+        indexes (Iterable[Index]): Indexes bound to their tables
+    
+    Returns:
+        List[str]: Names of the indexes created
+    """
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    existing = {}
+    
+    created = []
+    for index in indexes:
+        table = index.table
+        if table.name not in tables:
+            continue
+        
+        if table.name not in existing:
+            existing[table.name] = {index['name'] for index in inspector.get_indexes(table.name)}
+        if index.name in existing[table.name]:
+            continue
+        
+        if index.name == 'uq_attendance_enrollment_date':
+            removed = remove_duplicate_attendance(connection, table)
+            if removed:
+                logger.warning(f"Removed {removed} duplicate attendance records before adding {index.name}; "
+                               "run `flask attendance rebuild-rollups` to refresh derived counts")
+        
+        index.create(connection)
+        created.append(index.name)
+        logger.info(f"Created index {index.name} on {table.name}")
+    
+    return created
@@ -0,0 +1,175 @@
+from typing import Dict, Iterator, Optional, Tuple
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+
+from utils.features import FEATURE_DTYPE, FEATURE_NAMES, build_feature_matrix
+from utils.feature_store import load_features
+from utils.model_registry import ModelRegistry
+from utils.predict import PerformancePredictor
+
+logger = logging.getLogger(__name__)
+
+# Score standing in for a letter grade when no verified subject mark exists;
+# the middle of each band used by PerformancePredictor._score_to_grade
+GRADE_SCORES = {'A+': 95.0, 'A': 85.0, 'B': 75.0, 'C': 65.0, 'D': 55.0, 'F': 40.0}
+
+# Fewer labelled enrollments than this are not enough to replace a model
+MIN_TRAINING_ROWS = 20
+
+def iter_labelled_chunks(chunk_size: int = 1000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream labelled enrollment history as feature matrices and labels
+    
+    Enrollments are paged by ID, so each chunk is one bounded query and
+    only the current chunk is held in memory. The label is the course's
+    percentage on verified marksheets of the enrollment's term, falling
+    back to the enrollment's letter grade. Inputs come from the
+    prediction feature store, which is refreshed as chunks are read;
+    caller-supplied inputs are unknown for history and left at 0, as they
+    are when a prediction request omits them.
+    
+    Args:
+        chunk_size (int): Enrollments per chunk
+    
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Feature matrix and labels of a chunk
+    """
+    from app import db
+    from models.academic import Enrollment
+    from models.tracking import Marksheet, SubjectMark
+    
+    subject_score = db.func.avg(100.0 * SubjectMark.marks_obtained / SubjectMark.max_marks)
+    query = db.session.query(Enrollment.id, Enrollment.grade, subject_score)\
+        .outerjoin(Marksheet, db.and_(
+            Marksheet.student_id == Enrollment.student_id,
+            Marksheet.term_id == Enrollment.term_id,
+            Marksheet.verified == True
+        ))\
+        .outerjoin(SubjectMark, db.and_(
+            SubjectMark.marksheet_id == Marksheet.id,
+            SubjectMark.course_id == Enrollment.course_id,
+            SubjectMark.max_marks > 0
+        ))\
+        .group_by(Enrollment.id, Enrollment.grade)\
+        .having(db.or_(Enrollment.grade.in_(list(GRADE_SCORES)), subject_score.isnot(None)))\
+        .order_by(Enrollment.id)
+    
+    last_id = 0
+    while True:
+        rows = query.filter(Enrollment.id > last_id).limit(chunk_size).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        
+        features = load_features(enrollment_id for enrollment_id, _, _ in rows)
+        db.session.commit()
+        
+        X = build_feature_matrix([features.get(enrollment_id, {}) for enrollment_id, _, _ in rows])
+        y = np.fromiter(
+            (score if score is not None else GRADE_SCORES[grade] for _, grade, score in rows),
+            dtype=np.float64,
+            count=len(rows)
+        )
+        yield X, y
+
+def load_training_data(chunk_size: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """Collect all labelled history into one feature matrix and label vector"""
+    Xs, ys = [], []
+    for X, y in iter_labelled_chunks(chunk_size):
+        Xs.append(X)
+        ys.append(y)
+    
+    if not Xs:
+        return np.zeros((0, len(FEATURE_NAMES)), dtype=FEATURE_DTYPE), np.zeros(0)
+    return np.concatenate(Xs), np.concatenate(ys)
+
+def evaluate(predictor: PerformancePredictor, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    """
+    Score a predictor on held-out rows
+    
+    Returns:
+        Dict[str, float]: MAE, RMSE, R² and the share of rows whose letter grade matches
+    """
+    predicted = predictor.score_matrix(X)
+    grade_matches = sum(
+        predictor._score_to_grade(p) == predictor._score_to_grade(actual)
+        for p, actual in zip(predicted, y)
+    )
+    return {
+        'mae': round(float(mean_absolute_error(y, predicted)), 4),
+        'rmse': round(float(np.sqrt(mean_squared_error(y, predicted))), 4),
+        'r2': round(float(r2_score(y, predicted)), 4) if len(y) > 1 else None,
+        'grade_accuracy': round(grade_matches / len(y), 4)
+    }
+
+def retrain(model_folder: str, chunk_size: int = 1000, holdout: float = 0.2, n_jobs: int = -1,
+            force: bool = False, random_state: Optional[int] = 42) -> Dict:
+    """
+    Train a predictor on labelled history and promote it if it beats the served model
+    
+    The candidate is fitted on all cores and scored on a holdout split,
+    as is the model LATEST currently points at. The candidate is always
+    registered; LATEST moves to it only when its holdout MAE is no worse,
+    or when forced. Promotion is an atomic pointer swap that running
+    workers pick up on their next reload check.
+    
+    Args:
+        model_folder (str): Registry folder
+        chunk_size (int): Enrollments read per chunk
+        holdout (float): Share of rows held out for evaluation
+        n_jobs (int): Parallel training jobs, -1 for every core
+        force (bool): Promote even if the candidate scores worse
+        random_state (Optional[int]): Seed for the split and the forest
+    
+    Returns:
+        Dict: Version, promotion decision, row counts and holdout metrics
+    
+    Raises:
+        ValueError: If there is not enough labelled history
+    """
+    started = time.perf_counter()
+    X, y = load_training_data(chunk_size)
+    if len(y) < MIN_TRAINING_ROWS:
+        raise ValueError(f"Only {len(y)} labelled enrollments, need at least {MIN_TRAINING_ROWS}")
+    
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=holdout, random_state=random_state)
+    
+    candidate = PerformancePredictor()
+    candidate.model.set_params(n_jobs=n_jobs, random_state=random_state)
+    candidate.train(pd.DataFrame(X_train, columns=FEATURE_NAMES), y_train)
+    # Serving scores one row at a time, where a worker pool only adds overhead
+    candidate.model.set_params(n_jobs=None)
+    metrics = evaluate(candidate, X_test, y_test)
+    
+    registry = ModelRegistry(model_folder)
+    current_version = registry.latest_version()
+    baseline = None
+    if current_version:
+        try:
+            baseline = evaluate(PerformancePredictor.from_artifact(registry.load(current_version)), X_test, y_test)
+        except Exception as e:
+            logger.error(f"Error evaluating served model {current_version}: {str(e)}")
+    
+    promote = force or baseline is None or metrics['mae'] <= baseline['mae']
+    artifact = dict(candidate.to_artifact(), metrics=metrics, training_rows=len(y_train))
+    version = registry.save(artifact, promote=promote)
+    
+    report = {
+        'version': version,
+        'promoted': promote,
+        'previous_version': current_version,
+        'rows': len(y),
+        'training_rows': len(y_train),
+        'holdout_rows': len(y_test),
+        'metrics': metrics,
+        'baseline_metrics': baseline,
+        'elapsed_seconds': round(time.perf_counter() - started, 2)
+    }
+    logger.info(f"Retrained model {version} on {len(y_train)} rows, holdout MAE {metrics['mae']}, "
+                f"{'promoted' if promote else 'not promoted'}")
+    return report